@@ -4,7 +4,10 @@ from django.urls import reverse
 from django.db.models import Count, Q
 from django.contrib import messages
 from django.http import HttpResponseRedirect
-from .models import Person, Company, Keyword, SearchResult, Match, ScrapingJob, ExportJob
+from django.utils import timezone
+from .models import Person, Company, Keyword, SearchResult, Match, ScrapingJob, ScrapingTask, ExportJob, SearchQueryCache, ApiQuota, RawPage, RunWatermark
+from .job_queue import resume_scraping_job
+from scraper.keyword_matcher import bump_keyword_index_version
 
 
 @admin.register(Company)
@@ -128,12 +131,14 @@ class KeywordAdmin(admin.ModelAdmin):
     
     @admin.action(description='Activate selected keywords')
     def activate_keywords(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = queryset.update(is_active=True, updated_at=timezone.now())
+        bump_keyword_index_version()
         self.message_user(request, f'{updated} keywords activated.', messages.SUCCESS)
     
     @admin.action(description='Deactivate selected keywords')
     def deactivate_keywords(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = queryset.update(is_active=False, updated_at=timezone.now())
+        bump_keyword_index_version()
         self.message_user(request, f'{updated} keywords deactivated.', messages.SUCCESS)
 
 
@@ -281,13 +286,25 @@ class MatchAdmin(admin.ModelAdmin):
     confidence_display.short_description = 'Confidence'
 
 
+class ScrapingTaskInline(admin.TabularInline):
+    model = ScrapingTask
+    extra = 0
+    fields = ['person', 'status', 'search_status', 'fetch_status', 'parse_status', 'match_status', 'attempts', 'error_message']
+    readonly_fields = fields
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(ScrapingJob)
 class ScrapingJobAdmin(admin.ModelAdmin):
     list_display = ['id', 'job_type_display', 'person_company', 'status_display', 'progress_display', 'duration_display', 'created_at']
     list_filter = ['status', 'job_type', 'created_at']
     ordering = ['-created_at']
     readonly_fields = ['created_at', 'started_at', 'completed_at']
-    actions = ['cancel_selected_jobs']
+    actions = ['cancel_selected_jobs', 'resume_selected_jobs']
+    inlines = [ScrapingTaskInline]
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
@@ -341,14 +358,20 @@ class ScrapingJobAdmin(admin.ModelAdmin):
         cancelable_jobs = queryset.filter(status__in=['queued', 'running'])
         updated = cancelable_jobs.update(status='cancelled')
         self.message_user(request, f'{updated} jobs cancelled.', messages.SUCCESS)
+    
+    @admin.action(description='Resume selected jobs (retry failed and interrupted people)')
+    def resume_selected_jobs(self, request, queryset):
+        resumed = sum(resume_scraping_job(job) for job in queryset)
+        self.message_user(request, f'{resumed} jobs queued to resume.', messages.SUCCESS)
 
 
 @admin.register(ExportJob)
 class ExportJobAdmin(admin.ModelAdmin):
-    list_display = ['file_name', 'file_format', 'status_display', 'created_by', 'created_at', 'completed_at']
-    list_filter = ['status', 'file_format', 'created_at']
+    list_display = ['file_name', 'export_type', 'file_format', 'status_display', 'progress_display', 'created_by', 'created_at', 'completed_at']
+    list_filter = ['status', 'export_type', 'file_format', 'created_at']
     ordering = ['-created_at']
-    readonly_fields = ['created_at', 'completed_at']
+    readonly_fields = ['file_path', 'file_size', 'rows_written', 'total_rows', 'worker_id', 'heartbeat_at',
+                       'attempts', 'created_at', 'started_at', 'completed_at']
     
     def status_display(self, obj):
         colors = {
@@ -361,6 +384,49 @@ class ExportJobAdmin(admin.ModelAdmin):
         return format_html('<span style="color: {};">{}</span>', color, obj.get_status_display())
     status_display.short_description = 'Status'
     status_display.admin_order_field = 'status'
+    
+    def progress_display(self, obj):
+        return f"{obj.rows_written:,}/{obj.total_rows:,} ({obj.progress_percentage}%)"
+    progress_display.short_description = 'Progress'
+
+
+@admin.register(SearchQueryCache)
+class SearchQueryCacheAdmin(admin.ModelAdmin):
+    list_display = ['query', 'num_results', 'is_negative', 'created_at', 'expires_at']
+    list_filter = ['is_negative', 'created_at']
+    search_fields = ['query']
+    ordering = ['-created_at']
+    readonly_fields = ['query_key', 'created_at']
+    actions = ['purge_expired']
+    
+    def purge_expired(self, request, queryset):
+        # Only the selected entries; run_workers purges every expired one through QueryCache.purge_expired()
+        deleted, _ = queryset.filter(expires_at__lte=timezone.now()).delete()
+        self.message_user(request, f'{deleted} expired cache entries deleted.', messages.SUCCESS)
+    purge_expired.short_description = "Delete selected entries that have expired"
+
+
+@admin.register(ApiQuota)
+class ApiQuotaAdmin(admin.ModelAdmin):
+    list_display = ['provider', 'day', 'used', 'updated_at']
+    list_filter = ['provider']
+    ordering = ['-day', 'provider']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(RawPage)
+class RawPageAdmin(admin.ModelAdmin):
+    list_display = ['url', 'status_code', 'size', 'sha256', 'fetched_at']
+    list_filter = ['status_code', 'fetched_at']
+    search_fields = ['url', 'final_url', 'sha256']
+    ordering = ['-fetched_at']
+    readonly_fields = ['url', 'final_url', 'sha256', 'status_code', 'size', 'fetched_at']
+
+
+@admin.register(RunWatermark)
+class RunWatermarkAdmin(admin.ModelAdmin):
+    list_display = ['name', 'last_run_at', 'updated_at']
+    readonly_fields = ['updated_at']
 
 
 # Custom admin site configuration
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import logging
+import weakref
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError
+
+from .models import ScrapingJob
+
+logger = logging.getLogger(__name__)
+
+# Seconds between change-feed queries while anyone is listening
+POLL_INTERVAL = getattr(settings, 'JOB_EVENTS_POLL_INTERVAL', 1.0)
+
+# Seconds of silence before a comment line keeps proxies from closing the stream
+KEEPALIVE_INTERVAL = 15
+
+# Pending events per client; a slow client loses its oldest deltas, never the newest
+SUBSCRIBER_QUEUE_SIZE = 100
+
+ACTIVE_STATUSES = ['queued', 'running']
+
+JOB_EVENT_FIELDS = [
+    'id', 'job_type', 'status', 'total_people', 'processed_count',
+    'success_count', 'error_count', 'error_message',
+]
+
+
+def _job_event(row: Dict) -> Dict:
+    total = row['total_people']
+    return {**row, 'progress_percentage': int(row['processed_count'] / total * 100) if total else 0}
+
+
+def _load_jobs(previous_ids: List[int]) -> Dict[int, Dict]:
+    """
+    Current state of every active job, plus the jobs that were active last
+    time, so the final counts of a job that just finished are still sent
+    """
+    rows = list(ScrapingJob.objects.filter(status__in=ACTIVE_STATUSES).values(*JOB_EVENT_FIELDS))
+    jobs = {row['id']: _job_event(row) for row in rows}
+    finished = [job_id for job_id in previous_ids if job_id not in jobs]
+    if finished:
+        for row in ScrapingJob.objects.filter(id__in=finished).values(*JOB_EVENT_FIELDS):
+            jobs[row['id']] = _job_event(row)
+    return jobs
+
+
+def _load_job(job_id: int) -> Optional[Dict]:
+    row = ScrapingJob.objects.filter(id=job_id).values(*JOB_EVENT_FIELDS).first()
+    return _job_event(row) if row else None
+
+
+class JobProgressFeed:
+    """
+    Change feed of ScrapingJob progress shared by every SSE client on one
+    event loop
+
+    A single task queries the active jobs every POLL_INTERVAL seconds while
+    at least one client is subscribed, diffs them against the last snapshot
+    and pushes only the jobs that changed to each client's queue. The
+    database sees one small query per tick however many clients listen.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or POLL_INTERVAL
+        self.jobs: Dict[int, Dict] = {}  # Last seen state of the active jobs
+        self.subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+    async def _poll(self):
+        while self.subscribers:
+            try:
+                jobs = await sync_to_async(_load_jobs)(list(self.jobs))
+            except DatabaseError as e:
+                logger.warning(f"Job progress feed query failed: {e}")
+            else:
+                changed = [job for job_id, job in jobs.items() if self.jobs.get(job_id) != job]
+                self.jobs = {job_id: job for job_id, job in jobs.items() if job['status'] in ACTIVE_STATUSES}
+                for job in changed:
+                    self._publish(job)
+            await asyncio.sleep(self.interval)
+        # Forget the snapshot, or the first poll after a quiet spell would miss jobs that finished meanwhile
+        self.jobs = {}
+
+    def _publish(self, job: Dict):
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(job)
+
+
+_feeds: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, JobProgressFeed]' = weakref.WeakKeyDictionary()
+
+
+def job_progress_feed() -> JobProgressFeed:
+    """The feed for the running event loop (one per ASGI worker process)"""
+    loop = asyncio.get_running_loop()
+    feed = _feeds.get(loop)
+    if feed is None:
+        feed = _feeds[loop] = JobProgressFeed()
+    return feed
+
+
+def _sse(job: Dict) -> str:
+    return f"event: job\ndata: {json.dumps(job)}\n\n"
+
+
+async def job_event_stream(job_id: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    Server-sent events for job progress: the current state first, then a
+    ``job`` event each time a job's status or counts change
+
+    Args:
+        job_id: Only send events for this job
+    """
+    feed = job_progress_feed()
+    queue = feed.subscribe()
+    try:
+        yield 'retry: 3000\n\n'
+
+        if job_id is not None:
+            # The job may have finished before the client connected
+            job = feed.jobs.get(job_id) or await sync_to_async(_load_job)(job_id)
+            if job:
+                yield _sse(job)
+        else:
+            for job in list(feed.jobs.values()):
+                yield _sse(job)
+
+        while True:
+            try:
+                job = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            if job_id is None or job['id'] == job_id:
+                yield _sse(job)
+    finally:
+        feed.unsubscribe(queue)
@@ -0,0 +1,616 @@
+import csv
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count
+from django.db.models.functions import Substr
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+from .models import ExportJob, Keyword, Match, Person, SearchResult
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the database per round trip
+ITERATOR_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+# CSV rows joined into each chunk sent to the client
+ROWS_PER_WRITE = 500
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Excel's row limit per worksheet, header included; longer exports continue on another sheet
+XLSX_MAX_ROWS = 1048576
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Where background export jobs write their files
+EXPORT_ROOT = getattr(settings, 'EXPORT_ROOT', os.path.join(settings.BASE_DIR, 'exports'))
+
+# Rows between progress updates on a background export
+PROGRESS_EVERY = 1000
+
+# Bytes per read when serving an export file
+DOWNLOAD_BLOCK_SIZE = 64 * 1024
+
+EXPORT_FILE_NAMES = {
+    'results': 'search_results',
+    'matches': 'keyword_matches',
+    'people': 'people',
+    'workbook': 'linkedin_export',
+}
+
+EXPORT_EXTENSIONS = {'csv': 'csv', 'excel': 'xlsx', 'json': 'json', 'parquet': 'parquet'}
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'excel': XLSX_CONTENT_TYPE,
+    'json': 'application/json',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# Rows per Parquet row group; each group is built in memory before it is written
+PARQUET_ROW_GROUP_SIZE = getattr(settings, 'EXPORT_PARQUET_ROW_GROUP_SIZE', 50_000)
+
+# Typed columns of the Parquet match export, in match_values() order. Keyword and
+# category repeat on nearly every row, so they are dictionary-encoded (and load
+# into pandas as categoricals).
+MATCHES_PARQUET_SCHEMA = pa.schema([
+    ('person_name', pa.string()),
+    ('company', pa.string()),
+    ('keyword', pa.dictionary(pa.int32(), pa.string())),
+    ('category', pa.dictionary(pa.int32(), pa.string())),
+    ('context_snippet', pa.string()),
+    ('source_url', pa.string()),
+    ('match_count', pa.int32()),
+    ('confidence_score', pa.float64()),
+    ('found_at', pa.timestamp('us', tz='UTC')),
+])
+
+RESULTS_HEADER = [
+    'Person Name', 'Company', 'LinkedIn URL', 'Content Source',
+    'Headline', 'About', 'Experience', 'Status',
+    'Match Count', 'Scraped At', 'Source URL'
+]
+
+MATCHES_HEADER = [
+    'Person Name', 'Company', 'Keyword', 'Category',
+    'Context Snippet', 'Source URL', 'Match Count',
+    'Confidence Score', 'Found At'
+]
+
+PEOPLE_HEADER = [
+    'Name', 'Company', 'Website', 'LinkedIn URL',
+    'Has LinkedIn', 'Total Matches', 'Created At', 'Last Updated'
+]
+
+
+class Echo:
+    """File-like object whose write() hands the value back, so csv.writer yields lines"""
+
+    def write(self, value):
+        return value
+
+
+def _format_datetime(value) -> str:
+    return value.strftime(DATETIME_FORMAT) if value else ''
+
+
+def workbook_sheets(status_filter: Optional[str] = None, source_filter: Optional[str] = None,
+                    keyword_filter: Optional[str] = None, category_filter: Optional[str] = None):
+    """(title, header, rows) for the Results, Matches and People sheets of the Excel export"""
+    return [
+        ('Results', RESULTS_HEADER, search_result_rows(status_filter, source_filter)),
+        ('Matches', MATCHES_HEADER, match_rows(keyword_filter, category_filter)),
+        ('People', PEOPLE_HEADER, people_rows()),
+    ]
+
+
+def search_results_queryset(status_filter: Optional[str] = None, source_filter: Optional[str] = None):
+    results = SearchResult.objects.all()
+    if status_filter:
+        results = results.filter(status=status_filter)
+    if source_filter:
+        results = results.filter(content_source=source_filter)
+    return results
+
+
+def matches_queryset(keyword_filter: Optional[str] = None, category_filter: Optional[str] = None):
+    matches = Match.objects.all()
+    if keyword_filter:
+        matches = matches.filter(keyword__word__icontains=keyword_filter)
+    if category_filter:
+        matches = matches.filter(keyword__category=category_filter)
+    return matches
+
+
+def search_result_rows(status_filter: Optional[str] = None, source_filter: Optional[str] = None) -> Iterator[List]:
+    """Yield one export row per search result, reading the table in chunks"""
+    results = search_results_queryset(status_filter, source_filter).annotate(match_count=Count('matches'))
+
+    source_labels = dict(SearchResult.CONTENT_SOURCE_CHOICES)
+    status_labels = dict(SearchResult.STATUS_CHOICES)
+
+    # Long text is truncated by the database so it never crosses the wire
+    rows = results.values_list(
+        'person__name', 'person__company__name', 'person__linkedin_url', 'content_source',
+        'profile_headline', Substr('profile_about', 1, 500), Substr('profile_experience', 1, 500),
+        'status', 'match_count', 'scraped_at', 'source_url',
+    )
+    for (name, company, linkedin_url, source, headline, about, experience,
+         status, match_count, scraped_at, source_url) in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield [
+            name or '',
+            company or '',
+            linkedin_url or '',
+            source_labels.get(source, source),
+            headline,
+            about or '',
+            experience or '',
+            status_labels.get(status, status),
+            match_count,
+            _format_datetime(scraped_at),
+            source_url,
+        ]
+
+
+def match_values(keyword_filter: Optional[str] = None, category_filter: Optional[str] = None,
+                 category_labels: bool = False) -> Iterator[Tuple]:
+    """Yield one raw (person, company, keyword, category, snippet, url, count, score, found_at) tuple per match"""
+    matches = matches_queryset(keyword_filter, category_filter)
+    rows = matches.values_list(
+        'search_result__person__name', 'search_result__person__company__name',
+        'keyword__word', 'keyword__category', Substr('context_snippet', 1, 300),
+        'source_url', 'match_count', 'confidence_score', 'created_at',
+    )
+    if not category_labels:
+        yield from rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+        return
+
+    labels = dict(Keyword.CATEGORY_CHOICES)
+    for row in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield row[:3] + (labels.get(row[3], row[3]),) + row[4:]
+
+
+def match_rows(keyword_filter: Optional[str] = None, category_filter: Optional[str] = None) -> Iterator[List]:
+    """Yield one export row per keyword match, reading the table in chunks"""
+    for (name, company, word, category, snippet, source_url,
+         match_count, confidence_score, created_at) in match_values(keyword_filter, category_filter, category_labels=True):
+        yield [
+            name or '',
+            company or '',
+            word,
+            category,
+            snippet,
+            source_url,
+            match_count,
+            confidence_score,
+            _format_datetime(created_at),
+        ]
+
+
+def people_rows() -> Iterator[List]:
+    """Yield one export row per person, reading the table in chunks"""
+    rows = Person.objects.annotate(match_count=Count('search_results__matches')).values_list(
+        'name', 'company__name', 'company__website', 'linkedin_url',
+        'match_count', 'created_at', 'updated_at',
+    )
+    for (name, company, website, linkedin_url,
+         match_count, created_at, updated_at) in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield [
+            name,
+            company,
+            website,
+            linkedin_url,
+            'Yes' if linkedin_url and linkedin_url.strip() else 'No',
+            match_count,
+            _format_datetime(created_at),
+            _format_datetime(updated_at),
+        ]
+
+
+# Marks the end of a sync iterator served asynchronously
+_END = object()
+
+
+async def _iterate_in_thread(iterator: Iterator) -> AsyncIterator:
+    """Async view of a sync iterator; each item is produced by a sync_to_async call"""
+    next_item = sync_to_async(next)
+    while (item := await next_item(iterator, _END)) is not _END:
+        yield item
+
+
+def for_server(request, response: StreamingHttpResponse) -> StreamingHttpResponse:
+    """
+    Under ASGI, give a streaming response its content as an async iterator
+
+    Django's ASGI handler reads a sync iterator into a list before sending
+    the first byte, which would hold a whole export in memory. Each chunk
+    is still produced in Django's sync thread, where the queries run.
+    """
+    if isinstance(request, ASGIRequest) and not response.is_async:
+        response.streaming_content = _iterate_in_thread(response.streaming_content)
+    return response
+
+
+def stream_csv(header: Sequence[str], rows: Iterable[Sequence], export_job: Optional[ExportJob] = None) -> Iterator[str]:
+    """
+    Encode rows as CSV text a chunk at a time
+
+    The header goes out before the first query runs, and ``export_job`` is
+    marked completed only once the last row has been sent.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+
+    completed = False
+    try:
+        lines = []
+        for row in rows:
+            lines.append(writer.writerow(row))
+            if len(lines) >= ROWS_PER_WRITE:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+        completed = True
+    finally:
+        if export_job is not None:
+            export_job.status = 'completed' if completed else 'failed'
+            if not completed:
+                export_job.error_message = 'Export interrupted before the last row was sent'
+            export_job.completed_at = timezone.now()
+            export_job.save(update_fields=['status', 'error_message', 'completed_at'])
+
+
+def csv_response(request, file_name: str, header: Sequence[str], rows: Iterable[Sequence],
+                 export_job: Optional[ExportJob] = None) -> StreamingHttpResponse:
+    """Stream a CSV download without holding the rows or the file in memory"""
+    response = StreamingHttpResponse(stream_csv(header, rows, export_job), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{file_name}"'
+    return for_server(request, response)
+
+
+def write_xlsx(file, sheets: Iterable[Tuple[str, Sequence[str], Iterable[Sequence]]]) -> int:
+    """
+    Write an XLSX workbook with one sheet per (title, header, rows) entry
+
+    Uses openpyxl's write-only mode, which streams each sheet's rows to disk
+    as they are appended, so memory use doesn't grow with the row count.
+
+    Returns:
+        Number of data rows written
+    """
+    workbook = Workbook(write_only=True)
+    total = 0
+
+    for title, header, rows in sheets:
+        part = 1
+        worksheet = workbook.create_sheet(title)
+        worksheet.append(list(header))
+        sheet_rows = 1
+
+        for row in rows:
+            if sheet_rows >= XLSX_MAX_ROWS:
+                part += 1
+                worksheet = workbook.create_sheet(f'{title} ({part})')
+                worksheet.append(list(header))
+                sheet_rows = 1
+            # Scraped text can hold control characters that XLSX can't store
+            worksheet.append([
+                ILLEGAL_CHARACTERS_RE.sub('', value) if isinstance(value, str) else value
+                for value in row
+            ])
+            sheet_rows += 1
+            total += 1
+
+    workbook.save(file)
+    return total
+
+
+def xlsx_response(request, file_name: str, sheets: Iterable[Tuple[str, Sequence[str], Iterable[Sequence]]],
+                  export_job: Optional[ExportJob] = None) -> FileResponse:
+    """
+    Build the workbook in an anonymous temporary file and send it from there
+
+    The file is removed as soon as the response closes it.
+    """
+    spool = tempfile.TemporaryFile(suffix='.xlsx')
+    try:
+        rows_written = write_xlsx(spool, sheets)
+    except Exception as e:
+        spool.close()
+        if export_job is not None:
+            export_job.status = 'failed'
+            export_job.error_message = str(e)
+            export_job.completed_at = timezone.now()
+            export_job.save(update_fields=['status', 'error_message', 'completed_at'])
+        raise
+
+    size = spool.tell()
+    spool.seek(0)
+
+    if export_job is not None:
+        export_job.status = 'completed'
+        export_job.completed_at = timezone.now()
+        export_job.save(update_fields=['status', 'completed_at'])
+    logger.info(f"Exported {rows_written} rows to {file_name} ({size} bytes)")
+
+    response = FileResponse(spool, as_attachment=True, filename=file_name, content_type=XLSX_CONTENT_TYPE)
+    response.block_size = DOWNLOAD_BLOCK_SIZE
+    response['Content-Length'] = size
+    return for_server(request, response)
+
+
+def export_sheets(export_type: str, filters: Dict) -> List[Tuple[str, Sequence[str], Iterator[List]]]:
+    """(title, header, rows) for each sheet of an export of the given type"""
+    if export_type == 'results':
+        return [('Results', RESULTS_HEADER, search_result_rows(filters.get('status'), filters.get('source')))]
+    if export_type == 'matches':
+        return [('Matches', MATCHES_HEADER, match_rows(filters.get('keyword'), filters.get('category')))]
+    if export_type == 'people':
+        return [('People', PEOPLE_HEADER, people_rows())]
+    return workbook_sheets(filters.get('status'), filters.get('source'), filters.get('keyword'), filters.get('category'))
+
+
+def count_export_rows(export_type: str, filters: Dict) -> int:
+    """Number of data rows an export of the given type will contain"""
+    total = 0
+    if export_type in ('results', 'workbook'):
+        total += search_results_queryset(filters.get('status'), filters.get('source')).count()
+    if export_type in ('matches', 'workbook'):
+        total += matches_queryset(filters.get('keyword'), filters.get('category')).count()
+    if export_type in ('people', 'workbook'):
+        total += Person.objects.count()
+    return total
+
+
+def write_parquet(file, records: Iterable[Sequence], schema: pa.Schema = MATCHES_PARQUET_SCHEMA) -> int:
+    """
+    Write typed records to a Parquet file, one row group per
+    PARQUET_ROW_GROUP_SIZE records, so only one group is ever in memory
+
+    Returns:
+        Number of rows written
+    """
+    total = 0
+    with pq.ParquetWriter(file, schema, compression='zstd') as writer:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= PARQUET_ROW_GROUP_SIZE:
+                writer.write_batch(_record_batch(batch, schema))
+                total += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(_record_batch(batch, schema))
+            total += len(batch)
+    return total
+
+
+def _record_batch(records: List[Sequence], schema: pa.Schema) -> pa.RecordBatch:
+    arrays = []
+    for values, field in zip(zip(*records), schema):
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=field.type.value_type).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_file_name(export_type: str, file_format: str) -> str:
+    return f"{EXPORT_FILE_NAMES[export_type]}.{EXPORT_EXTENSIONS[file_format]}"
+
+
+def write_csv(file, sheets: Iterable[Tuple[str, Sequence[str], Iterable[Sequence]]]) -> int:
+    """
+    Write each (title, header, rows) entry to a text file as CSV, one
+    after the other
+
+    Returns:
+        Number of data rows written
+    """
+    total = 0
+    for _, header, rows in sheets:
+        counted = _CountedRows(rows)
+        for chunk in stream_csv(header, counted):
+            file.write(chunk)
+        total += counted.count
+    return total
+
+
+def write_json(file, sheets: Iterable[Tuple[str, Sequence[str], Iterable[Sequence]]]) -> int:
+    """
+    Write a JSON object mapping each sheet title to a list of row objects
+    keyed by the header, encoding one row at a time
+
+    Returns:
+        Number of data rows written
+    """
+    total = 0
+    file.write('{')
+    for sheet_index, (title, header, rows) in enumerate(sheets):
+        if sheet_index:
+            file.write(',')
+        file.write(f'\n{json.dumps(title)}: [')
+        for row_index, row in enumerate(rows):
+            file.write(',\n  ' if row_index else '\n  ')
+            file.write(json.dumps(dict(zip(header, row)), default=str))
+            total += 1
+        file.write('\n]')
+    file.write('\n}\n')
+    return total
+
+
+class _CountedRows:
+    def __init__(self, rows: Iterable[Sequence]):
+        self.rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self.rows)
+        self.count += 1
+        return row
+
+
+class _ProgressRows(_CountedRows):
+    """
+    Rows of an export job that keep export_job.rows_written current in
+    memory; the worker's heartbeat thread stores it, since writing from the
+    connection holding the export's read cursor open can't succeed on SQLite
+    """
+
+    def __init__(self, rows: Iterable[Sequence], export_job: ExportJob, offset: int):
+        super().__init__(rows)
+        self.export_job = export_job
+        self.offset = offset  # Rows written by earlier sheets
+
+    def __next__(self):
+        row = super().__next__()
+        if self.count % PROGRESS_EVERY == 0:
+            self.export_job.rows_written = self.offset + self.count
+        return row
+
+
+def _tracked_sheets(export_job: ExportJob):
+    written = 0
+    for title, header, rows in export_sheets(export_job.export_type, export_job.filters_applied):
+        tracked = _ProgressRows(rows, export_job, written)
+        yield title, header, tracked
+        written += tracked.count
+
+
+def run_export_job(export_job: ExportJob) -> ExportJob:
+    """
+    Write a claimed export job's file under EXPORT_ROOT and record the outcome
+
+    The file is written under a temporary name and renamed once complete, so
+    a crashed or retried export never leaves a truncated download behind.
+    """
+    os.makedirs(EXPORT_ROOT, exist_ok=True)
+    path = os.path.join(EXPORT_ROOT, f"{export_job.id}_{export_job.file_name}")
+    partial_path = f"{path}.part"
+
+    export_job.total_rows = count_export_rows(export_job.export_type, export_job.filters_applied)
+    export_job.rows_written = 0
+    export_job.save(update_fields=['total_rows', 'rows_written'])
+
+    try:
+        if export_job.file_format == 'excel':
+            with open(partial_path, 'wb') as file:
+                rows_written = write_xlsx(file, _tracked_sheets(export_job))
+        elif export_job.file_format == 'parquet':
+            filters = export_job.filters_applied
+            records = match_values(filters.get('keyword'), filters.get('category'), category_labels=True)
+            with open(partial_path, 'wb') as file:
+                rows_written = write_parquet(file, _ProgressRows(records, export_job, 0))
+        else:
+            writer = write_json if export_job.file_format == 'json' else write_csv
+            with open(partial_path, 'w', encoding='utf-8', newline='') as file:
+                rows_written = writer(file, _tracked_sheets(export_job))
+        os.replace(partial_path, path)
+    except Exception as e:
+        logger.error(f"Export {export_job.id} failed: {e}")
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        export_job.status = 'failed'
+        export_job.error_message = str(e)
+        export_job.completed_at = timezone.now()
+        export_job.save(update_fields=['status', 'error_message', 'completed_at'])
+        return export_job
+
+    export_job.status = 'completed'
+    export_job.file_path = path
+    export_job.file_size = os.path.getsize(path)
+    export_job.rows_written = rows_written
+    export_job.total_rows = rows_written
+    export_job.error_message = ''
+    export_job.completed_at = timezone.now()
+    export_job.save(update_fields=[
+        'status', 'file_path', 'file_size', 'rows_written', 'total_rows', 'error_message', 'completed_at'
+    ])
+    logger.info(f"Export {export_job.id} wrote {rows_written} rows to {path} ({export_job.file_size} bytes)")
+    return export_job
+
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Resolve a single-range ``Range: bytes=...`` header to inclusive
+    (start, end) offsets
+
+    Returns:
+        None when the header is absent, malformed or asks for several
+        ranges (the whole file is sent); raises ValueError when the range
+        lies outside the file
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def _read_range(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            block = file.read(min(DOWNLOAD_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def file_download_response(request, path: str, file_name: str, content_type: str) -> HttpResponse:
+    """
+    Serve a file as an attachment, honouring a single byte range so
+    interrupted downloads of large exports can be resumed
+    """
+    size = os.path.getsize(path)
+    try:
+        byte_range = parse_range(request.headers.get('Range', ''), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), as_attachment=True, filename=file_name, content_type=content_type)
+        response.block_size = DOWNLOAD_BLOCK_SIZE
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(path, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Disposition'] = f'attachment; filename="{file_name}"'
+    response['Accept-Ranges'] = 'bytes'
+    return for_server(request, response)
@@ -0,0 +1,253 @@
+import csv
+import time
+from contextlib import nullcontext
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from scraper.keyword_matcher import bump_keyword_index_version
+
+from .models import Company, Keyword, Person
+from .stats import invalidate_dashboard_stats
+
+# CSV lines read, resolved and written per transaction
+IMPORT_CHUNK_SIZE = getattr(settings, 'IMPORT_CHUNK_SIZE', 5000)
+
+TRUE_VALUES = ('true', '1', 'yes')
+
+
+def normalize_name(value: str) -> str:
+    """Key two spellings of a name compare equal under: trimmed, single-spaced, lower case"""
+    return ' '.join(value.split()).lower()
+
+
+def read_csv_records(file, columns: List[str]) -> Iterator[Dict[str, str]]:
+    """
+    Yield each non-empty CSV line as a dict of stripped values
+
+    A file whose first line contains ``columns[0]`` is read by its header;
+    any other file is read positionally in the order of ``columns``.
+    """
+    reader = csv.reader(file)
+    first = next(reader, None)
+    if first is None:
+        return
+    header = [column.strip() for column in first]
+    if columns[0] in header:
+        names, lines = header, reader
+    else:
+        names, lines = columns, _prepend(first, reader)
+
+    for line in lines:
+        if any(value.strip() for value in line):
+            yield {name: value.strip() for name, value in zip(names, line)}
+
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class ChunkedImport:
+    """
+    Chunked upsert of a CSV file: records are read ``chunk_size`` at a time
+    and each chunk is resolved against the database with a few set-based
+    queries and written in one transaction, so memory stays bounded by the
+    chunk however long the file is.
+
+    Subclasses set ``columns`` (the positional order of headerless files)
+    and implement import_chunk(). Only a dry run wraps the chunks in an
+    outer transaction, which it rolls back, so its counts are exact; a
+    real import commits chunk by chunk and never holds the write lock for
+    the whole file.
+    """
+
+    columns: List[str] = []
+
+    def __init__(self, chunk_size: Optional[int] = None, dry_run: bool = False, progress=None):
+        self.chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+        self.dry_run = dry_run
+        self.progress = progress  # Called with the importer after each chunk
+        self.read = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.duplicates = 0  # Lines repeating a key earlier in their chunk; the last one is kept
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def run(self, csv_path: str) -> 'ChunkedImport':
+        started = time.perf_counter()
+        outer = transaction.atomic() if self.dry_run else nullcontext()
+        try:
+            with open(csv_path, 'r', encoding='utf-8', newline='') as f, outer:
+                for chunk in chunked(read_csv_records(f, self.columns), self.chunk_size):
+                    with transaction.atomic():
+                        self.import_chunk(chunk)
+                    self.read += len(chunk)
+                    self.elapsed = time.perf_counter() - started
+                    if self.progress:
+                        self.progress(self)
+                if self.dry_run:
+                    transaction.set_rollback(True)
+        finally:
+            # Chunks committed before a failure stay committed, so they are announced either way
+            if not self.dry_run and (self.created or self.updated):
+                self.imported()
+        self.elapsed = time.perf_counter() - started
+        return self
+
+    def import_chunk(self, records: List[Dict[str, str]]):
+        raise NotImplementedError
+
+    def imported(self):
+        """Runs once after a real import that changed rows"""
+        invalidate_dashboard_stats()
+
+
+class KeywordImport(ChunkedImport):
+    """
+    Upserts keywords by word. Only the columns the file actually has are
+    overwritten on existing keywords, so a bare word list adds the missing
+    words without resetting anyone's categories.
+    """
+
+    columns = ['word', 'category', 'is_active']
+
+    def __init__(self, default_category: str = 'other', **kwargs):
+        super().__init__(**kwargs)
+        self.default_category = default_category
+        self.max_length = Keyword._meta.get_field('word').max_length
+
+    def import_chunk(self, records):
+        keywords = {}  # Last line wins for a word repeated in the chunk
+        supplied = set()
+        for record in records:
+            word = record.get('word', '')
+            if not word or len(word) > self.max_length:
+                self.skipped += 1
+                continue
+            supplied.update(column for column, value in record.items() if value)
+            self.duplicates += word in keywords
+            keywords[word] = Keyword(
+                word=word,
+                category=record.get('category') or self.default_category,
+                is_active=record.get('is_active', 'true').lower() in TRUE_VALUES,
+            )
+
+        update_fields = [field for field in ('category', 'is_active') if field in supplied]
+        existing = {
+            word: values
+            for word, *values in Keyword.objects.filter(word__in=keywords).values_list('word', *update_fields)
+        }
+        # Rewriting an unchanged keyword would bump updated_at and make rematch_keywords --since rescan it
+        changed = [
+            keyword for word, keyword in keywords.items()
+            if word in existing and [getattr(keyword, field) for field in update_fields] != existing[word]
+        ]
+        new = [keyword for word, keyword in keywords.items() if word not in existing]
+        if changed:
+            Keyword.objects.bulk_create(
+                new + changed,
+                update_conflicts=True,
+                unique_fields=['word'],
+                update_fields=update_fields + ['updated_at'],
+            )
+        else:
+            Keyword.objects.bulk_create(new, ignore_conflicts=True)
+        self.created += len(new)
+        self.updated += len(changed)
+        self.unchanged += len(existing) - len(changed)
+
+    def imported(self):
+        # bulk_create skips the post_save signal that normally does this
+        bump_keyword_index_version()
+        super().imported()
+
+
+class PersonImport(ChunkedImport):
+    """
+    Upserts people by normalized (name, company). Companies are looked up by
+    normalized name in a map loaded once, and missing ones are created;
+    an existing person only changes when the file gives a new LinkedIn URL.
+    """
+
+    columns = ['name', 'company', 'linkedin_url', 'website']
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.companies_created = 0
+        # The lowest id wins if the table already has duplicate names
+        self.company_ids = {
+            normalize_name(name): company_id
+            for company_id, name in Company.objects.order_by('-id').values_list('id', 'name')
+        }
+
+    def import_chunk(self, records):
+        self._create_companies(records)
+
+        people = {}  # (name key, company id) -> (name, linkedin_url); last line wins
+        for record in records:
+            name = ' '.join(record.get('name', '').split())
+            company_id = self.company_ids.get(normalize_name(record.get('company', '')))
+            if not name or company_id is None:
+                self.skipped += 1
+                continue
+            key = (normalize_name(name), company_id)
+            self.duplicates += key in people
+            people[key] = (name, record.get('linkedin_url', ''))
+
+        # Stored names are normalized in Python like the file's: SQLite's LOWER() only folds
+        # ASCII, so "ÁLVARO PÉREZ" and "Álvaro Pérez" would never meet in SQL. The lowest id
+        # wins if the table already has duplicates.
+        candidates = Person.objects.filter(
+            company_id__in={company_id for _, company_id in people},
+        ).order_by('-id').only('id', 'name', 'company_id', 'linkedin_url')
+        existing = {(normalize_name(person.name), person.company_id): person for person in candidates}
+
+        new_people, changed = [], []
+        for key, (name, linkedin_url) in people.items():
+            person = existing.get(key)
+            if person is None:
+                new_people.append(Person(name=name, company_id=key[1], linkedin_url=linkedin_url))
+            elif linkedin_url and person.linkedin_url != linkedin_url:
+                person.linkedin_url = linkedin_url
+                changed.append(person)
+            else:
+                self.unchanged += 1
+
+        # The changed people conflict on their primary key, which turns their INSERT into an UPDATE;
+        # many times faster than bulk_update's CASE WHEN per row
+        Person.objects.bulk_create(
+            new_people + changed,
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=['linkedin_url', 'updated_at'],
+        )
+        self.created += len(new_people)
+        self.updated += len(changed)
+
+    def _create_companies(self, records):
+        missing = {}
+        for record in records:
+            company = ' '.join(record.get('company', '').split())
+            key = normalize_name(company)
+            if key and key not in self.company_ids and key not in missing:
+                missing[key] = Company(name=company, website=record.get('website', ''))
+
+        Company.objects.bulk_create(missing.values())
+        for key, company in missing.items():
+            self.company_ids[key] = company.id
+        self.companies_created += len(missing)
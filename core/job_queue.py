@@ -0,0 +1,207 @@
+import logging
+import threading
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.exports import export_file_name
+from core.models import ExportJob, ScrapingJob
+from core.scraping import create_scraping_tasks
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = getattr(settings, 'WORKER_HEARTBEAT_INTERVAL', 10)  # Seconds
+STALE_AFTER = getattr(settings, 'WORKER_STALE_AFTER', 60)  # Seconds without a heartbeat
+MAX_ATTEMPTS = getattr(settings, 'WORKER_MAX_ATTEMPTS', 3)
+
+QUEUED_JOB_TYPES = ['single', 'batch']
+
+
+def enqueue_scraping_job(person_ids: List[int], job_type: str = 'batch', person=None) -> ScrapingJob:
+    """Create a queued job, with a task row per person, for run_workers to pick up"""
+    job = ScrapingJob.objects.create(
+        job_type=job_type,
+        person=person,
+        status='queued',
+        total_people=len(person_ids),
+        payload={'person_ids': list(person_ids)},
+    )
+    create_scraping_tasks(job, person_ids)
+    return job
+
+
+def resume_scraping_job(job: ScrapingJob) -> bool:
+    """
+    Put a finished job back on the queue so workers retry its failed and
+    interrupted tasks; completed tasks are kept
+
+    Returns:
+        False if the job is still queued or running
+    """
+    resumed = ScrapingJob.objects.filter(id=job.id).exclude(status__in=['queued', 'running']).update(
+        status='queued',
+        worker_id='',
+        attempts=0,
+        error_message='',
+        completed_at=None,
+    )
+    return bool(resumed)
+
+
+def enqueue_export_job(export_type: str, file_format: str, filters: Optional[Dict] = None,
+                       created_by: str = '') -> ExportJob:
+    """Create a pending export for run_workers to write to disk"""
+    return ExportJob.objects.create(
+        file_name=export_file_name(export_type, file_format),
+        file_format=file_format,
+        export_type=export_type,
+        status='pending',
+        filters_applied=filters or {},
+        created_by=created_by,
+    )
+
+
+def claim_next_job(worker_id: str) -> Optional[ScrapingJob]:
+    """Atomically claim the oldest queued scraping job for this worker"""
+    return _claim_oldest(ScrapingJob.objects.filter(job_type__in=QUEUED_JOB_TYPES), 'queued', 'running', worker_id)
+
+
+def claim_next_export(worker_id: str) -> Optional[ExportJob]:
+    """Atomically claim the oldest pending export for this worker"""
+    return _claim_oldest(ExportJob.objects.all(), 'pending', 'processing', worker_id)
+
+
+def _claim_oldest(queryset, waiting_status: str, claimed_status: str, worker_id: str):
+    """
+    Move the oldest row of ``queryset`` in ``waiting_status`` to
+    ``claimed_status`` for this worker
+
+    Uses SELECT ... FOR UPDATE SKIP LOCKED where the database supports it;
+    elsewhere (SQLite) a conditional UPDATE on the status makes sure only one
+    worker wins each job.
+    """
+    now = timezone.now()
+    waiting = queryset.filter(status=waiting_status).order_by('created_at', 'id')
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = waiting.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status = claimed_status
+            job.worker_id = worker_id
+            job.heartbeat_at = now
+            job.started_at = job.started_at or now
+            job.attempts += 1
+            job.save(update_fields=['status', 'worker_id', 'heartbeat_at', 'started_at', 'attempts'])
+            return job
+
+    while True:
+        candidate = waiting.values_list('id', flat=True).first()
+        if candidate is None:
+            return None
+        claimed = queryset.model.objects.filter(id=candidate, status=waiting_status).update(
+            status=claimed_status,
+            worker_id=worker_id,
+            heartbeat_at=now,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return queryset.model.objects.get(id=candidate)
+        # Another worker claimed it first; try the next one
+
+
+def heartbeat(job_id: int, worker_id: str) -> bool:
+    """Refresh a running job's heartbeat; False if this worker no longer owns it"""
+    return bool(ScrapingJob.objects.filter(id=job_id, worker_id=worker_id, status='running').update(
+        heartbeat_at=timezone.now()
+    ))
+
+
+def export_heartbeat(export_id: int, worker_id: str, rows_written: Optional[int] = None) -> bool:
+    """Refresh a processing export's heartbeat and progress; False if this worker no longer owns it"""
+    updates = {'heartbeat_at': timezone.now()}
+    if rows_written is not None:
+        updates['rows_written'] = rows_written
+    return bool(ExportJob.objects.filter(id=export_id, worker_id=worker_id, status='processing').update(**updates))
+
+
+def fail_job(job_id: int, worker_id: str, error_message: str) -> bool:
+    """Mark a running job failed; False if it was requeued away from this worker meanwhile"""
+    return bool(ScrapingJob.objects.filter(id=job_id, worker_id=worker_id, status='running').update(
+        status='failed',
+        error_message=error_message,
+        completed_at=timezone.now(),
+    ))
+
+
+def requeue_stale_jobs(stale_after: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Put running jobs whose worker stopped heartbeating back on the queue,
+    or fail them once they have used up MAX_ATTEMPTS
+
+    Returns:
+        (requeued, failed) counts
+    """
+    return _requeue_stale(
+        ScrapingJob.objects.filter(job_type__in=QUEUED_JOB_TYPES), 'running', 'queued', stale_after
+    )
+
+
+def requeue_stale_exports(stale_after: Optional[int] = None) -> Tuple[int, int]:
+    """Same as requeue_stale_jobs, for exports whose worker stopped heartbeating"""
+    return _requeue_stale(ExportJob.objects.all(), 'processing', 'pending', stale_after)
+
+
+def _requeue_stale(queryset, running_status: str, waiting_status: str,
+                   stale_after: Optional[int] = None) -> Tuple[int, int]:
+    cutoff = timezone.now() - timedelta(seconds=stale_after or STALE_AFTER)
+    stale = queryset.filter(status=running_status, heartbeat_at__lt=cutoff)
+
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status='failed',
+        error_message=f'Worker stopped responding after {MAX_ATTEMPTS} attempts',
+        completed_at=timezone.now(),
+    )
+    requeued = stale.filter(attempts__lt=MAX_ATTEMPTS).update(status=waiting_status, worker_id='')
+
+    if requeued or failed:
+        logger.warning(f"Requeued {requeued} stale {queryset.model._meta.verbose_name_plural}, failed {failed}")
+    return requeued, failed
+
+
+class Heartbeat(threading.Thread):
+    """Background thread that keeps a claimed job's (or, with beat=export_heartbeat, export's) heartbeat fresh"""
+
+    def __init__(self, job_id: int, worker_id: str, interval: Optional[float] = None,
+                 beat: Callable[[int, str], bool] = heartbeat):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval or HEARTBEAT_INTERVAL
+        self.beat = beat
+        self._stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stopped.wait(self.interval):
+                try:
+                    owned = self.beat(self.job_id, self.worker_id)
+                except DatabaseError as e:
+                    # Usually a busy database; the next beat will try again
+                    logger.warning(f"Heartbeat for job {self.job_id} failed: {e}")
+                    continue
+                if not owned:
+                    logger.warning(f"Lost ownership of job {self.job_id}")
+                    return
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
@@ -0,0 +1,131 @@
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.test import AsyncRequestFactory, RequestFactory
+
+from core.exports import (
+    MATCHES_HEADER, csv_response, match_values, workbook_sheets, write_csv, write_json, write_parquet, write_xlsx,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the XLSX, CSV, JSON and Parquet exports (rows/sec, file size and peak memory)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1_000_000,
+            help='Number of synthetic match rows to export (default: 1,000,000)',
+        )
+        parser.add_argument(
+            '--database',
+            action='store_true',
+            help='Export the real Results/Matches/People tables (Matches only for Parquet) instead of synthetic rows',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['xlsx', 'csv', 'json', 'parquet', 'all'],
+            default='all',
+            help='Export format to benchmark (default: all)',
+        )
+        parser.add_argument(
+            '--streaming',
+            action='store_true',
+            help='Instead, time the streamed CSV download as the WSGI and ASGI handlers consume it: '
+                 'time to first chunk and peak traced memory',
+        )
+
+    def handle(self, *args, **options):
+        if options['streaming']:
+            return self._benchmark_streaming(options)
+
+        formats = ['xlsx', 'csv', 'json', 'parquet'] if options['format'] == 'all' else [options['format']]
+        source = 'database tables' if options['database'] else f'{options["rows"]:,} synthetic match rows'
+        self.stdout.write(f'Benchmarking export of {source}')
+
+        for export_format in formats:
+            binary = export_format in ('xlsx', 'parquet')
+            with tempfile.TemporaryFile('w+b' if binary else 'w+', encoding=None if binary else 'utf-8') as spool:
+                started = time.perf_counter()
+                if export_format == 'parquet':
+                    rows = write_parquet(spool, self._records(options))
+                else:
+                    writer = {'xlsx': write_xlsx, 'csv': write_csv, 'json': write_json}[export_format]
+                    rows = writer(spool, self._sheets(options))
+                elapsed = time.perf_counter() - started
+                size_mb = spool.tell() / (1024 * 1024)
+
+            self.stdout.write(
+                f'  {export_format:<7} {rows:>10,} rows in {elapsed:7.2f}s  '
+                f'{rows / elapsed if elapsed else 0:>10,.0f} rows/sec  {size_mb:8.1f} MB  '
+                f'peak RSS {self._peak_rss_mb():.0f} MB'
+            )
+
+    def _benchmark_streaming(self, options):
+        self.stdout.write(f'Streaming a CSV download of {options["rows"]:,} synthetic match rows')
+        for server, factory in (('WSGI', RequestFactory()), ('ASGI', AsyncRequestFactory())):
+            tracemalloc.start()
+            started = time.perf_counter()
+            response = csv_response(factory.get('/'), 'benchmark.csv', MATCHES_HEADER,
+                                    self._synthetic_rows(options['rows']))
+            consume = async_to_sync(self._consume_async) if server == 'ASGI' else self._consume
+            first_chunk_at, size = consume(response)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            response.close()
+
+            self.stdout.write(
+                f'  {server}  first chunk after {(first_chunk_at - started) * 1000:7.1f}ms  '
+                f'done in {elapsed:6.2f}s  {size / (1024 * 1024):8.1f} MB sent  '
+                f'peak traced memory {peak / (1024 * 1024):6.1f} MB'
+            )
+
+    def _consume(self, response):
+        """Read the response as the WSGI handler does; returns (time of the first chunk, bytes)"""
+        first_chunk_at, size = None, 0
+        for part in response:
+            first_chunk_at = first_chunk_at or time.perf_counter()
+            size += len(part)
+        return first_chunk_at, size
+
+    async def _consume_async(self, response):
+        """Read the response as the ASGI handler does, through __aiter__"""
+        first_chunk_at, size = None, 0
+        async for part in response:
+            first_chunk_at = first_chunk_at or time.perf_counter()
+            size += len(part)
+        return first_chunk_at, size
+
+    def _sheets(self, options):
+        if options['database']:
+            return workbook_sheets()
+        return [('Matches', MATCHES_HEADER, self._synthetic_rows(options['rows']))]
+
+    def _records(self, options):
+        if options['database']:
+            return match_values(category_labels=True)
+        found_at = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        return (row[:8] + [found_at] for row in self._synthetic_rows(options['rows']))
+
+    def _synthetic_rows(self, count):
+        snippet = 'Senior engineer working with Python and Django on data pipelines ' * 4
+        for i in range(count):
+            yield [
+                f'Person {i}', f'Company {i % 5000}', f'keyword{i % 300}', 'Technology',
+                snippet[:300], f'https://www.linkedin.com/in/person-{i}', i % 7 + 1,
+                round((i % 100) / 100, 2), '2024-01-01 12:00:00',
+            ]
+
+    def _peak_rss_mb(self):
+        # ru_maxrss is in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak / 1024
+
@@ -0,0 +1,134 @@
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import Keyword
+from scraper.keyword_matcher import KeywordMatcher
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the single-pass keyword automaton against per-keyword regex scanning'
+
+    VOCABULARY = [
+        'python', 'django', 'data', 'cloud', 'platform', 'engineer', 'senior', 'manager',
+        'machine', 'learning', 'analytics', 'finance', 'banking', 'product', 'strategy',
+        'agile', 'scrum', 'devops', 'kubernetes', 'docker', 'aws', 'azure', 'sql',
+        'leadership', 'operations', 'marketing', 'sales', 'growth', 'startup', 'saas',
+        'healthcare', 'retail', 'logistics', 'security', 'compliance', 'risk', 'audit',
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=str,
+            default='30,300,3000,10000,50000',
+            help='Comma-separated keyword counts to benchmark (default: 30,300,3000,10000,50000)',
+        )
+        parser.add_argument(
+            '--content-length',
+            type=int,
+            default=15000,
+            help='Length in characters of the synthetic profile text (default: 15000)',
+        )
+        parser.add_argument(
+            '--profiles',
+            type=int,
+            default=20,
+            help='Number of synthetic profiles scanned per size (default: 20)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for reproducible keyword sets',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        matcher = KeywordMatcher()
+
+        profiles = [
+            matcher._clean_content(self._build_content(rng, options['content_length'])).lower()
+            for _ in range(options['profiles'])
+        ]
+
+        self.stdout.write(
+            f"{'keywords':>9} {'regex ms/profile':>17} {'automaton ms/profile':>21} "
+            f"{'build ms':>9} {'speedup':>8}"
+        )
+
+        for size in sizes:
+            keywords = self._build_keywords(rng, size)
+
+            build_started = time.perf_counter()
+            automaton = matcher._build_automaton(keywords)
+            build_ms = (time.perf_counter() - build_started) * 1000
+
+            patterns = [
+                (keyword, re.compile(r'\b' + re.escape(keyword.word.lower()) + r'\b', re.IGNORECASE))
+                for keyword in keywords
+                if len(keyword.word.strip()) >= matcher.min_word_length
+            ]
+
+            regex_started = time.perf_counter()
+            regex_results = [self._regex_scan(patterns, content) for content in profiles]
+            regex_ms = (time.perf_counter() - regex_started) * 1000 / len(profiles)
+
+            automaton_started = time.perf_counter()
+            automaton_results = [
+                {keyword.word: spans for keyword, spans in matcher._scan(automaton, content)}
+                for content in profiles
+            ]
+            automaton_ms = (time.perf_counter() - automaton_started) * 1000 / len(profiles)
+
+            if regex_results != automaton_results:
+                self.stdout.write(self.style.ERROR(f'  Result mismatch at {size} keywords'))
+
+            self.stdout.write(
+                f'{size:>9} {regex_ms:>17.2f} {automaton_ms:>21.2f} '
+                f'{build_ms:>9.1f} {regex_ms / automaton_ms:>7.1f}x'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Benchmark completed'))
+
+    def _build_keywords(self, rng, size):
+        words = set()
+        while len(words) < size:
+            length = rng.choice([1, 1, 2, 2, 3])
+            words.add(' '.join(rng.choice(self.VOCABULARY) for _ in range(length)) + self._suffix(rng, len(words), size))
+        categories = [choice[0] for choice in Keyword.CATEGORY_CHOICES]
+        return [
+            Keyword(id=index, word=word, category=rng.choice(categories), is_active=True)
+            for index, word in enumerate(sorted(words), 1)
+        ]
+
+    def _suffix(self, rng, index, size):
+        # Keep the base vocabulary for the first keywords so small sets still hit,
+        # then add numbered variants to reach large, realistic-sized taxonomies.
+        if index < len(self.VOCABULARY) * 2:
+            return ''
+        return f' {rng.randint(1, size)}' if rng.random() < 0.5 else f'{rng.randint(1, 99)}'
+
+    def _build_content(self, rng, length):
+        parts = []
+        total = 0
+        while total < length:
+            word = rng.choice(self.VOCABULARY)
+            if rng.random() < 0.05:
+                word += f' {rng.randint(1, 50000)}'
+            if rng.random() < 0.08:
+                word += '.'
+            parts.append(word)
+            total += len(word) + 1
+        return ' '.join(parts)
+
+    def _regex_scan(self, patterns, content):
+        results = {}
+        for keyword, pattern in patterns:
+            occurrences = [(match.start(), match.end()) for match in pattern.finditer(content)]
+            if occurrences:
+                results[keyword.word] = occurrences
+        return results
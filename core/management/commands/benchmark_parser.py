@@ -0,0 +1,145 @@
+import random
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand, CommandError
+
+from scraper.linkedin_parser import LinkedInParser
+
+
+class Command(BaseCommand):
+    help = 'Benchmark LinkedIn profile parsing over saved HTML fixtures'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--html-dir',
+            type=str,
+            help='Directory of saved profile pages (*.html); synthetic pages are used if omitted',
+        )
+        parser.add_argument(
+            '--synthetic',
+            type=int,
+            default=50,
+            help='Number of synthetic profile pages to generate when no directory is given (default: 50)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Passes over the fixture set per measurement (default: 3)',
+        )
+
+    def handle(self, *args, **options):
+        pages = self._load_pages(options)
+        if not pages:
+            raise CommandError('No HTML fixtures to benchmark')
+
+        parsers = {backend: LinkedInParser(backend=backend) for backend in ('bs4', 'lxml')}
+        legacy = parsers['bs4']
+        total_kb = sum(len(html) for _, html in pages) / 1024
+        self.stdout.write(f'Benchmarking {len(pages)} pages ({total_kb:.0f} KB), {options["repeat"]} passes')
+        
+        expected = [self._legacy_parse(legacy, html, url) for url, html in pages]
+        legacy_ms = self._time(lambda url, html: self._legacy_parse(legacy, html, url), pages, options['repeat'])
+        self.stdout.write(f'  double parse (legacy):  {legacy_ms:8.2f} ms/profile')
+        
+        for backend, parser in parsers.items():
+            mismatches = sum(
+                1 for (url, html), reference in zip(pages, expected)
+                if parser.parse_html(html, url, url) != reference
+            )
+            current_ms = self._time(lambda url, html: parser.parse_html(html, url, url), pages, options['repeat'])
+            self.stdout.write(
+                f'  single parse ({backend}):{" " * (9 - len(backend))}{current_ms:8.2f} ms/profile'
+                f'  ({legacy_ms / current_ms:.2f}x)'
+            )
+            if mismatches:
+                self.stdout.write(self.style.WARNING(
+                    f'  {mismatches} pages parsed differently from the legacy path with the {backend} backend'
+                ))
+        
+        self.stdout.write(self.style.SUCCESS('Benchmark completed'))
+
+    def _time(self, parse, pages, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for url, html in pages:
+                parse(url, html)
+        return (time.perf_counter() - started) * 1000 / (len(pages) * repeat)
+
+    def _load_pages(self, options):
+        if options['html_dir']:
+            directory = Path(options['html_dir'])
+            if not directory.is_dir():
+                raise CommandError(f'Directory not found: {directory}')
+            return [
+                (f'https://www.linkedin.com/in/{path.stem}', path.read_text(encoding='utf-8', errors='replace'))
+                for path in sorted(directory.glob('*.html'))
+            ]
+
+        rng = random.Random(7)
+        return [
+            (f'https://www.linkedin.com/in/profile-{i}', self._synthetic_page(rng, i))
+            for i in range(options['synthetic'])
+        ]
+
+    def _legacy_parse(self, parser, html, url):
+        """Reference for the previous pipeline: a prefix parse for auth walls, then a full parse"""
+        if parser._is_auth_wall_response(html, url):
+            return parser._auth_wall_profile(url)
+
+        prefix = BeautifulSoup(html[:10000], 'lxml')
+        title = prefix.find('title')
+        if title and any(indicator in title.get_text().lower() for indicator in parser.AUTH_WALL_TITLE_INDICATORS):
+            return parser._auth_wall_profile(url)
+        if any(prefix.select_one(selector) for selector in parser.LOGIN_SELECTORS):
+            return parser._auth_wall_profile(url)
+        prefix_text = prefix.get_text().lower()
+        if any(text in prefix_text for text in parser.RESTRICTED_TEXTS):
+            return parser._auth_wall_profile(url)
+
+        soup = BeautifulSoup(html, 'lxml')
+        for element in soup(parser.UNWANTED_TAGS):
+            element.decompose()
+        # One select() walk per selector, as the extractors used to do
+        found = {selector: soup.select(selector) for selector in parser._all_selectors}
+        body = soup.find('body')
+        body_text = (body or soup).get_text(separator=' ', strip=True)
+        return parser._parse_tree(soup, found, body_text, url)
+
+    def _synthetic_page(self, rng, index):
+        words = ['engineering', 'platform', 'data', 'banking', 'strategy', 'cloud', 'leadership',
+                 'python', 'analytics', 'product', 'operations', 'growth', 'risk', 'finance']
+
+        def sentence(length=12):
+            return ' '.join(rng.choice(words) for _ in range(length)).capitalize() + '.'
+
+        experience = ''.join(
+            f'<li class="experience-item"><h3>{sentence(4)}</h3><p>{sentence(30)}</p>'
+            f'<span class="date-range">20{rng.randint(10, 23)} - Present</span></li>'
+            for _ in range(rng.randint(3, 8))
+        )
+        education = ''.join(
+            f'<li class="education__list-item"><h3>{sentence(5)}</h3><p>{sentence(10)}</p></li>'
+            for _ in range(rng.randint(1, 3))
+        )
+        chrome = ''.join(
+            f'<div class="artdeco-card"><a href="/feed/{i}">{sentence(3)}</a><span>{sentence(6)}</span></div>'
+            for i in range(rng.randint(40, 80))
+        )
+        scripts = ''.join(
+            f'<script type="application/json">{{"data": "{sentence(40)}"}}</script>' for _ in range(20)
+        )
+        return f'''<!DOCTYPE html>
+<html lang="en"><head><title>Profile {index} | LinkedIn</title>
+<meta name="description" content="{sentence(20)}"><style>.a {{ color: red; }}</style>{scripts}</head>
+<body><header class="global-nav">{chrome}</header>
+<main class="core-rail">
+<section class="top-card-layout"><h1 class="top-card-layout__title">Person {index}</h1>
+<h2 class="top-card-layout__headline">{sentence(8)}</h2></section>
+<section class="core-section-container"><div class="core-section-container__content">{sentence(60)}</div></section>
+<section class="experience-section"><ul>{experience}</ul></section>
+<section class="education-section"><ul>{education}</ul></section>
+<section class="pv-skill-categories-section">{sentence(15)}</section>
+</main><footer>{chrome}</footer></body></html>'''
@@ -0,0 +1,173 @@
+import importlib
+import random
+import statistics
+import time
+from itertools import islice
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection, migrations, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import Lower
+
+from core.exports import count_export_rows, search_result_rows
+from core.models import Company, Keyword, Match, Person, ScrapingJob, SearchResult
+from core.stats import compute_dashboard_stats
+
+# The migration whose indexes and constraints are benchmarked
+INDEX_MIGRATION = 'core.migrations.0012_hot_path_indexes'
+
+SEED_BATCH_SIZE = 10_000
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed about 1M rows and time the dashboard, stats, export, scrape-pending and queue queries '
+        'with and without the hot-path indexes. Everything runs in one transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--people',
+            type=int,
+            default=250_000,
+            help='People to seed, each with a search result and ~2 matches, about 4 rows per person '
+                 '(default: 250,000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per query; the median is reported (default: 3)',
+        )
+
+    def handle(self, *args, **options):
+        random.seed(42)
+        with transaction.atomic():
+            started = time.perf_counter()
+            seeded = self._seed(options['people'])
+            self.stdout.write(f'Seeded {seeded:,} rows in {time.perf_counter() - started:.1f}s')
+
+            self._analyze()
+            after = self._time_queries(options['repeat'])
+
+            dropped = self._drop_indexes()
+            self.stdout.write(f'Dropped {dropped} indexes and constraints from {INDEX_MIGRATION.rsplit(".", 1)[1]}')
+            self._analyze()
+            before = self._time_queries(options['repeat'])
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'\n  {"query":<32} {"before":>10} {"after":>10} {"speedup":>8}')
+        for name in after:
+            speedup = before[name] / after[name] if after[name] else 0
+            self.stdout.write(f'  {name:<32} {before[name]:>8.2f}ms {after[name]:>8.2f}ms {speedup:>7.1f}x')
+
+    def _seed(self, people_count):
+        companies = Company.objects.bulk_create(
+            [Company(name=f'Bench Company {i}', website=f'https://company{i}.example.com')
+             for i in range(max(1, people_count // 20))],
+            batch_size=SEED_BATCH_SIZE,
+        )
+        keywords = Keyword.objects.bulk_create(
+            [Keyword(word=f'bench keyword {i}', category=random.choice(Keyword.CATEGORY_CHOICES)[0],
+                     is_active=random.random() < 0.8) for i in range(500)],
+        )
+        jobs = ScrapingJob.objects.bulk_create(
+            [ScrapingJob(status=random.choice(['queued', 'completed', 'completed', 'failed'])) for _ in range(5000)],
+        )
+        seeded = len(companies) + len(keywords) + len(jobs)
+
+        for start in range(0, people_count, SEED_BATCH_SIZE):
+            people = Person.objects.bulk_create([
+                Person(
+                    name=f'Bench Person {i}',
+                    company_id=companies[i % len(companies)].id,
+                    linkedin_url=f'https://www.linkedin.com/in/bench{i}' if random.random() < 0.6 else '',
+                )
+                for i in range(start, min(start + SEED_BATCH_SIZE, people_count))
+            ])
+            results = SearchResult.objects.bulk_create([
+                SearchResult(
+                    person_id=person.id,
+                    status=random.choices(['completed', 'pending', 'failed'], [7, 2, 1])[0],
+                    profile_headline=f'Headline of {person.name}',
+                )
+                for person in people
+            ])
+            matches = Match.objects.bulk_create([
+                Match(search_result_id=result.id, keyword_id=keyword.id,
+                      context_snippet='... bench context ...', source_url='https://www.linkedin.com/in/bench')
+                for result in results if result.status == 'completed'
+                for keyword in random.sample(keywords, 3)
+            ], batch_size=SEED_BATCH_SIZE)
+            seeded += len(people) + len(results) + len(matches)
+        return seeded
+
+    def _queries(self):
+        sample = Person.objects.order_by('?').values_list('name', 'company_id').first()
+        return {
+            'dashboard: people': lambda: list(Person.objects.filter(
+                id__in=Person.objects.order_by('-created_at').values('id')[:50],
+            ).select_related('company').annotate(
+                result_count=Count('search_results'),
+                match_count=Count('search_results__matches'),
+            ).order_by('-created_at')[:50]),
+            'dashboard: recent results': lambda: list(SearchResult.objects.select_related(
+                'person', 'person__company',
+            ).prefetch_related('matches__keyword').order_by('-scraped_at')[:20]),
+            'dashboard: recent matches': lambda: list(Match.objects.select_related(
+                'search_result__person', 'search_result__person__company', 'keyword',
+            ).order_by('-created_at')[:30]),
+            'dashboard: active keywords': lambda: list(Keyword.objects.filter(is_active=True).order_by('category', 'word')),
+            'dashboard: recent jobs': lambda: list(ScrapingJob.objects.order_by('-created_at')[:10]),
+            'get_stats: counts': compute_dashboard_stats,
+            'export: count completed': lambda: count_export_rows('results', {'status': 'completed'}),
+            'export: first 1000 completed': lambda: list(islice(search_result_rows('completed'), 1000)),
+            'scrape pending: people': lambda: list(Person.objects.select_related('company').filter(
+                Q(search_results__isnull=True) | Q(search_results__status='pending')
+            ).distinct()[:10]),
+            'queue: claim next job': lambda: list(ScrapingJob.objects.filter(
+                status='queued',
+            ).order_by('created_at', 'id').values_list('id', flat=True)[:10]),
+            'import: person by name': lambda: Person.objects.annotate(name_key=Lower('name')).filter(
+                name_key=sample[0].lower(), company_id=sample[1],
+            ).exists(),
+        }
+
+    def _time_queries(self, repeat):
+        timings = {}
+        for name, query in self._queries().items():
+            runs = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                query()
+                runs.append((time.perf_counter() - started) * 1000)
+            timings[name] = statistics.median(runs)
+        return timings
+
+    def _drop_indexes(self):
+        """Drop what the index migration added, inside the benchmark's transaction"""
+        operations = importlib.import_module(INDEX_MIGRATION).Migration.operations
+        # Every one of them, the functional unique constraint included, is an index. The backend's
+        # DROP INDEX template is run directly because SQLite's schema editor refuses to open
+        # inside a transaction.
+        editor = connection.schema_editor()
+        statements = []
+        for operation in operations:
+            if isinstance(operation, (migrations.AddIndex, migrations.AddConstraint)):
+                model = apps.get_model('core', operation.model_name)
+                name = operation.index.name if isinstance(operation, migrations.AddIndex) else operation.constraint.name
+                statements.append(editor.sql_delete_index % {
+                    'table': editor.quote_name(model._meta.db_table),
+                    'name': editor.quote_name(name),
+                })
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+        return len(statements)
+
+    def _analyze(self):
+        """Refresh planner statistics for the seeded rows"""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
@@ -1,6 +1,6 @@
-import csv
 from django.core.management.base import BaseCommand
-from core.models import Keyword
+
+from core.importers import IMPORT_CHUNK_SIZE, KeywordImport
 
 
 class Command(BaseCommand):
@@ -18,58 +18,44 @@ class Command(BaseCommand):
             default='other',
             help='Default category for keywords without one',
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help=f'CSV lines written per transaction (default: {IMPORT_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be imported, then roll everything back',
+        )
 
     def handle(self, *args, **options):
         csv_file = options['csv_file']
-        default_category = options['category']
-        
-        created_count = 0
-        updated_count = 0
-        
+        verbosity = options['verbosity']
+
         try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                if 'word' not in reader.fieldnames:
-                    reader = csv.reader(open(csv_file, 'r', encoding='utf-8'))
-                    for row in reader:
-                        if row:
-                            word = row[0].strip()
-                            category = row[1].strip() if len(row) > 1 else default_category
-                            
-                            keyword, created = Keyword.objects.get_or_create(
-                                word=word,
-                                defaults={'category': category, 'is_active': True}
-                            )
-                            
-                            if created:
-                                created_count += 1
-                            else:
-                                updated_count += 1
-                else:
-                    for row in reader:
-                        word = row.get('word', '').strip()
-                        if not word:
-                            continue
-                            
-                        category = row.get('category', default_category).strip() or default_category
-                        is_active = row.get('is_active', 'true').lower() in ('true', '1', 'yes')
-                        
-                        keyword, created = Keyword.objects.get_or_create(
-                            word=word,
-                            defaults={'category': category, 'is_active': is_active}
-                        )
-                        
-                        if created:
-                            created_count += 1
-                        else:
-                            updated_count += 1
-            
+            result = KeywordImport(
+                default_category=options['category'],
+                chunk_size=options['chunk_size'],
+                dry_run=options['dry_run'],
+                progress=self._report_chunk if verbosity > 1 else None,
+            ).run(csv_file)
+
+            merged = f', {result.duplicates} duplicate lines merged' if result.duplicates else ''
+            prefix = 'Dry run, nothing saved: ' if result.dry_run else 'Import completed: '
             self.stdout.write(self.style.SUCCESS(
-                f'Import completed: {created_count} created, {updated_count} already existed'
+                f'{prefix}{result.created} created, {result.updated} updated, '
+                f'{result.unchanged} already existed, {result.skipped} skipped{merged}'
             ))
-            
+            self.stdout.write(
+                f'{result.read:,} lines in {result.elapsed:.2f}s ({result.rows_per_second:,.0f} rows/sec)'
+            )
+
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f'File not found: {csv_file}'))
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error importing keywords: {e}'))
+
+    def _report_chunk(self, result):
+        self.stdout.write(f'  {result.read:,} lines, {result.rows_per_second:,.0f} rows/sec')
@@ -1,10 +1,10 @@
-import csv
 from django.core.management.base import BaseCommand
-from core.models import Person
+
+from core.importers import IMPORT_CHUNK_SIZE, PersonImport
 
 
 class Command(BaseCommand):
-    help = 'Import people from a CSV file'
+    help = 'Import people from a CSV file (name, company, linkedin_url, website)'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -12,61 +12,44 @@ class Command(BaseCommand):
             type=str,
             help='Path to the CSV file containing people',
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help=f'CSV lines written per transaction (default: {IMPORT_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be imported, then roll everything back',
+        )
 
     def handle(self, *args, **options):
         csv_file = options['csv_file']
-        
-        created_count = 0
-        updated_count = 0
-        
+        verbosity = options['verbosity']
+
         try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                if not reader.fieldnames or 'name' not in reader.fieldnames:
-                    f.seek(0)
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if row:
-                            name = row[0].strip()
-                            company = row[1].strip() if len(row) > 1 else ''
-                            linkedin_url = row[2].strip() if len(row) > 2 else ''
-                            
-                            person, created = Person.objects.get_or_create(
-                                name=name,
-                                company=company,
-                                defaults={'linkedin_url': linkedin_url}
-                            )
-                            
-                            if created:
-                                created_count += 1
-                            else:
-                                updated_count += 1
-                else:
-                    for row in reader:
-                        name = row.get('name', '').strip()
-                        if not name:
-                            continue
-                            
-                        company = row.get('company', '').strip()
-                        linkedin_url = row.get('linkedin_url', '').strip()
-                        
-                        person, created = Person.objects.get_or_create(
-                            name=name,
-                            company=company,
-                            defaults={'linkedin_url': linkedin_url}
-                        )
-                        
-                        if created:
-                            created_count += 1
-                        else:
-                            updated_count += 1
-            
+            result = PersonImport(
+                chunk_size=options['chunk_size'],
+                dry_run=options['dry_run'],
+                progress=self._report_chunk if verbosity > 1 else None,
+            ).run(csv_file)
+
+            merged = f', {result.duplicates} duplicate lines merged' if result.duplicates else ''
+            prefix = 'Dry run, nothing saved: ' if result.dry_run else 'Import completed: '
             self.stdout.write(self.style.SUCCESS(
-                f'Import completed: {created_count} created, {updated_count} already existed'
+                f'{prefix}{result.created} created, {result.updated} updated, '
+                f'{result.unchanged} already existed, {result.skipped} skipped '
+                f'(no name or company), {result.companies_created} new companies{merged}'
             ))
-            
+            self.stdout.write(
+                f'{result.read:,} lines in {result.elapsed:.2f}s ({result.rows_per_second:,.0f} rows/sec)'
+            )
+
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f'File not found: {csv_file}'))
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error importing people: {e}'))
+
+    def _report_chunk(self, result):
+        self.stdout.write(f'  {result.read:,} lines, {result.rows_per_second:,.0f} rows/sec')
@@ -0,0 +1,191 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from core.models import Keyword, Match, Person, SearchResult
+from scraper.keyword_matcher import KeywordMatcher, get_keyword_index_version
+
+PROFILE_FIELDS = (
+    'id', 'source_url', 'person__linkedin_url', 'profile_headline',
+    'profile_about', 'profile_experience', 'profile_content',
+)
+
+# Per-process state set up by _init_worker
+_matcher = None
+_automaton = None
+
+
+def _init_worker(keyword_rows):
+    """Compile the keyword index once per worker process"""
+    global _matcher, _automaton
+    import django
+    django.setup()
+
+    _matcher = KeywordMatcher()
+    keywords = [
+        Keyword(id=keyword_id, word=word, category=category, is_active=True)
+        for keyword_id, word, category in keyword_rows
+    ]
+    _automaton = _matcher._build_automaton(keywords)
+
+
+def _match_chunk(rows):
+    """Return plain match tuples for a chunk of profile rows"""
+    results = []
+    for sr_id, source_url, linkedin_url, headline, about, experience, content in rows:
+        search_result = SearchResult(
+            id=sr_id, source_url=source_url, profile_headline=headline,
+            profile_about=about, profile_experience=experience, profile_content=content,
+        )
+        search_result.person = Person(linkedin_url=linkedin_url or '')
+
+        searchable = _matcher._build_searchable_content(search_result)
+        if not searchable:
+            continue
+        for match in _matcher._match_content(_automaton, searchable, search_result):
+            results.append((
+                sr_id, match.keyword.id, match.context_snippet, match.source_url,
+                match.match_count, match.confidence_score,
+            ))
+    return [row[0] for row in rows], results
+
+
+class Command(BaseCommand):
+    help = 'Recompute keyword matches for every completed search result using a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of matcher processes (default: CPU count, 0 runs in-process)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Search results per primary-key chunk (default: 500)',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            default='rematch_all.checkpoint.json',
+            help='File recording the last fully written search result ID',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue after the ID stored in the checkpoint file',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        checkpoint_path = options['checkpoint']
+        keyword_version = get_keyword_index_version()
+
+        last_id = 0
+        if options['resume']:
+            last_id = self._load_checkpoint(checkpoint_path, keyword_version)
+
+        matcher = KeywordMatcher()
+        keyword_rows = [
+            (keyword.id, keyword.word, keyword.category)
+            for keyword in Keyword.objects.filter(is_active=True)
+            if len(keyword.word.strip()) >= matcher.min_word_length
+        ]
+        if not keyword_rows:
+            raise CommandError('No active keywords to match')
+
+        queryset = SearchResult.objects.filter(status='completed', id__gt=last_id)
+        total = queryset.count()
+        self.stdout.write(
+            f'Rematching {total} search results against {len(keyword_rows)} keywords '
+            f'with {options["workers"]} workers (starting after ID {last_id})'
+        )
+
+        rows = queryset.order_by('id').values_list(*PROFILE_FIELDS).iterator(chunk_size=chunk_size)
+        stats = {'profiles': 0, 'matches': 0, 'started': time.perf_counter()}
+
+        if options['workers'] > 0:
+            # Workers never touch the database; don't let them inherit open connections
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options['workers'],
+                initializer=_init_worker,
+                initargs=(keyword_rows,),
+            ) as executor:
+                pending = deque()
+                for chunk in self._chunks(rows, chunk_size):
+                    pending.append(executor.submit(_match_chunk, chunk))
+                    # Keep a bounded number of chunks in flight, written back in order
+                    if len(pending) >= options['workers'] * 2:
+                        self._write_chunk(*pending.popleft().result(), stats, total, checkpoint_path, keyword_version)
+                while pending:
+                    self._write_chunk(*pending.popleft().result(), stats, total, checkpoint_path, keyword_version)
+        else:
+            _init_worker(keyword_rows)
+            for chunk in self._chunks(rows, chunk_size):
+                self._write_chunk(*_match_chunk(chunk), stats, total, checkpoint_path, keyword_version)
+
+        elapsed = time.perf_counter() - stats['started']
+        rate = stats['profiles'] / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Rematched {stats['profiles']} profiles in {elapsed:.1f}s "
+            f"({rate:.0f} profiles/sec), {stats['matches']} matches written"
+        ))
+
+    def _chunks(self, rows, chunk_size):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _write_chunk(self, search_result_ids, results, stats, total, checkpoint_path, keyword_version):
+        matches = [
+            Match(
+                search_result_id=sr_id, keyword_id=keyword_id, context_snippet=context,
+                source_url=source_url, match_count=match_count, confidence_score=confidence,
+            )
+            for sr_id, keyword_id, context, source_url, match_count, confidence in results
+        ]
+
+        with transaction.atomic():
+            Match.objects.filter(search_result_id__in=search_result_ids).delete()
+            Match.objects.bulk_create(matches)
+
+        stats['profiles'] += len(search_result_ids)
+        stats['matches'] += len(matches)
+        self._save_checkpoint(checkpoint_path, max(search_result_ids), keyword_version)
+
+        elapsed = time.perf_counter() - stats['started']
+        rate = stats['profiles'] / elapsed if elapsed else 0
+        self.stdout.write(f"  {stats['profiles']}/{total} profiles ({rate:.0f} profiles/sec)")
+
+    def _load_checkpoint(self, path, keyword_version):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            self.stdout.write(self.style.WARNING(f'No checkpoint at {path}, starting from the beginning'))
+            return 0
+
+        if checkpoint.get('keyword_version') != keyword_version:
+            self.stdout.write(self.style.WARNING(
+                'Keywords changed since the checkpoint was written; earlier profiles may be stale'
+            ))
+        return checkpoint.get('last_id', 0)
+
+    def _save_checkpoint(self, path, last_id, keyword_version):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'last_id': last_id, 'keyword_version': keyword_version}, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,96 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import Keyword, RunWatermark
+from scraper.keyword_matcher import KeywordMatcher
+
+# Name of the watermark row recording the last run
+WATERMARK_NAME = 'rematch_keywords'
+
+
+class Command(BaseCommand):
+    help = 'Update stored matches for new or changed keywords only, without rescanning every keyword'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'keywords',
+            nargs='*',
+            help='Keyword IDs or words to rematch (default: keywords changed since the last run)',
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Rematch keywords created or updated since this ISO datetime',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Search results processed per transaction (default: 500)',
+        )
+        parser.add_argument(
+            '--no-prefilter',
+            action='store_true',
+            help='Scan every completed profile instead of letting the database skip non-candidates',
+        )
+
+    def handle(self, *args, **options):
+        started_at = timezone.now()
+        keywords = self._resolve_keywords(options)
+
+        if not keywords:
+            self.stdout.write(self.style.WARNING('No new or changed keywords to rematch'))
+            self._save_watermark(started_at)
+            return
+
+        self.stdout.write(f'Rematching {len(keywords)} keywords: {", ".join(k.word for k in keywords[:10])}'
+                          f'{"..." if len(keywords) > 10 else ""}')
+
+        timer = time.perf_counter()
+        stats = KeywordMatcher().rematch_keywords(
+            keywords,
+            batch_size=options['batch_size'],
+            prefilter=not options['no_prefilter'],
+        )
+        elapsed = time.perf_counter() - timer
+
+        if not options['keywords']:
+            self._save_watermark(started_at)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {stats['scanned']} profiles in {elapsed:.1f}s: "
+            f"{stats['matches']} matches written, {stats['deleted']} rows deleted"
+        ))
+
+    def _resolve_keywords(self, options):
+        if options['keywords']:
+            ids = [value for value in options['keywords'] if value.isdigit()]
+            words = [value for value in options['keywords'] if not value.isdigit()]
+            keywords = list(Keyword.objects.filter(Q(id__in=ids) | Q(word__in=words)))
+            found = {str(keyword.id) for keyword in keywords} | {keyword.word for keyword in keywords}
+            missing = [value for value in options['keywords'] if value not in found]
+            if missing:
+                raise CommandError(f"Keywords not found: {', '.join(missing)}")
+            return keywords
+
+        since = options['since'] or RunWatermark.objects.filter(
+            name=WATERMARK_NAME,
+        ).values_list('last_run_at', flat=True).first()
+        if not since:
+            raise CommandError('Specify keywords or --since (no previous run recorded)')
+
+        since_dt = parse_datetime(since) if isinstance(since, str) else since
+        if not isinstance(since_dt, datetime):
+            raise CommandError(f'Invalid datetime: {since}')
+        if timezone.is_naive(since_dt):
+            since_dt = timezone.make_aware(since_dt)
+
+        return list(Keyword.objects.filter(Q(created_at__gte=since_dt) | Q(updated_at__gte=since_dt)))
+
+    def _save_watermark(self, started_at):
+        RunWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={'last_run_at': started_at})
@@ -0,0 +1,171 @@
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from core.models import SearchResult
+from scraper.linkedin_parser import parse_profile_page
+from scraper.page_archive import PageArchive, page_archive
+
+PROFILE_UPDATE_FIELDS = [
+    'profile_content', 'profile_headline', 'profile_about', 'profile_experience',
+    'status', 'error_message', 'updated_at',
+]
+
+# Per-process state set up by _init_worker
+_archive = None
+_backend = None
+
+
+def _init_worker(archive_root, backend):
+    """Open the archive once per worker process"""
+    global _archive, _backend
+    import django
+    django.setup()
+
+    _archive = PageArchive(archive_root)
+    _backend = backend
+
+
+def _reparse_chunk(items):
+    """Parse archived pages for (search_result_id, url, sha256, final_url) items"""
+    results = []
+    for sr_id, url, sha256, final_url in items:
+        try:
+            html_content = _archive.get(sha256)
+        except (OSError, zlib.error, UnicodeDecodeError) as e:
+            results.append((sr_id, None, f'Archived page unreadable: {e}'))
+            continue
+        results.append((sr_id, parse_profile_page(html_content, final_url or url, url, _backend), None))
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Rebuild SearchResult profile fields from archived pages, without any network access'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of parser processes (default: CPU count, 0 runs in-process)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=200,
+            help='Pages per worker task and per database write (default: 200)',
+        )
+        parser.add_argument(
+            '--backend',
+            choices=['bs4', 'lxml'],
+            default=getattr(settings, 'LINKEDIN_PARSER_BACKEND', 'bs4'),
+            help='HTML parser backend (default: LINKEDIN_PARSER_BACKEND)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Maximum number of search results to re-parse',
+        )
+
+    def handle(self, *args, **options):
+        latest = page_archive.latest_pages()
+        if not latest:
+            raise CommandError(f'No archived pages indexed (archive root: {page_archive.root})')
+
+        items = []
+        rows = SearchResult.objects.filter(content_source='linkedin').order_by('id').values_list(
+            'id', 'source_url', 'person__linkedin_url'
+        )
+        for sr_id, source_url, linkedin_url in rows.iterator(chunk_size=5000):
+            url = source_url if source_url in latest else linkedin_url
+            if url in latest:
+                sha256, final_url = latest[url]
+                items.append((sr_id, url, sha256, final_url))
+        if options['limit']:
+            items = items[:options['limit']]
+
+        if not items:
+            raise CommandError('No search results have an archived page')
+
+        self.stdout.write(
+            f'Re-parsing {len(items)} archived pages ({len(latest)} URLs indexed) '
+            f'with the {options["backend"]} backend and {options["workers"]} workers'
+        )
+
+        chunk_size = options['chunk_size']
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+        stats = {'pages': 0, 'completed': 0, 'failed': 0, 'unreadable': 0, 'started': time.perf_counter()}
+
+        if options['workers'] > 0:
+            # Workers never touch the database; don't let them inherit open connections
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options['workers'],
+                initializer=_init_worker,
+                initargs=(str(page_archive.root), options['backend']),
+            ) as executor:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(_reparse_chunk, chunk))
+                    # Keep a bounded number of chunks in flight
+                    if len(pending) >= options['workers'] * 2:
+                        self._write_chunk(pending.popleft().result(), stats, len(items))
+                while pending:
+                    self._write_chunk(pending.popleft().result(), stats, len(items))
+        else:
+            _init_worker(str(page_archive.root), options['backend'])
+            for chunk in chunks:
+                self._write_chunk(_reparse_chunk(chunk), stats, len(items))
+
+        elapsed = time.perf_counter() - stats['started']
+        rate = stats['pages'] / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-parsed {stats['pages']} pages in {elapsed:.1f}s ({rate:.0f} pages/sec): "
+            f"{stats['completed']} completed, {stats['failed']} failed, {stats['unreadable']} unreadable"
+        ))
+        self.stdout.write('Run rematch_all to refresh keyword matches for the new content.')
+
+    def _write_chunk(self, results, stats, total):
+        search_results = SearchResult.objects.in_bulk([sr_id for sr_id, _, _ in results])
+        updated = []
+        now = timezone.now()
+
+        for sr_id, profile_data, error in results:
+            stats['pages'] += 1
+            search_result = search_results.get(sr_id)
+            if search_result is None:
+                continue
+            if error:
+                stats['unreadable'] += 1
+                self.stdout.write(self.style.WARNING(f'  Search result {sr_id}: {error}'))
+                continue
+
+            if profile_data.get('error') or profile_data.get('auth_wall'):
+                search_result.status = 'failed'
+                search_result.error_message = profile_data.get('error') or 'LinkedIn requires authentication'
+                stats['failed'] += 1
+            else:
+                search_result.profile_content = profile_data.get('full_content', '')
+                search_result.profile_headline = profile_data.get('headline', '')
+                search_result.profile_about = profile_data.get('about', '')
+                search_result.profile_experience = profile_data.get('experience', '')
+                search_result.status = 'completed'
+                search_result.error_message = ''
+                stats['completed'] += 1
+            # bulk_update() doesn't apply auto_now
+            search_result.updated_at = now
+            updated.append(search_result)
+
+        with transaction.atomic():
+            SearchResult.objects.bulk_update(updated, PROFILE_UPDATE_FIELDS)
+
+        elapsed = time.perf_counter() - stats['started']
+        rate = stats['pages'] / elapsed if elapsed else 0
+        self.stdout.write(f"  {stats['pages']}/{total} pages ({rate:.0f} pages/sec)")
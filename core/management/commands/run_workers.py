@@ -0,0 +1,149 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_loop(poll_interval, burst):
+    """Claim and run pending exports and queued scraping jobs until stopped (or the queue drains in burst mode)"""
+    import django
+    django.setup()
+
+    from core.exports import run_export_job
+    from core.job_queue import (
+        Heartbeat, claim_next_export, claim_next_job, export_heartbeat, fail_job, requeue_stale_exports,
+        requeue_stale_jobs,
+    )
+    from core.pipeline import ScrapingPipeline
+    from core.scraping import PersonScraper, run_scraping_job
+    from scraper.query_cache import query_cache
+
+    worker_id = f'{socket.gethostname()}:{os.getpid()}'
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    scraper = PersonScraper()
+    # Start the pipeline's CPU processes once; they are reused by every job
+    pipeline = ScrapingPipeline()
+    pipeline.start()
+    logger.info(f"Worker {worker_id} started")
+
+    purge_interval = getattr(settings, 'GOOGLE_CSE_CACHE_PURGE_INTERVAL', 3600)
+    next_purge = time.monotonic()
+
+    while not stopping:
+        requeue_stale_jobs()
+        requeue_stale_exports()
+
+        # Expired search cache entries are never read again; without this they pile up
+        if time.monotonic() >= next_purge:
+            purged = query_cache.purge_expired()
+            if purged:
+                logger.info(f"Worker {worker_id} purged {purged} expired search cache entries")
+            next_purge = time.monotonic() + purge_interval
+
+        # Exports go first: someone is usually waiting on the download
+        export_job = claim_next_export(worker_id)
+        if export_job is not None:
+            logger.info(f"Worker {worker_id} running export {export_job.id} (attempt {export_job.attempts})")
+            # The heartbeat also stores the rows written so far, kept on export_job by run_export_job
+            beat = Heartbeat(
+                export_job.id, worker_id,
+                beat=lambda export_id, owner: export_heartbeat(export_id, owner, export_job.rows_written),
+            )
+            beat.start()
+            try:
+                run_export_job(export_job)
+            except Exception as e:
+                logger.error(f"Export {export_job.id} failed: {e}")
+            finally:
+                beat.stop()
+            continue
+
+        job = claim_next_job(worker_id)
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info(f"Worker {worker_id} running job {job.id} (attempt {job.attempts})")
+        beat = Heartbeat(job.id, worker_id)
+        beat.start()
+        try:
+            run_scraping_job(job, scraper=scraper, pipeline=pipeline)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            # A job requeued to another worker while this one was stuck is no longer ours to fail
+            if not fail_job(job.id, worker_id, str(e)):
+                logger.warning(f"Job {job.id} was requeued meanwhile; leaving it to its new worker")
+        finally:
+            beat.stop()
+
+    pipeline.close()
+    connections.close_all()
+    logger.info(f"Worker {worker_id} stopped")
+
+
+class Command(BaseCommand):
+    help = 'Start worker processes that run queued scraping jobs and exports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Number of worker processes (default: 2)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait when the queue is empty (default: 2)',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once the queue is empty instead of waiting for new jobs',
+        )
+
+    def handle(self, *args, **options):
+        # Forked workers must open their own database connections
+        connections.close_all()
+
+        processes = []
+        for _ in range(max(1, options['workers'])):
+            process = multiprocessing.Process(
+                target=_worker_loop,
+                args=(options['poll_interval'], options['burst']),
+            )
+            process.start()
+            processes.append(process)
+
+        self.stdout.write(f'Started {len(processes)} workers (Ctrl+C to stop)')
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping workers after their current job...')
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+
+        self.stdout.write(self.style.SUCCESS('All workers stopped'))
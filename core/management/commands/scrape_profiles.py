@@ -2,10 +2,9 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db.models import Q
 from django.utils import timezone
 
-from core.models import Person, SearchResult, ScrapingJob
+from core.models import Person, ScrapingJob
+from core.scraping import PersonScraper, create_scraping_tasks, run_scraping_job
 from scraper.google_cse import GoogleCSEService
-from scraper.linkedin_parser import LinkedInParser
-from scraper.keyword_matcher import KeywordMatcher
 
 
 class Command(BaseCommand):
@@ -28,12 +27,51 @@ class Command(BaseCommand):
             action='store_true',
             help='Only scrape people without completed results',
         )
+        parser.add_argument(
+            '--resume',
+            type=int,
+            metavar='JOB_ID',
+            help='Resume an earlier job, retrying only its failed and interrupted people',
+        )
 
     def handle(self, *args, **options):
         cse_service = GoogleCSEService()
-        profile_parser = LinkedInParser()
-        matcher = KeywordMatcher()
 
+        if options['resume']:
+            try:
+                job = ScrapingJob.objects.get(id=options['resume'])
+            except ScrapingJob.DoesNotExist:
+                raise CommandError(f"Scraping job {options['resume']} not found")
+            job.status = 'running'
+            job.started_at = job.started_at or timezone.now()
+            job.save(update_fields=['status', 'started_at'])
+        else:
+            job = self._create_job(cse_service, options)
+            if job is None:
+                return
+
+        remaining = job.tasks.exclude(status='completed').count()
+        self.stdout.write(
+            f'Processing {remaining} of {job.total_people} people in job {job.id} '
+            f'(if interrupted, continue with --resume {job.id})...'
+        )
+
+        run_scraping_job(job, on_progress=self._report, scraper=PersonScraper(cse_service=cse_service))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\nCompleted: {job.success_count} successful, {job.error_count} errors'
+        ))
+        for stage, stats in job.result.get('throughput', {}).items():
+            self.stdout.write(
+                f"  {stage:<7} {stats['processed']:>5} items  {stats['items_per_second']:>7.2f}/s  "
+                f"{stats['workers']} workers  {stats['utilization']:.0%} busy"
+            )
+        if job.result.get('deferred_count'):
+            self.stdout.write(self.style.WARNING(
+                f"{job.result['deferred_count']} people deferred until the Google CSE quota resets"
+            ))
+
+    def _create_job(self, cse_service, options):
         if options['person_id']:
             try:
                 people = [Person.objects.get(id=options['person_id'])]
@@ -48,103 +86,35 @@ class Command(BaseCommand):
 
         if not people:
             self.stdout.write(self.style.WARNING('No people to process'))
-            return
+            return None
+
+        # Only plan as many profile searches as today's shared quota allows
+        people, deferred = cse_service.fit_to_quota(people)
+        if deferred:
+            self.stdout.write(self.style.WARNING(
+                f'Google CSE quota exhausted for today: deferring {len(deferred)} people without a LinkedIn URL'
+            ))
+        if not people:
+            return None
 
         job = ScrapingJob.objects.create(
             total_people=len(people),
             status='running',
-            started_at=timezone.now()
+            started_at=timezone.now(),
+            payload={'person_ids': [person.id for person in people]},
         )
+        create_scraping_tasks(job, [person.id for person in people])
+        return job
 
-        self.stdout.write(f'Processing {len(people)} people...')
-
-        for person in people:
-            self.stdout.write(f'  Processing: {person.name}')
-            
-            try:
-                linkedin_url = person.linkedin_url
-                if not linkedin_url:
-                    self.stdout.write('    Searching for LinkedIn profile...')
-                    search_results = cse_service.search_linkedin_profile(person.name, person.company)
-                    if search_results:
-                        linkedin_url = search_results[0].get('link', '')
-                        person.linkedin_url = linkedin_url
-                        person.save()
-                        self.stdout.write(f'    Found: {linkedin_url}')
-
-                if linkedin_url:
-                    search_result, created = SearchResult.objects.get_or_create(
-                        person=person,
-                        defaults={'status': 'pending'}
-                    )
-                    
-                    if not created:
-                        search_result.status = 'pending'
-                        search_result.error_message = ''
-                        search_result.save()
-
-                    self.stdout.write('    Scraping profile...')
-                    profile_data = profile_parser.scrape_profile(linkedin_url)
-                    
-                    if profile_data.get('error') or profile_data.get('auth_wall'):
-                        error_msg = profile_data.get('error') or 'LinkedIn requires authentication'
-                        search_result.status = 'failed'
-                        search_result.error_message = error_msg
-                        search_result.save()
-                        job.error_count += 1
-                        job.processed_count += 1
-                        job.save()
-                        self.stdout.write(
-                            self.style.WARNING(f'    Failed: {error_msg}')
-                        )
-                        continue
-                    
-                    search_result.profile_content = profile_data.get('full_content', '')
-                    search_result.profile_headline = profile_data.get('headline', '')
-                    search_result.profile_about = profile_data.get('about', '')
-                    search_result.profile_experience = profile_data.get('experience', '')
-                    search_result.source_url = linkedin_url
-                    search_result.status = 'completed'
-                    search_result.save()
-
-                    self.stdout.write('    Finding keyword matches...')
-                    matches = matcher.find_matches(search_result)
-                    
-                    job.success_count += 1
-                    job.processed_count += 1
-                    job.save()
-                    self.stdout.write(
-                        self.style.SUCCESS(f'    Success: {len(matches)} matches found')
-                    )
-                else:
-                    search_result, _ = SearchResult.objects.get_or_create(
-                        person=person,
-                        defaults={'status': 'failed', 'error_message': 'No LinkedIn profile found'}
-                    )
-                    if search_result.status != 'failed':
-                        search_result.status = 'failed'
-                        search_result.error_message = 'No LinkedIn profile found'
-                        search_result.save()
-                    
-                    job.error_count += 1
-                    job.processed_count += 1
-                    job.save()
-                    self.stdout.write(
-                        self.style.WARNING('    No LinkedIn profile found')
-                    )
-
-            except Exception as e:
-                job.error_count += 1
-                job.processed_count += 1
-                job.save()
-                self.stdout.write(
-                    self.style.ERROR(f'    Error: {str(e)}')
-                )
-
-        job.status = 'completed'
-        job.completed_at = timezone.now()
-        job.save()
+    def _report(self, job, task):
+        prefix = f'  [{job.processed_count}/{job.total_people}] {task.person.name}'
+        if task.status == 'completed':
+            self.stdout.write(self.style.SUCCESS(f'{prefix}: {task.matches_count} matches found'))
+        else:
+            self.stdout.write(self.style.WARNING(f'{prefix}: failed at {self._failed_stage(task)} - {task.error_message}'))
 
-        self.stdout.write(self.style.SUCCESS(
-            f'\nCompleted: {job.success_count} successful, {job.error_count} errors'
-        ))
+    def _failed_stage(self, task):
+        for stage in task.STAGES:
+            if getattr(task, f'{stage}_status') == 'failed':
+                return stage
+        return 'unknown stage'
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_company_exportjob_alter_match_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='keyword',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
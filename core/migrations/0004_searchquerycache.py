@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_keyword_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query_key', models.CharField(max_length=64, unique=True)),
+                ('query', models.TextField()),
+                ('num_results', models.PositiveSmallIntegerField()),
+                ('results', models.JSONField(blank=True, default=list)),
+                ('is_negative', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Search query cache',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
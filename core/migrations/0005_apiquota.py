@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_searchquerycache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=50)),
+                ('day', models.DateField()),
+                ('used', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'API quotas',
+                'ordering': ['-day', 'provider'],
+                'unique_together': {('provider', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_apiquota'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RawPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500)),
+                ('final_url', models.URLField(blank=True, max_length=500)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField(default=200)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('fetched_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-fetched_at'],
+                'indexes': [models.Index(fields=['url', '-fetched_at'], name='core_rawpag_url_c4f484_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_rawpage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapingjob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scrapingjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='scrapingjob',
+            name='payload',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='scrapingjob',
+            name='result',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='scrapingjob',
+            name='worker_id',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='scrapingjob',
+            index=models.Index(fields=['status', 'created_at'], name='core_scrapi_status_85c036_idx'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+from django.db import migrations
+
+
+def merge_search_results(SearchResult, Match, person_id):
+    """
+    Keep one search result per person (the scraping code relies on it): the
+    best one, preferring completed and then recent results, with the other
+    results' keyword matches folded in
+    """
+    results = sorted(
+        SearchResult.objects.filter(person_id=person_id).values_list('id', 'status', 'scraped_at'),
+        key=lambda result: (result[1] == 'completed', result[2], result[0]),
+        reverse=True,
+    )
+    if len(results) < 2:
+        return
+    keep_id = results[0][0]
+    other_ids = [result_id for result_id, _, _ in results[1:]]
+
+    # A result matches each keyword once: the kept result's own match wins, and
+    # the matches not moved over are deleted along with their results
+    kept_keywords = set(Match.objects.filter(search_result_id=keep_id).values_list('keyword_id', flat=True))
+    for match_id, keyword_id in Match.objects.filter(search_result_id__in=other_ids).values_list('id', 'keyword_id'):
+        if keyword_id not in kept_keywords:
+            kept_keywords.add(keyword_id)
+            Match.objects.filter(id=match_id).update(search_result_id=keep_id)
+    SearchResult.objects.filter(id__in=other_ids).delete()
+
+
+def merge_duplicate_people(apps, schema_editor):
+    """
+    Fold people sharing a name (ignoring case and spacing) and company into
+    the oldest of them, so the unique constraint added next can be created
+    """
+    Person = apps.get_model('core', 'Person')
+    SearchResult = apps.get_model('core', 'SearchResult')
+    Match = apps.get_model('core', 'Match')
+    ScrapingJob = apps.get_model('core', 'ScrapingJob')
+    ScrapingTask = apps.get_model('core', 'ScrapingTask')
+
+    keepers = {}  # (name key, company id) -> [id, linkedin_url]
+    duplicates = []  # (duplicate id, keeper id, duplicate's linkedin_url)
+    rows = Person.objects.order_by('id').values_list('id', 'name', 'company_id', 'linkedin_url')
+    for person_id, name, company_id, linkedin_url in rows.iterator(chunk_size=5000):
+        normalized = ' '.join(name.split())
+        if normalized != name:
+            Person.objects.filter(id=person_id).update(name=normalized)
+        key = (normalized.lower(), company_id)
+        if key in keepers:
+            duplicates.append((person_id, keepers[key][0], linkedin_url))
+        else:
+            keepers[key] = [person_id, linkedin_url]
+
+    keeper_urls = {keeper_id: linkedin_url for keeper_id, linkedin_url in keepers.values()}
+    for duplicate_id, keeper_id, linkedin_url in duplicates:
+        if linkedin_url and not keeper_urls[keeper_id]:
+            keeper_urls[keeper_id] = linkedin_url
+            Person.objects.filter(id=keeper_id).update(linkedin_url=linkedin_url)
+        SearchResult.objects.filter(person_id=duplicate_id).update(person_id=keeper_id)
+        ScrapingJob.objects.filter(person_id=duplicate_id).update(person_id=keeper_id)
+        # A job holds one task per person; the keeper's own task wins
+        keeper_jobs = ScrapingTask.objects.filter(person_id=keeper_id).values('job_id')
+        ScrapingTask.objects.filter(person_id=duplicate_id, job_id__in=keeper_jobs).delete()
+        ScrapingTask.objects.filter(person_id=duplicate_id).update(person_id=keeper_id)
+    for keeper_id in {keeper_id for _, keeper_id, _ in duplicates}:
+        merge_search_results(SearchResult, Match, keeper_id)
+
+    duplicate_ids = [duplicate_id for duplicate_id, _, _ in duplicates]
+    for start in range(0, len(duplicate_ids), 1000):
+        Person.objects.filter(id__in=duplicate_ids[start:start + 1000]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_exportjob_parquet_format'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_people, migrations.RunPython.noop),
+    ]
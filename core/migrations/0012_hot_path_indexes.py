@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:21
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_merge_duplicate_people'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='keyword',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'word'], name='keyword_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['-created_at'], name='core_match_created_5070f0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['-created_at'], name='core_person_created_fd0b42_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scrapingjob',
+            index=models.Index(fields=['-created_at'], name='core_scrapi_created_fe54be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchresult',
+            index=models.Index(fields=['-scraped_at'], name='core_search_scraped_c346c3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchresult',
+            index=models.Index(fields=['status', '-scraped_at'], name='core_search_status_4d4309_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchresult',
+            index=models.Index(fields=['person', 'status'], name='core_search_person__f8c458_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='person',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), models.F('company'), name='unique_person_name_company'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:40
+
+from django.core.cache import cache
+from django.db import migrations, models
+from django.utils.dateparse import parse_datetime
+
+
+def copy_cached_watermark(apps, schema_editor):
+    """Carry over the last rematch_keywords run, which used to be kept in the cache"""
+    RunWatermark = apps.get_model('core', 'RunWatermark')
+    last_run = cache.get('rematch_keywords_last_run')
+    last_run_at = parse_datetime(last_run) if isinstance(last_run, str) else None
+    if last_run_at is not None:
+        RunWatermark.objects.create(name='rematch_keywords', last_run_at=last_run_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_run_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunPython(copy_cached_watermark, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 class Company(models.Model):
     name = models.CharField(max_length=200)
@@ -31,6 +32,11 @@ class Person(models.Model):
     class Meta:
         verbose_name_plural = "People"
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['-created_at'])]
+        constraints = [
+            # One person per name and company, whatever the capitalization
+            models.UniqueConstraint(Lower('name'), 'company', name='unique_person_name_company'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.company})" if self.company else self.name
@@ -59,9 +65,14 @@ class Keyword(models.Model):
     category = models.CharField(max_length=100, choices=CATEGORY_CHOICES, blank=True, default='other')
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['category', 'word']
+        indexes = [
+            # The dashboard list and the keyword matcher only ever load active keywords
+            models.Index(fields=['category', 'word'], condition=models.Q(is_active=True), name='keyword_active_idx'),
+        ]
 
     def __str__(self):
         return f"{self.word} [{self.category}]" if self.category else self.word
@@ -98,6 +109,11 @@ class SearchResult(models.Model):
 
     class Meta:
         ordering = ['-scraped_at']
+        indexes = [
+            models.Index(fields=['-scraped_at']),
+            models.Index(fields=['status', '-scraped_at']),
+            models.Index(fields=['person', 'status']),  # People still pending or failed
+        ]
 
     def __str__(self):
         return f"Search result for {self.person.name} - {self.status}"
@@ -124,6 +140,7 @@ class Match(models.Model):
         ordering = ['-created_at']
         unique_together = ['search_result', 'keyword']
         verbose_name_plural = "Matches"
+        indexes = [models.Index(fields=['-created_at'])]
 
     def __str__(self):
         return f"{self.keyword.word} found in {self.search_result.person.name}'s profile"
@@ -161,12 +178,21 @@ class ScrapingJob(models.Model):
     success_count = models.PositiveIntegerField(default=0)
     error_count = models.PositiveIntegerField(default=0)
     error_message = models.TextField(blank=True)
+    payload = models.JSONField(default=dict, blank=True)  # Work to do, e.g. {'person_ids': [...]}
+    result = models.JSONField(default=dict, blank=True)  # Per-person outcomes once finished
+    worker_id = models.CharField(max_length=100, blank=True)  # Worker that claimed the job
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['-created_at']),
+        ]
 
     def __str__(self):
         if self.person:
@@ -187,6 +213,59 @@ class ScrapingJob(models.Model):
             return self.completed_at - self.started_at
         return None
 
+    def refresh_counts(self):
+        """Derive progress counts from the job's task rows"""
+        counts = self.tasks.aggregate(
+            total=models.Count('id'),
+            success=models.Count('id', filter=models.Q(status='completed')),
+            error=models.Count('id', filter=models.Q(status='failed')),
+        )
+        self.total_people = counts['total']
+        self.success_count = counts['success']
+        self.error_count = counts['error']
+        self.processed_count = counts['success'] + counts['error']
+        self.save(update_fields=['total_people', 'processed_count', 'success_count', 'error_count'])
+
+
+class ScrapingTask(models.Model):
+    """One person's work within a ScrapingJob, checkpointed stage by stage"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    STAGE_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('completed', 'Completed'),
+        ('skipped', 'Skipped'),
+        ('failed', 'Failed'),
+    ]
+
+    STAGES = ['search', 'fetch', 'parse', 'match']
+
+    job = models.ForeignKey(ScrapingJob, on_delete=models.CASCADE, related_name='tasks')
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='scraping_tasks')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    search_status = models.CharField(max_length=20, choices=STAGE_STATUS_CHOICES, default='pending')
+    fetch_status = models.CharField(max_length=20, choices=STAGE_STATUS_CHOICES, default='pending')
+    parse_status = models.CharField(max_length=20, choices=STAGE_STATUS_CHOICES, default='pending')
+    match_status = models.CharField(max_length=20, choices=STAGE_STATUS_CHOICES, default='pending')
+    page_sha256 = models.CharField(max_length=64, blank=True)  # Archived page from the fetch stage
+    matches_count = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['id']
+        unique_together = ['job', 'person']
+
+    def __str__(self):
+        return f"{self.person.name} (job {self.job_id}) - {self.status}"
+
 
 class ExportJob(models.Model):
     STATUS_CHOICES = [
@@ -200,24 +279,115 @@ class ExportJob(models.Model):
         ('csv', 'CSV'),
         ('excel', 'Excel'),
         ('json', 'JSON'),
+        ('parquet', 'Parquet'),
+    ]
+    
+    EXPORT_TYPE_CHOICES = [
+        ('results', 'Search Results'),
+        ('matches', 'Keyword Matches'),
+        ('people', 'People'),
+        ('workbook', 'Results, Matches and People'),
     ]
     
     file_name = models.CharField(max_length=255)
     file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='excel')
+    export_type = models.CharField(max_length=20, choices=EXPORT_TYPE_CHOICES, default='workbook')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     file_path = models.CharField(max_length=500, blank=True)
+    file_size = models.PositiveBigIntegerField(default=0)
     filters_applied = models.JSONField(default=dict, blank=True)  # Store filter criteria
+    total_rows = models.PositiveIntegerField(default=0)
+    rows_written = models.PositiveIntegerField(default=0)
     error_message = models.TextField(blank=True)
+    worker_id = models.CharField(max_length=100, blank=True)  # Worker that claimed the export
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
     created_by = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
 
     def __str__(self):
         return f"Export: {self.file_name} - {self.status}"
 
+    @property
+    def progress_percentage(self):
+        if self.status == 'completed':
+            return 100
+        if self.total_rows == 0:
+            return 0
+        return min(99, int((self.rows_written / self.total_rows) * 100))
+
+
+class SearchQueryCache(models.Model):
+    """Cached Google CSE results, keyed on the normalized query and result count"""
+    query_key = models.CharField(max_length=64, unique=True)  # sha256 of query + num_results
+    query = models.TextField()
+    num_results = models.PositiveSmallIntegerField()
+    results = models.JSONField(default=list, blank=True)
+    is_negative = models.BooleanField(default=False)  # Search ran but found no profile
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = "Search query cache"
+
+    def __str__(self):
+        return f"{self.query} ({'no results' if self.is_negative else len(self.results)})"
+
+
+class ApiQuota(models.Model):
+    """Requests used per provider and quota day, shared by every worker process"""
+    provider = models.CharField(max_length=50)
+    day = models.DateField()  # In the provider's quota timezone
+    used = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-day', 'provider']
+        unique_together = ['provider', 'day']
+        verbose_name_plural = "API quotas"
+
+    def __str__(self):
+        return f"{self.provider} {self.day}: {self.used} used"
+
+
+class RawPage(models.Model):
+    """Index entry for a fetched page whose compressed HTML is stored in the page archive"""
+    url = models.URLField(max_length=500)  # URL requested
+    final_url = models.URLField(max_length=500, blank=True)  # URL after redirects
+    sha256 = models.CharField(max_length=64, db_index=True)
+    status_code = models.PositiveSmallIntegerField(default=200)
+    size = models.PositiveIntegerField(default=0)  # Uncompressed bytes
+    fetched_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-fetched_at']
+        indexes = [models.Index(fields=['url', '-fetched_at'])]
+
+    def __str__(self):
+        return f"{self.url} @ {self.fetched_at:%Y-%m-%d %H:%M} ({self.sha256[:12]})"
+
+
+class RunWatermark(models.Model):
+    """Time a periodic command last ran, so its next run only picks up what changed since"""
+    name = models.CharField(max_length=100, unique=True)  # Command name
+    last_run_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name}: {self.last_run_at:%Y-%m-%d %H:%M}"
+
 
 
 
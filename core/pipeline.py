@@ -0,0 +1,358 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import django
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from core.models import Match, Person, ScrapingTask, SearchResult
+from core.scraping import PersonScraper, ScrapeItem, start_task
+from scraper.keyword_matcher import keyword_matcher
+from scraper.linkedin_parser import parse_profile_page
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULT_UPDATE_FIELDS = [
+    'profile_content', 'profile_headline', 'profile_about', 'profile_experience',
+    'source_url', 'content_source', 'status', 'error_message', 'updated_at',
+]
+
+TASK_UPDATE_FIELDS = [
+    'status', 'search_status', 'fetch_status', 'parse_status', 'match_status',
+    'page_sha256', 'matches_count', 'error_message', 'attempts', 'updated_at',
+]
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+def _match_in_worker(profile):
+    """Return plain match tuples for one profile's content (runs in the CPU pool)"""
+    search_result = SearchResult(**profile)
+    return [
+        (match.keyword.id, match.context_snippet, match.source_url, match.match_count, match.confidence_score)
+        for match in keyword_matcher.match_profile(search_result)
+    ]
+
+
+class StageStats:
+    """Items handled and time spent by one pipeline stage"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0.0  # Seconds spent working, summed over the stage's workers
+        self.first_at: Optional[float] = None
+        self.last_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, started: float, failed: int = 0, count: int = 1):
+        finished = time.perf_counter()
+        with self._lock:
+            self.processed += count
+            self.failed += failed
+            self.busy += finished - started
+            self.first_at = started if self.first_at is None else min(self.first_at, started)
+            self.last_at = finished
+
+    def as_dict(self) -> Dict:
+        elapsed = (self.last_at - self.first_at) if self.processed else 0
+        return {
+            'workers': self.workers,
+            'processed': self.processed,
+            'failed': self.failed,
+            'items_per_second': round(self.processed / elapsed, 2) if elapsed else 0,
+            'seconds_per_item': round(self.busy / self.processed, 3) if self.processed else 0,
+            # Share of the stage's worker time spent busy; near 1.0 marks the bottleneck
+            'utilization': round(self.busy / (elapsed * self.workers), 2) if elapsed else 0,
+        }
+
+
+class _Stage:
+    """A pool of threads taking items from ``inbox``, handling them and passing them on"""
+
+    def __init__(self, name: str, handler: Callable[[ScrapeItem], None], workers: int,
+                 inbox: queue.Queue, outbox: queue.Queue):
+        self.name = name
+        self.handler = handler
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stats = StageStats(name, workers)
+        self._running = workers
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f'pipeline-{name}-{i}', daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self):
+        try:
+            while True:
+                item = self.inbox.get()
+                if item is _DONE:
+                    # Let sibling workers see the end of input too
+                    self.inbox.put(_DONE)
+                    break
+                # Failed items skip the remaining stages but still reach the writer
+                if not item.failed:
+                    started = time.perf_counter()
+                    try:
+                        self.handler(item)
+                    except Exception as e:
+                        logger.error(f"Pipeline stage {self.name} failed for {item.task.person.name}: {e}")
+                        setattr(item.task, f'{self.name}_status', 'failed')
+                        item.task.status = 'failed'
+                        item.task.error_message = str(e)
+                        item.search_result.status = 'failed'
+                        item.search_result.error_message = str(e)
+                    self.stats.record(started, item.failed)
+                self.outbox.put(item)
+        finally:
+            connections.close_all()
+            with self._lock:
+                self._running -= 1
+                last = self._running == 0
+            if last:
+                self.outbox.put(_DONE)
+
+
+class ScrapingPipeline:
+    """
+    Scrape many people at once by running the search, fetch, parse and match
+    stages concurrently, connected by bounded queues.
+
+    Search and fetch are network bound and run on their own thread pools;
+    parse and match are CPU bound and hand their work to a shared process
+    pool. A single writer thread saves finished items in batches, one
+    transaction per batch. Each stage's worker count is set separately
+    (PIPELINE_*_WORKERS) and its throughput is reported after every run, so
+    the slowest stage can be tuned on its own.
+    """
+
+    def __init__(self, search_workers: Optional[int] = None, fetch_workers: Optional[int] = None,
+                 parse_workers: Optional[int] = None, match_workers: Optional[int] = None,
+                 cpu_processes: Optional[int] = None, queue_size: Optional[int] = None,
+                 write_batch_size: Optional[int] = None):
+        self.workers = {
+            'search': search_workers or getattr(settings, 'PIPELINE_SEARCH_WORKERS', 5),
+            'fetch': fetch_workers or getattr(settings, 'PIPELINE_FETCH_WORKERS', 2),
+            'parse': parse_workers or getattr(settings, 'PIPELINE_PARSE_WORKERS', 2),
+            'match': match_workers or getattr(settings, 'PIPELINE_MATCH_WORKERS', 1),
+        }
+        self.cpu_processes = cpu_processes if cpu_processes is not None else getattr(settings, 'PIPELINE_CPU_PROCESSES', 1)
+        self.queue_size = queue_size or getattr(settings, 'PIPELINE_QUEUE_SIZE', 20)
+        self.write_batch_size = write_batch_size or getattr(settings, 'PIPELINE_WRITE_BATCH_SIZE', 25)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._local = threading.local()
+
+    def start(self):
+        """
+        Start the CPU process pool. Its processes come from a clean forkserver
+        (or are spawned), never forked from this process, so it is safe to
+        start while other threads are running.
+        """
+        if self._executor is None and self.cpu_processes > 0:
+            # Forking a process that has threads (heartbeats, stage workers) can copy a held
+            # lock into the child and deadlock it
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.cpu_processes,
+                mp_context=multiprocessing.get_context(method),
+                # Not a function of this module: unpickling one would import the models before setup
+                initializer=django.setup,
+            )
+            self._executor.submit(int).result()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def run(self, tasks: List[ScrapingTask],
+            on_task_done: Optional[Callable[[ScrapingTask], None]] = None) -> Dict[str, Dict]:
+        """
+        Run tasks through every stage and save them
+
+        Args:
+            tasks: Tasks with person (and company) loaded
+            on_task_done: Called from the writer thread after each task is saved
+
+        Returns:
+            Throughput statistics per stage
+        """
+        self.start()
+
+        items = self._prepare(tasks)
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(5)]
+        stages = [
+            _Stage(name, getattr(self, f'_{name}'), self.workers[name], queues[i], queues[i + 1])
+            for i, name in enumerate(ScrapingTask.STAGES)
+        ]
+        write_stats = StageStats('write', 1)
+        writer = threading.Thread(
+            target=self._write, args=(queues[-1], write_stats, on_task_done), name='pipeline-write', daemon=True
+        )
+
+        for stage in stages:
+            stage.start()
+        writer.start()
+
+        # Blocks whenever the search queue is full, so memory use stays bounded
+        for item in items:
+            queues[0].put(item)
+        queues[0].put(_DONE)
+        writer.join()
+
+        throughput = {stage.name: stage.stats.as_dict() for stage in stages}
+        throughput['write'] = write_stats.as_dict()
+        for name, stats in throughput.items():
+            logger.info(
+                f"Pipeline stage {name}: {stats['processed']} items at {stats['items_per_second']}/s "
+                f"({stats['workers']} workers, {stats['utilization']:.0%} busy)"
+            )
+        return throughput
+
+    def _prepare(self, tasks: List[ScrapingTask]) -> List[ScrapeItem]:
+        """Mark tasks as running and pair each with its person's SearchResult"""
+        for task in tasks:
+            start_task(task)
+        ScrapingTask.objects.bulk_update(tasks, ['status', 'attempts', 'error_message'])
+
+        person_ids = [task.person_id for task in tasks]
+        search_results = {}
+        for search_result in SearchResult.objects.filter(person_id__in=person_ids).order_by('id'):
+            search_results.setdefault(search_result.person_id, search_result)
+        missing = [
+            SearchResult(person_id=person_id, status='pending')
+            for person_id in person_ids if person_id not in search_results
+        ]
+        for search_result in SearchResult.objects.bulk_create(missing):
+            search_results[search_result.person_id] = search_result
+
+        items = []
+        for task in tasks:
+            search_result = search_results[task.person_id]
+            search_result.person = task.person
+            items.append(ScrapeItem(task, search_result))
+        return items
+
+    def _scraper(self) -> PersonScraper:
+        """One PersonScraper (HTTP sessions included) per stage thread"""
+        scraper = getattr(self._local, 'scraper', None)
+        if scraper is None:
+            scraper = self._local.scraper = PersonScraper()
+        return scraper
+
+    def _search(self, item: ScrapeItem):
+        self._scraper().run_stage(item, 'search')
+
+    def _fetch(self, item: ScrapeItem):
+        self._scraper().run_stage(item, 'fetch')
+
+    def _parse(self, item: ScrapeItem):
+        scraper = self._scraper()
+        if self._executor is None or item.page is None:
+            scraper.run_stage(item, 'parse')
+            return
+        try:
+            profile_data = self._executor.submit(
+                parse_profile_page, item.page['html'], item.page['final_url'],
+                item.task.person.linkedin_url, scraper.parser.backend.name,
+            ).result()
+        except Exception as e:
+            scraper.fail(item, 'parse', str(e))
+            return
+        scraper.run_stage(item, 'parse', profile_data)
+
+    def _match(self, item: ScrapeItem):
+        scraper = self._scraper()
+        if self._executor is None or item.task.match_status == 'completed':
+            scraper.run_stage(item, 'match')
+            return
+        search_result = item.search_result
+        profile = {
+            'source_url': search_result.source_url,
+            'profile_headline': search_result.profile_headline,
+            'profile_about': search_result.profile_about,
+            'profile_experience': search_result.profile_experience,
+            'profile_content': search_result.profile_content,
+        }
+        try:
+            rows = self._executor.submit(_match_in_worker, profile).result()
+        except Exception as e:
+            scraper.fail(item, 'match', str(e))
+            return
+        matches = [
+            Match(
+                search_result=search_result, keyword_id=keyword_id, context_snippet=context_snippet,
+                source_url=source_url, match_count=match_count, confidence_score=confidence_score,
+            )
+            for keyword_id, context_snippet, source_url, match_count, confidence_score in rows
+        ]
+        scraper.run_stage(item, 'match', matches)
+
+    def _write(self, inbox: queue.Queue, stats: StageStats,
+               on_task_done: Optional[Callable[[ScrapingTask], None]]):
+        """Save finished items in batches until the end of input"""
+        try:
+            batch = []
+            while True:
+                item = inbox.get()
+                if item is not _DONE:
+                    if not item.failed:
+                        item.task.status = 'completed'
+                    batch.append(item)
+                # Flush when the batch is full, or early while the queue is idle
+                if batch and (item is _DONE or len(batch) >= self.write_batch_size or inbox.empty()):
+                    started = time.perf_counter()
+                    try:
+                        self._write_batch(batch)
+                    except Exception as e:
+                        # Left as 'running' in the database, so a resumed job retries them
+                        logger.error(f"Failed to save {len(batch)} scraped profiles: {e}")
+                    else:
+                        stats.record(started, sum(written.failed for written in batch), len(batch))
+                        if on_task_done:
+                            for written in batch:
+                                on_task_done(written.task)
+                    batch = []
+                if item is _DONE:
+                    break
+        finally:
+            connections.close_all()
+
+    def _write_batch(self, batch: List[ScrapeItem]):
+        now = timezone.now()
+        people = [item.task.person for item in batch if item.person_changed]
+        for person in people:
+            person.updated_at = now
+        for item in batch:
+            # bulk_update() doesn't apply auto_now
+            item.search_result.updated_at = now
+            item.task.updated_at = now
+
+        with transaction.atomic():
+            if people:
+                Person.objects.bulk_update(people, ['linkedin_url', 'updated_at'])
+            SearchResult.objects.bulk_update([item.search_result for item in batch], SEARCH_RESULT_UPDATE_FIELDS)
+            for item in batch:
+                if item.matches is not None:
+                    keyword_matcher._write_matches(item.search_result, item.matches)
+            ScrapingTask.objects.bulk_update([item.task for item in batch], TASK_UPDATE_FIELDS)
+
+        for item in batch:
+            item.person_changed = False
+            item.matches = None
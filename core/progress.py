@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import F
+
+from .models import ScrapingJob
+
+# A job's counters are written at most this often...
+FLUSH_INTERVAL = getattr(settings, 'JOB_PROGRESS_FLUSH_INTERVAL', 2.0)  # Seconds
+
+# ...unless this many people finished since the last write
+FLUSH_EVERY = getattr(settings, 'JOB_PROGRESS_FLUSH_EVERY', 50)
+
+
+class JobProgress:
+    """
+    Counts finished people for a ScrapingJob in memory and writes the deltas
+    with a single F() expression update every FLUSH_INTERVAL seconds or
+    FLUSH_EVERY people, instead of saving the whole job after each one.
+
+    Adding deltas rather than saving totals means workers sharing a job
+    never overwrite each other's counts. The in-memory job object is kept
+    current on every record(). Use it as a context manager (or call
+    flush()) so the last deltas are written even if the job crashes.
+    """
+
+    def __init__(self, job: ScrapingJob, flush_interval: Optional[float] = None,
+                 flush_every: Optional[int] = None):
+        self.job = job
+        self.flush_interval = FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.flush_every = FLUSH_EVERY if flush_every is None else flush_every
+        self._lock = threading.Lock()
+        self._success = 0
+        self._error = 0
+        self._pending = 0  # Records since the last flush
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def record(self, status: str, previous_status: Optional[str] = None):
+        """
+        Count one person finishing with ``status`` ('completed' or 'failed')
+
+        Args:
+            previous_status: Status of the person's task before this attempt;
+                a retried 'failed' task moves out of the error count rather
+                than being counted twice
+        """
+        success = 1 if status == 'completed' else 0
+        error = 1 - success
+        if previous_status == 'failed':
+            error -= 1
+        elif previous_status == 'completed':
+            success -= 1
+
+        with self._lock:
+            self._success += success
+            self._error += error
+            self._pending += 1
+            self.job.success_count += success
+            self.job.error_count += error
+            self.job.processed_count += success + error
+            due = (self._pending >= self.flush_every
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write the counts gathered since the last flush, if any"""
+        with self._lock:
+            success, error = self._success, self._error
+            self._success = self._error = self._pending = 0
+            self._last_flush = time.monotonic()
+        if not success and not error:
+            return
+        ScrapingJob.objects.filter(id=self.job.id).update(
+            success_count=F('success_count') + success,
+            error_count=F('error_count') + error,
+            processed_count=F('processed_count') + success + error,
+        )
@@ -0,0 +1,331 @@
+import logging
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Person, RawPage, ScrapingJob, ScrapingTask, SearchResult
+from core.progress import JobProgress
+from core.stats import invalidate_dashboard_stats
+from scraper.google_cse import GoogleCSEService, QuotaExceededError
+from scraper.keyword_matcher import KeywordMatcher
+from scraper.linkedin_parser import LinkedInParser
+from scraper.page_archive import page_archive
+
+logger = logging.getLogger(__name__)
+
+DONE_STAGE_STATUSES = ('completed', 'skipped')
+
+
+class StageError(Exception):
+    """A scraping stage could not complete for one person"""
+
+
+class ScrapeItem:
+    """A task on its way through the stages, with what earlier stages produced"""
+
+    def __init__(self, task: ScrapingTask, search_result: SearchResult):
+        self.task = task
+        self.search_result = search_result
+        self.page: Optional[Dict] = None
+        self.matches: Optional[List] = None  # Unsaved Match objects once the match stage ran
+        self.person_changed = False
+
+    @property
+    def failed(self) -> bool:
+        return self.task.status == 'failed'
+
+
+class PersonScraper:
+    """
+    Search, fetch, parse and match for one person at a time.
+
+    Each stage is checkpointed on the person's ScrapingTask, so a retried
+    task resumes at the first stage that didn't finish: a found profile URL
+    is never searched for again, and an archived page is re-parsed rather
+    than downloaded again. The stage methods only change objects in memory;
+    ``save`` (or the pipeline's batching writer) persists them.
+    """
+
+    STAGES = ScrapingTask.STAGES
+
+    def __init__(self, cse_service: Optional[GoogleCSEService] = None,
+                 parser: Optional[LinkedInParser] = None,
+                 matcher: Optional[KeywordMatcher] = None):
+        self.cse_service = cse_service or GoogleCSEService()
+        self.parser = parser or LinkedInParser()
+        self.matcher = matcher or KeywordMatcher()
+
+    def run_task(self, task: ScrapingTask) -> ScrapingTask:
+        """
+        Run every stage of a task that isn't already done, saving a
+        checkpoint after each one
+
+        Returns:
+            The task, with status 'completed' or 'failed'
+        """
+        start_task(task)
+        task.save()
+
+        search_result, _ = SearchResult.objects.get_or_create(
+            person=task.person,
+            defaults={'status': 'pending'}
+        )
+        item = ScrapeItem(task, search_result)
+
+        for stage in self.STAGES:
+            self.run_stage(item, stage)
+            self.save(item)
+            if item.failed:
+                return task
+
+        task.status = 'completed'
+        task.save()
+        return task
+
+    def run_stage(self, item: ScrapeItem, stage: str, *args):
+        """Run one stage, recording any failure on the item"""
+        try:
+            getattr(self, stage)(item, *args)
+        except StageError as e:
+            self.fail(item, stage, str(e))
+        except Exception as e:
+            logger.error(f"Error scraping {item.task.person.name} at the {stage} stage: {e}")
+            self.fail(item, stage, str(e))
+
+    def search(self, item: ScrapeItem):
+        task, person = item.task, item.task.person
+        if task.search_status in DONE_STAGE_STATUSES:
+            return
+        if person.linkedin_url:
+            task.search_status = 'skipped'
+            return
+
+        company_name = person.company.name if person.company_id else None
+        try:
+            search_results = self.cse_service.search_linkedin_profile(person.name, company_name)
+        except QuotaExceededError as e:
+            # Left unsearched, so resuming the job after the quota resets searches again
+            raise StageError(f'{e}; resume the job once it resets')
+        if not search_results:
+            raise StageError('No LinkedIn profile found')
+
+        person.linkedin_url = search_results[0].get('link', '')
+        item.person_changed = True
+        task.search_status = 'completed'
+
+    def fetch(self, item: ScrapeItem):
+        task = item.task
+        if task.parse_status == 'completed':
+            return
+        if task.fetch_status == 'completed':
+            item.page = self._archived_page(task)
+            if item.page is not None:
+                return
+
+        page = self.parser.fetch_page(task.person.linkedin_url)
+        if page['error']:
+            raise StageError(page['error'])
+
+        item.page = page
+        task.page_sha256 = page['sha256'] or ''
+        task.fetch_status = 'completed'
+
+    def parse(self, item: ScrapeItem, profile_data: Optional[Dict] = None):
+        """Parse the fetched page, or apply ``profile_data`` parsed elsewhere"""
+        task = item.task
+        if task.parse_status == 'completed':
+            return
+
+        linkedin_url = task.person.linkedin_url
+        if profile_data is None:
+            profile_data = self.parser.parse_html(item.page['html'], item.page['final_url'], linkedin_url)
+        item.page = None  # The raw HTML is no longer needed
+        if profile_data.get('error') or profile_data.get('auth_wall'):
+            raise StageError(profile_data.get('error') or 'LinkedIn requires authentication')
+
+        search_result = item.search_result
+        search_result.profile_content = profile_data.get('full_content', '')
+        search_result.profile_headline = profile_data.get('headline', '')
+        search_result.profile_about = profile_data.get('about', '')
+        search_result.profile_experience = profile_data.get('experience', '')
+        search_result.source_url = linkedin_url
+        search_result.content_source = 'linkedin'
+        search_result.status = 'completed'
+        search_result.error_message = ''
+        task.parse_status = 'completed'
+
+    def match(self, item: ScrapeItem, matches: Optional[List] = None):
+        """Match keywords, or apply ``matches`` computed elsewhere"""
+        task = item.task
+        if task.match_status == 'completed':
+            return
+
+        if matches is None:
+            matches = self.matcher.match_profile(item.search_result)
+        item.matches = matches
+        task.matches_count = len(matches)
+        task.match_status = 'completed'
+
+    def fail(self, item: ScrapeItem, stage: str, error: str):
+        item.search_result.status = 'failed'
+        item.search_result.error_message = error
+        setattr(item.task, f'{stage}_status', 'failed')
+        if stage == 'parse':
+            # The page itself is bad (an auth wall, a broken render), so a retry must download it again
+            item.task.fetch_status = 'pending'
+            item.task.page_sha256 = ''
+        item.task.status = 'failed'
+        item.task.error_message = error
+
+    def save(self, item: ScrapeItem):
+        """Persist one item's person, search result, matches and task"""
+        with transaction.atomic():
+            if item.person_changed:
+                item.task.person.save()
+                item.person_changed = False
+            item.search_result.save()
+            if item.matches is not None:
+                self.matcher._write_matches(item.search_result, item.matches)
+                item.matches = None
+            item.task.save()
+
+    def _archived_page(self, task: ScrapingTask) -> Optional[Dict]:
+        """Load the page fetched by an earlier attempt, if it was archived"""
+        if not task.page_sha256:
+            return None
+        try:
+            html_content = page_archive.get(task.page_sha256)
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Archived page {task.page_sha256} unreadable, fetching again: {e}")
+            return None
+        final_url = RawPage.objects.filter(sha256=task.page_sha256).order_by('-fetched_at').values_list(
+            'final_url', flat=True
+        ).first()
+        return {'html': html_content, 'final_url': final_url or task.person.linkedin_url}
+
+
+def start_task(task: ScrapingTask):
+    """Mark a task as running for a new attempt (in memory only)"""
+    task.status = 'running'
+    task.attempts += 1
+    task.error_message = ''
+
+
+def create_scraping_tasks(job: ScrapingJob, person_ids: Iterable[int]):
+    """Add a task row per person to a job; people already in the job are left alone"""
+    person_ids = list(person_ids)
+    existing = set(Person.objects.filter(id__in=person_ids).values_list('id', flat=True))
+    ScrapingTask.objects.bulk_create(
+        [ScrapingTask(job=job, person_id=person_id) for person_id in person_ids if person_id in existing],
+        ignore_conflicts=True,
+    )
+    job.refresh_counts()
+
+
+def task_outcome(task: ScrapingTask) -> Dict:
+    """Summarise a task for job results and API responses"""
+    outcome = {
+        'person_id': task.person_id,
+        'person': task.person.name,
+        'linkedin_url': task.person.linkedin_url,
+        'status': {'completed': 'success', 'failed': 'failed'}.get(task.status, task.status),
+    }
+    if task.status == 'completed':
+        outcome['matches'] = task.matches_count
+    elif task.error_message:
+        outcome['error'] = task.error_message
+    return outcome
+
+
+def run_scraping_job(job: ScrapingJob,
+                     on_progress: Optional[Callable[[ScrapingJob, ScrapingTask], None]] = None,
+                     scraper: Optional[PersonScraper] = None,
+                     pipeline=None) -> ScrapingJob:
+    """
+    Run a job's unfinished tasks and record the outcome
+
+    Completed tasks are skipped, so calling this again for an interrupted or
+    partly failed job retries only the failed and interrupted people. Jobs
+    with more than one person to scrape run through the staged
+    ScrapingPipeline; a single person is scraped in-line.
+
+    Args:
+        job: Job to run; jobs queued without task rows get them from
+            payload['person_ids'] or job.person
+        on_progress: Called with the job and task after each person
+        scraper: PersonScraper to reuse across jobs
+        pipeline: ScrapingPipeline to reuse across jobs
+    """
+    from core.pipeline import ScrapingPipeline
+
+    scraper = scraper or PersonScraper()
+
+    if not job.tasks.exists():
+        person_ids = job.payload.get('person_ids') or ([job.person_id] if job.person_id else [])
+        create_scraping_tasks(job, person_ids)
+    else:
+        # Start the live counts from the task rows, in case a crash lost the last deltas
+        job.refresh_counts()
+
+    tasks = list(job.tasks.exclude(status='completed').select_related('person__company'))
+
+    # Quota may have been spent by other jobs since this one was queued
+    _, deferred = scraper.cse_service.fit_to_quota([task.person for task in tasks])
+    deferred_ids = {person.id for person in deferred}
+    tasks = [task for task in tasks if task.person_id not in deferred_ids]
+
+    previous_status = {task.id: task.status for task in tasks}
+    progress = JobProgress(job)
+
+    def task_finished(task):
+        progress.record(task.status, previous_status[task.id])
+        if on_progress:
+            on_progress(job, task)
+
+    throughput = None
+    with progress:
+        if len(tasks) > 1:
+            own_pipeline = pipeline is None
+            pipeline = pipeline or ScrapingPipeline()
+            try:
+                throughput = pipeline.run(tasks, on_task_done=task_finished)
+            finally:
+                if own_pipeline:
+                    pipeline.close()
+        else:
+            for task in tasks:
+                scraper.run_task(task)
+                task_finished(task)
+
+    # The task rows are the source of truth; correct any drift in the live counts
+    job.refresh_counts()
+    job.result = {
+        'results': [task_outcome(task) for task in job.tasks.select_related('person')],
+        'deferred_count': len(deferred_ids),
+    }
+    if throughput:
+        job.result['throughput'] = throughput
+    if job.job_type == 'single':
+        task = job.tasks.first()
+        if task and task.status == 'completed':
+            job.status = 'completed'
+        else:
+            job.status = 'failed'
+            job.error_message = task.error_message if task and task.error_message else 'Daily Google search quota exhausted'
+    else:
+        job.status = 'completed'
+    job.completed_at = timezone.now()
+    # A worker that stalled past its lease must not overwrite the job another worker now owns
+    finished = ScrapingJob.objects.filter(id=job.id, worker_id=job.worker_id, status='running').update(
+        result=job.result,
+        status=job.status,
+        error_message=job.error_message,
+        completed_at=job.completed_at,
+    )
+    if not finished:
+        logger.warning(f"Job {job.id} was requeued to another worker before it finished; dropping this run's outcome")
+    invalidate_dashboard_stats()
+
+    return job
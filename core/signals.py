@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Keyword
+from .stats import invalidate_dashboard_stats
+from scraper.keyword_matcher import bump_keyword_index_version
+
+
+@receiver(post_save, sender=Keyword)
+@receiver(post_delete, sender=Keyword)
+def keyword_changed(sender, instance, **kwargs):
+    # Bump only once the change is visible to other processes, otherwise they
+    # could recompile the old keyword set under the new version.
+    transaction.on_commit(bump_keyword_index_version)
+    transaction.on_commit(invalidate_dashboard_stats)
@@ -0,0 +1,64 @@
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Company, Keyword, Match, Person, SearchResult
+
+DASHBOARD_STATS_KEY = 'dashboard_stats'
+
+# Seconds the counts may lag behind the tables between invalidations
+DASHBOARD_STATS_TTL = getattr(settings, 'DASHBOARD_STATS_TTL', 30)
+
+
+def get_dashboard_stats() -> Dict:
+    """Dashboard counts, from the cache when they were computed recently"""
+    stats = cache.get(DASHBOARD_STATS_KEY)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        cache.set(DASHBOARD_STATS_KEY, stats, timeout=DASHBOARD_STATS_TTL)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    """Drop the cached counts so the next request recomputes them"""
+    cache.delete(DASHBOARD_STATS_KEY)
+
+
+def compute_dashboard_stats() -> Dict:
+    """
+    Count everything the dashboard shows with one conditional-aggregation
+    query per table, instead of one COUNT(*) per figure
+    """
+    start_of_today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    people = Person.objects.aggregate(
+        total=Count('id'),
+        with_linkedin=Count('id', filter=~Q(linkedin_url='')),
+    )
+    results = SearchResult.objects.aggregate(
+        completed=Count('id', filter=Q(status='completed')),
+        pending=Count('id', filter=Q(status='pending')),
+        failed=Count('id', filter=Q(status='failed')),
+    )
+    matches = Match.objects.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=Q(created_at__gte=start_of_today)),
+    )
+
+    return {
+        'total_companies': Company.objects.count(),
+        'total_people': people['total'],
+        'people_with_linkedin': people['with_linkedin'],
+        'total_keywords': Keyword.objects.filter(is_active=True).count(),
+        'total_results': results['completed'],
+        'total_matches': matches['total'],
+        'pending_scrapes': results['pending'],
+        'failed_scrapes': results['failed'],
+        'matches_today': matches['today'],
+        'top_keywords': list(Keyword.objects.annotate(
+            match_count=Count('matches')
+        ).filter(match_count__gt=0).order_by('-match_count').values('word', 'match_count')[:10]),
+    }
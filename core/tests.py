@@ -0,0 +1,337 @@
+import io
+import random
+import re
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from scraper.keyword_automaton import KeywordAutomaton
+from scraper.linkedin_parser import parse_profile_page
+
+from .exports import PEOPLE_HEADER, ROWS_PER_WRITE
+from .importers import KeywordImport, PersonImport
+from .job_queue import MAX_ATTEMPTS, claim_next_job, enqueue_scraping_job, fail_job, heartbeat, requeue_stale_jobs
+from .models import Company, ExportJob, Keyword, Match, Person, RunWatermark, ScrapingJob, SearchResult
+from .scraping import run_scraping_job
+
+TESTDATA = Path(__file__).resolve().parent / 'testdata'
+
+
+class CsvExportStreamingTests(TestCase):
+    """CSV exports are sent as they are produced under both WSGI and ASGI"""
+
+    people_count = ROWS_PER_WRITE * 2 + 1
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('exporter', password='secret')
+        company = Company.objects.create(name='Acme')
+        Person.objects.bulk_create(
+            Person(name=f'Person {i}', company=company) for i in range(cls.people_count)
+        )
+
+    def test_streams_under_wsgi(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('core:export_people'))
+
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.is_async)
+        chunks = iter(response.streaming_content)
+        self.assertEqual(next(chunks).decode().strip(), ','.join(PEOPLE_HEADER))
+        # Only the header has been produced; the rows are still to come
+        self.assertEqual(ExportJob.objects.get().status, 'processing')
+
+        lines = b''.join(chunks).decode().splitlines()
+        response.close()
+        self.assertEqual(len(lines), self.people_count)
+        self.assertEqual(ExportJob.objects.get().status, 'completed')
+
+    async def test_streams_under_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('core:export_people'))
+
+        # A sync iterator would be read into a list before the first byte was sent
+        self.assertTrue(response.is_async)
+        chunks = aiter(response.streaming_content)
+        self.assertEqual((await anext(chunks)).decode().strip(), ','.join(PEOPLE_HEADER))
+        self.assertEqual((await ExportJob.objects.aget()).status, 'processing')
+
+        lines = b''.join([chunk async for chunk in chunks]).decode().splitlines()
+        self.assertEqual(len(lines), self.people_count)
+        self.assertEqual((await ExportJob.objects.aget()).status, 'completed')
+
+
+class XlsxExportStreamingTests(TestCase):
+    """The spooled workbook is sent a block at a time under ASGI too"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('exporter', password='secret')
+        company = Company.objects.create(name='Acme')
+        Person.objects.bulk_create(Person(name=f'Person {i}', company=company) for i in range(50))
+
+    async def test_streams_under_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('core:export_excel'))
+
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content), int(response['Content-Length']))
+        workbook = load_workbook(io.BytesIO(content), read_only=True)
+        self.assertEqual(sum(1 for _ in workbook['People'].iter_rows()), 51)
+
+
+class AuthWallDetectionTests(SimpleTestCase):
+    """Auth-wall markup only counts in the first AUTH_WALL_SCAN_CHARS characters of a page"""
+
+    url = 'https://uk.linkedin.com/in/jane-doe-data'
+
+    def parse(self, html, backend):
+        return parse_profile_page(html, self.url, self.url, backend)
+
+    def test_public_profile_is_not_an_auth_wall(self):
+        # Past its large head the page has a sign-in modal with a password field and
+        # "join now to see" prompts, as public profiles do
+        html = (TESTDATA / 'linkedin_public_profile.html').read_text()
+        for backend in ('bs4', 'lxml'):
+            with self.subTest(backend=backend):
+                profile = self.parse(html, backend)
+                self.assertFalse(profile['auth_wall'])
+                self.assertIn('Senior Data Engineer', profile['headline'])
+                self.assertIn('Northwind Retail', profile['experience'])
+
+    def test_auth_wall_is_detected(self):
+        # The login form starts past the 5,000 characters the raw-HTML check reads
+        html = (TESTDATA / 'linkedin_auth_wall.html').read_text()
+        for backend in ('bs4', 'lxml'):
+            with self.subTest(backend=backend):
+                self.assertTrue(self.parse(html, backend)['auth_wall'])
+
+    def test_login_form_near_the_top_is_detected(self):
+        html = (TESTDATA / 'linkedin_public_profile.html').read_text()
+        # With most of the stylesheet gone the sign-in modal moves inside the scanned prefix,
+        # while the raw-HTML check still sees nothing in its 5,000 characters
+        start, end = html.index('<style>') + len('<style>'), html.index('</style>')
+        short = html[:start] + html[start:html.index('}', start + 4200) + 1] + html[end:]
+        self.assertNotIn('login', short[:5000].lower())
+        self.assertLess(short.index('type="password"'), 10000)
+        for backend in ('bs4', 'lxml'):
+            with self.subTest(backend=backend):
+                self.assertTrue(self.parse(short, backend)['auth_wall'])
+
+
+class KeywordAutomatonTests(SimpleTestCase):
+    """The automaton finds exactly what the old per-keyword \\b regex did"""
+
+    def assertMatchesRegex(self, keywords, text):
+        automaton = KeywordAutomaton([(keyword, keyword) for keyword in keywords])
+        found = {automaton.payloads[index]: spans for index, spans in automaton.find_all(text).items()}
+        expected = {}
+        for keyword in keywords:
+            spans = [m.span() for m in re.finditer(r'\b' + re.escape(keyword) + r'\b', text)]
+            if spans:
+                expected[keyword] = spans
+        self.assertEqual(found, expected, msg=text)
+
+    def test_overlapping_keywords(self):
+        keywords = ['data', 'big data', 'data science', 'science', 'data scientist', 'aa', 'a a']
+        for text in [
+            'big data science for data scientists',
+            'a big data-data science team; data/science',
+            'aaa aa a a a aa_aa',
+        ]:
+            self.assertMatchesRegex(keywords, text)
+
+    def test_unicode_boundaries(self):
+        keywords = ['café', 'zürich', 'münchen', 'naïve', 'straße', 'данные', '数据']
+        for text in [
+            'café owner in zürich, not cafés or zürichsee',
+            'münchen’s naïve bayes vs naïveté; straßenbahn straße',
+            'анализ данные данныех 数据 大数据',
+        ]:
+            self.assertMatchesRegex(keywords, text)
+
+    def test_punctuation_boundaries(self):
+        keywords = ['c++', 'c#', '.net', 'node.js', 'ci/cd', 'r&d', 'c', 'net']
+        for text in [
+            'c++ and c# on .net, node.js; ci/cd and r&d',
+            'c++11 vs c+++ vs xc++, asp.net .netcore (c#) node.jsx',
+            '.net.net c c_c c-c r&d&r ci/cd/ci',
+        ]:
+            self.assertMatchesRegex(keywords, text)
+
+    def test_random_text(self):
+        rng = random.Random(1)
+        alphabet = 'ab é_-.+ '
+        keywords = sorted({''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)})
+        for _ in range(200):
+            self.assertMatchesRegex(keywords, ''.join(rng.choice(alphabet) for _ in range(60)))
+
+
+class RematchKeywordsTests(TestCase):
+    """rematch_keywords only rescans keywords changed since its last run"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Migration 0013 may have copied a watermark from the cache into the test database
+        RunWatermark.objects.all().delete()
+        person = Person.objects.create(name='Jane Doe', company=Company.objects.create(name='Acme'))
+        cls.search_result = SearchResult.objects.create(
+            person=person,
+            status='completed',
+            profile_content='Python and Django developer',
+            source_url='https://www.linkedin.com/in/jane-doe',
+        )
+
+    def rematch(self, *args):
+        call_command('rematch_keywords', *args, stdout=io.StringIO())
+
+    def matched_words(self):
+        return set(Match.objects.values_list('keyword__word', flat=True))
+
+    def test_first_run_needs_keywords_or_since(self):
+        with self.assertRaises(CommandError):
+            self.rematch()
+
+    def test_rescans_only_keywords_changed_since_the_watermark(self):
+        python = Keyword.objects.create(word='python')
+        Keyword.objects.filter(id=python.id).update(
+            created_at=timezone.now() - timedelta(days=2),
+            updated_at=timezone.now() - timedelta(days=2),
+        )
+        RunWatermark.objects.create(name='rematch_keywords', last_run_at=timezone.now() - timedelta(days=1))
+        Keyword.objects.create(word='django')
+
+        started = timezone.now()
+        self.rematch()
+
+        # python predates the watermark, so it was not rescanned and still has no match
+        self.assertEqual(self.matched_words(), {'django'})
+        self.assertGreaterEqual(RunWatermark.objects.get(name='rematch_keywords').last_run_at, started)
+
+        # Nothing changed since, so the next run scans nothing
+        Match.objects.all().delete()
+        self.rematch()
+        self.assertEqual(self.matched_words(), set())
+
+    def test_explicit_keywords_leave_the_watermark_alone(self):
+        Keyword.objects.create(word='python')
+        last_run_at = timezone.now() - timedelta(days=1)
+        RunWatermark.objects.create(name='rematch_keywords', last_run_at=last_run_at)
+
+        self.rematch('python')
+
+        self.assertEqual(self.matched_words(), {'python'})
+        self.assertEqual(RunWatermark.objects.get(name='rematch_keywords').last_run_at, last_run_at)
+
+
+class JobQueueTests(TestCase):
+    """Workers claim each queued job once and lose it when their lease goes stale"""
+
+    def make_stale(self, job):
+        ScrapingJob.objects.filter(id=job.id).update(heartbeat_at=timezone.now() - timedelta(minutes=10))
+
+    def test_each_job_is_claimed_by_one_worker(self):
+        first = enqueue_scraping_job([])
+        second = enqueue_scraping_job([])
+
+        self.assertEqual(claim_next_job('worker-a').id, first.id)
+        claimed = claim_next_job('worker-b')
+        self.assertEqual(claimed.id, second.id)
+        self.assertIsNone(claim_next_job('worker-c'))
+
+        self.assertEqual((claimed.status, claimed.worker_id, claimed.attempts), ('running', 'worker-b', 1))
+
+    def test_stale_job_is_requeued_and_taken_from_its_worker(self):
+        enqueue_scraping_job([])
+        stalled = claim_next_job('worker-a')
+        self.make_stale(stalled)
+
+        self.assertEqual(requeue_stale_jobs(stale_after=60), (1, 0))
+        reclaimed = claim_next_job('worker-b')
+        self.assertEqual((reclaimed.id, reclaimed.attempts), (stalled.id, 2))
+
+        # The stalled worker can no longer heartbeat, fail or finish the job
+        self.assertFalse(heartbeat(stalled.id, 'worker-a'))
+        self.assertFalse(fail_job(stalled.id, 'worker-a', 'Timed out'))
+        run_scraping_job(stalled)
+        job = ScrapingJob.objects.get(id=stalled.id)
+        self.assertEqual((job.status, job.worker_id), ('running', 'worker-b'))
+
+        run_scraping_job(reclaimed)
+        self.assertEqual(ScrapingJob.objects.get(id=stalled.id).status, 'completed')
+
+    def test_fresh_job_is_not_requeued(self):
+        enqueue_scraping_job([])
+        claim_next_job('worker-a')
+
+        self.assertEqual(requeue_stale_jobs(stale_after=60), (0, 0))
+
+    def test_job_fails_after_max_attempts(self):
+        enqueue_scraping_job([])
+        job = claim_next_job('worker-a')
+        ScrapingJob.objects.filter(id=job.id).update(attempts=MAX_ATTEMPTS)
+        self.make_stale(job)
+
+        self.assertEqual(requeue_stale_jobs(stale_after=60), (0, 1))
+        self.assertEqual(ScrapingJob.objects.get(id=job.id).status, 'failed')
+        self.assertIsNone(claim_next_job('worker-b'))
+
+
+class ImportDedupeTests(TestCase):
+    """Imports match existing rows by normalized key and only write what changed"""
+
+    def run_import(self, importer, text):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', delete=False) as f:
+            f.write(text)
+        self.addCleanup(Path(f.name).unlink)
+        return importer.run(f.name)
+
+    def test_people_match_by_normalized_name_and_company(self):
+        company = Company.objects.create(name='Acme Ltd')
+        Person.objects.create(name='Álvaro Pérez', company=company)
+
+        result = self.run_import(PersonImport(), (
+            'name,company,linkedin_url\n'
+            'ÁLVARO  PÉREZ, acme ltd ,https://www.linkedin.com/in/alvaro\n'
+            'Jane Doe,ACME LTD,\n'
+            'jane doe,Acme Ltd,https://www.linkedin.com/in/jane\n'
+            'John Roe,Globex,\n'
+        ))
+
+        self.assertEqual(
+            (result.created, result.updated, result.duplicates, result.companies_created), (2, 1, 1, 1)
+        )
+        self.assertEqual(Person.objects.count(), 3)
+        self.assertEqual(Person.objects.get(name='Álvaro Pérez').linkedin_url, 'https://www.linkedin.com/in/alvaro')
+        # The last of the duplicate lines wins
+        self.assertEqual(Person.objects.get(name='jane doe').linkedin_url, 'https://www.linkedin.com/in/jane')
+
+    def test_unchanged_keywords_are_not_rewritten(self):
+        self.run_import(KeywordImport(), 'word,category\npython,technology\ndjango,technology\n')
+        Keyword.objects.update(updated_at=timezone.now() - timedelta(days=1))
+        before = dict(Keyword.objects.values_list('word', 'updated_at'))
+
+        result = self.run_import(KeywordImport(), (
+            'word,category\npython,technology\ndjango,skill\ndjango,other\nrust,technology\n'
+        ))
+
+        self.assertEqual((result.created, result.updated, result.unchanged, result.duplicates), (1, 1, 1, 1))
+        self.assertEqual(Keyword.objects.get(word='python').updated_at, before['python'])
+        self.assertGreater(Keyword.objects.get(word='django').updated_at, before['django'])
+        self.assertEqual(Keyword.objects.get(word='django').category, 'other')
+
+    def test_word_list_keeps_existing_categories(self):
+        self.run_import(KeywordImport(), 'word,category\npython,technology\n')
+
+        result = self.run_import(KeywordImport(), 'python\nrust\n')
+
+        self.assertEqual((result.created, result.updated, result.unchanged), (1, 0, 1))
+        self.assertEqual(Keyword.objects.get(word='python').category, 'technology')
@@ -27,6 +27,10 @@ urlpatterns = [
     path('export/results/', views.export_results_csv, name='export_results'),
     path('export/matches/', views.export_matches_csv, name='export_matches'),
     path('export/people/', views.export_people_csv, name='export_people'),
+    path('export/excel/', views.export_results_excel, name='export_excel'),
+    path('export/<int:export_id>/download/', views.download_export, name='download_export'),
+    path('api/exports/', views.request_export, name='request_export'),
+    path('api/exports/<int:export_id>/', views.get_export_status, name='export_status'),
     
     # Scraping API endpoints
     path('api/scrape/<int:person_id>/', views.scrape_person, name='scrape_person'),
@@ -37,6 +41,8 @@ urlpatterns = [
     # Job management endpoints
     path('api/jobs/', views.get_job_status, name='get_jobs'),
     path('api/jobs/<int:job_id>/', views.get_job_status, name='get_job_status'),
+    path('api/jobs/<int:job_id>/resume/', views.resume_job, name='resume_job'),
+    path('api/jobs/events/', views.job_events, name='job_events'),
     
     # Stats and data endpoints
     path('api/stats/', views.get_stats, name='get_stats'),
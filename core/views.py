@@ -1,22 +1,32 @@
-import csv
 import json
+import os
 from django.shortcuts import render
-from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.db.models import Count, Q, F
 from django.utils import timezone
 from django.core.paginator import Paginator
+from django.core.handlers.asgi import ASGIRequest
 
 from .models import Person, Company, Keyword, SearchResult, Match, ScrapingJob, ExportJob
+from .exports import (
+    EXPORT_CONTENT_TYPES, MATCHES_HEADER, PEOPLE_HEADER, RESULTS_HEADER,
+    csv_response, file_download_response, match_rows, people_rows, search_result_rows, workbook_sheets, xlsx_response,
+)
+from .job_queue import enqueue_export_job, enqueue_scraping_job, resume_scraping_job
+from .events import job_event_stream
+from .progress import JobProgress
+from .stats import get_dashboard_stats, invalidate_dashboard_stats
 from scraper.google_cse import GoogleCSEService
-from scraper.linkedin_parser import LinkedInParser
 from scraper.keyword_matcher import KeywordMatcher
 
 
 def dashboard(request):
-    # People with stats
-    people = Person.objects.select_related('company').annotate(
+    # People with stats, counted for the 50 newest people only rather than grouped over the whole table
+    newest_people = Person.objects.order_by('-created_at').values('id')[:50]
+    people = Person.objects.filter(id__in=newest_people).select_related('company').annotate(
         result_count=Count('search_results'),
         match_count=Count('search_results__matches')
     ).order_by('-created_at')[:50]
@@ -39,20 +49,8 @@ def dashboard(request):
     # Recent scraping jobs
     recent_jobs = ScrapingJob.objects.order_by('-created_at')[:10]
     
-    # Stats with enhanced metrics
-    stats = {
-        'total_companies': Company.objects.count(),
-        'total_people': Person.objects.count(),
-        'people_with_linkedin': Person.objects.exclude(linkedin_url='').count(),
-        'total_keywords': Keyword.objects.filter(is_active=True).count(),
-        'total_results': SearchResult.objects.filter(status='completed').count(),
-        'total_matches': Match.objects.count(),
-        'pending_scrapes': SearchResult.objects.filter(status='pending').count(),
-        'failed_scrapes': SearchResult.objects.filter(status='failed').count(),
-        'recent_matches_today': Match.objects.filter(
-            created_at__date=timezone.now().date()
-        ).count(),
-    }
+    # Counts are cached briefly and dropped when a scraping job finishes
+    stats = get_dashboard_stats()
     
     context = {
         'people': people,
@@ -75,154 +73,58 @@ def export_results_csv(request):
     format_type = request.GET.get('format', 'csv')
     
     if format_type == 'excel':
-        response = HttpResponse(content_type='application/vnd.ms-excel')
-        response['Content-Disposition'] = 'attachment; filename="search_results.xlsx"'
-        # You would use pandas or openpyxl here for Excel export
-        return export_results_excel(response)
-    
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="search_results.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'Person Name', 'Company', 'LinkedIn URL', 'Content Source',
-        'Headline', 'About', 'Experience', 'Status', 
-        'Match Count', 'Scraped At', 'Source URL'
-    ])
-    
-    results = SearchResult.objects.select_related(
-        'person', 'person__company'
-    ).annotate(match_count=Count('matches'))
+        return export_results_excel(request)
     
-    # Apply filters if provided
     status_filter = request.GET.get('status')
-    if status_filter:
-        results = results.filter(status=status_filter)
-    
     source_filter = request.GET.get('source')
-    if source_filter:
-        results = results.filter(content_source=source_filter)
-    
-    for result in results:
-        scraped_at = result.scraped_at.strftime('%Y-%m-%d %H:%M:%S') if result.scraped_at else ''
-        writer.writerow([
-            result.person.name,
-            result.person.company.name,
-            result.person.linkedin_url,
-            result.get_content_source_display(),
-            result.profile_headline,
-            result.profile_about[:500] if result.profile_about else '',
-            result.profile_experience[:500] if result.profile_experience else '',
-            result.get_status_display(),
-            result.match_count,
-            scraped_at,
-            result.source_url,
-        ])
-    
-    # Create export job record
-    ExportJob.objects.create(
+    
+    # Create export job record; completed once the last row is streamed
+    export_job = ExportJob.objects.create(
         file_name='search_results.csv',
         file_format='csv',
-        status='completed',
+        export_type='results',
+        status='processing',
         filters_applied={'status': status_filter, 'source': source_filter},
         created_by=request.user.username if request.user.is_authenticated else 'anonymous',
-        completed_at=timezone.now()
     )
     
-    return response
+    return csv_response(
+        request, 'search_results.csv', RESULTS_HEADER,
+        search_result_rows(status_filter, source_filter), export_job
+    )
 
 
 @login_required
 def export_matches_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="keyword_matches.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'Person Name', 'Company', 'Keyword', 'Category',
-        'Context Snippet', 'Source URL', 'Match Count', 
-        'Confidence Score', 'Found At'
-    ])
-    
-    matches = Match.objects.select_related(
-        'search_result__person', 
-        'search_result__person__company', 
-        'keyword'
-    )
-    
-    # Apply filters
     keyword_filter = request.GET.get('keyword')
-    if keyword_filter:
-        matches = matches.filter(keyword__word__icontains=keyword_filter)
-    
     category_filter = request.GET.get('category')
-    if category_filter:
-        matches = matches.filter(keyword__category=category_filter)
-    
-    for match in matches:
-        created_at = match.created_at.strftime('%Y-%m-%d %H:%M:%S') if match.created_at else ''
-        writer.writerow([
-            match.search_result.person.name,
-            match.search_result.person.company.name,
-            match.keyword.word,
-            match.keyword.get_category_display(),
-            match.context_snippet[:300],
-            match.source_url,
-            match.match_count,
-            match.confidence_score,
-            created_at,
-        ])
-    
-    ExportJob.objects.create(
+    
+    export_job = ExportJob.objects.create(
         file_name='keyword_matches.csv',
         file_format='csv',
-        status='completed',
+        export_type='matches',
+        status='processing',
         filters_applied={'keyword': keyword_filter, 'category': category_filter},
         created_by=request.user.username if request.user.is_authenticated else 'anonymous',
-        completed_at=timezone.now()
     )
     
-    return response
+    return csv_response(
+        request, 'keyword_matches.csv', MATCHES_HEADER,
+        match_rows(keyword_filter, category_filter), export_job
+    )
 
 
 @login_required
 def export_people_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="people.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'Name', 'Company', 'Website', 'LinkedIn URL', 
-        'Has LinkedIn', 'Total Matches', 'Created At', 'Last Updated'
-    ])
-    
-    people = Person.objects.select_related('company').annotate(
-        match_count=Count('search_results__matches')
-    )
-    
-    for person in people:
-        created_at = person.created_at.strftime('%Y-%m-%d %H:%M:%S') if person.created_at else ''
-        updated_at = person.updated_at.strftime('%Y-%m-%d %H:%M:%S') if person.updated_at else ''
-        writer.writerow([
-            person.name,
-            person.company.name,
-            person.company.website,
-            person.linkedin_url,
-            'Yes' if person.has_linkedin_url else 'No',
-            person.match_count,
-            created_at,
-            updated_at,
-        ])
-    
-    ExportJob.objects.create(
+    export_job = ExportJob.objects.create(
         file_name='people.csv',
         file_format='csv',
-        status='completed',
+        export_type='people',
+        status='processing',
         created_by=request.user.username if request.user.is_authenticated else 'anonymous',
-        completed_at=timezone.now()
     )
     
-    return response
+    return csv_response(request, 'people.csv', PEOPLE_HEADER, people_rows(), export_job)
 
 
 @require_http_methods(["POST"])
@@ -232,348 +134,74 @@ def scrape_person(request, person_id):
     except Person.DoesNotExist:
         return JsonResponse({'error': 'Person not found'}, status=404)
     
-    # Create scraping job
-    job = ScrapingJob.objects.create(
-        job_type='single',
-        person=person,
-        status='running',
-        started_at=timezone.now()
-    )
-    
     cse_service = GoogleCSEService()
-    parser = LinkedInParser()
-    matcher = KeywordMatcher()
-    
-    search_result, created = SearchResult.objects.get_or_create(
-        person=person,
-        defaults={'status': 'pending'}
-    )
-    
-    if not created:
-        search_result.status = 'pending'
-        search_result.error_message = ''
-        search_result.save()
-    
-    try:
-        linkedin_url = person.linkedin_url
-        if not linkedin_url:
-            search_results = cse_service.search_linkedin_profile(person.name, person.company.name)
-            if search_results:
-                linkedin_url = search_results[0].get('link', '')
-                person.linkedin_url = linkedin_url
-                person.save()
-        
-        if linkedin_url:
-            profile_data = parser.scrape_profile(linkedin_url)
-            
-            if profile_data.get('error'):
-                search_result.status = 'failed'
-                search_result.error_message = f"Scraping error: {profile_data.get('error')}"
-                search_result.save()
-                job.status = 'failed'
-                job.error_message = search_result.error_message
-                job.completed_at = timezone.now()
-                job.save()
-                return JsonResponse({
-                    'success': False,
-                    'error': profile_data.get('error'),
-                    'job_id': job.id
-                })
-            
-            if profile_data.get('auth_wall'):
-                search_result.status = 'failed'
-                search_result.error_message = 'LinkedIn requires authentication - profile not publicly accessible'
-                search_result.save()
-                job.status = 'failed'
-                job.error_message = search_result.error_message
-                job.completed_at = timezone.now()
-                job.save()
-                return JsonResponse({
-                    'success': False,
-                    'error': 'LinkedIn profile requires login to view',
-                    'job_id': job.id
-                })
-            
-            search_result.profile_content = profile_data.get('full_content', '')
-            search_result.profile_headline = profile_data.get('headline', '')
-            search_result.profile_about = profile_data.get('about', '')
-            search_result.profile_experience = profile_data.get('experience', '')
-            search_result.source_url = linkedin_url
-            search_result.content_source = 'linkedin'
-            search_result.status = 'completed'
-            search_result.save()
-            
-            matches = matcher.find_matches(search_result)
-            
-            job.status = 'completed'
-            job.success_count = 1
-            job.processed_count = 1
-            job.completed_at = timezone.now()
-            job.save()
-            
-            return JsonResponse({
-                'success': True,
-                'person_id': person.id,
-                'person_name': person.name,
-                'linkedin_url': linkedin_url,
-                'matches_found': len(matches),
-                'job_id': job.id
-            })
-        else:
-            search_result.status = 'failed'
-            search_result.error_message = 'No LinkedIn profile found via search'
-            search_result.save()
-            job.status = 'failed'
-            job.error_message = search_result.error_message
-            job.completed_at = timezone.now()
-            job.save()
-            return JsonResponse({
-                'success': False,
-                'error': 'No LinkedIn profile found',
-                'job_id': job.id
-            })
-            
-    except Exception as e:
-        search_result.status = 'failed'
-        search_result.error_message = str(e)
-        search_result.save()
-        job.status = 'failed'
-        job.error_message = str(e)
-        job.completed_at = timezone.now()
-        job.save()
+    if not person.linkedin_url and cse_service.remaining_quota() == 0:
         return JsonResponse({
             'success': False,
-            'error': str(e),
-            'job_id': job.id
-        }, status=500)
+            'error': 'Daily Google search quota exhausted - try again tomorrow or add the LinkedIn URL manually'
+        }, status=429)
+    
+    # Queue the scrape; a run_workers process picks it up
+    job = enqueue_scraping_job([person.id], job_type='single', person=person)
+    
+    return JsonResponse({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'person_id': person.id,
+        'person_name': person.name,
+    }, status=202)
 
 
 @require_http_methods(["POST"])
 def scrape_all_pending(request):
-    """Scrape all pending people (original function)"""
-    people_without_results = Person.objects.filter(
+    """Queue a scraping job for pending people (original function)"""
+    people_without_results = Person.objects.select_related('company').filter(
         Q(search_results__isnull=True) | Q(search_results__status='pending')
     ).distinct()[:10]
     
-    job = ScrapingJob.objects.create(
-        total_people=people_without_results.count(),
-        status='running',
-        started_at=timezone.now()
-    )
-    
-    results = []
     cse_service = GoogleCSEService()
-    parser = LinkedInParser()
-    matcher = KeywordMatcher()
+    # Defer people whose profile search today's quota can't cover
+    people, deferred = cse_service.fit_to_quota(list(people_without_results))
     
-    for person in people_without_results:
-        try:
-            linkedin_url = person.linkedin_url
-            if not linkedin_url:
-                search_results = cse_service.search_linkedin_profile(person.name, person.company.name)
-                if search_results:
-                    linkedin_url = search_results[0].get('link', '')
-                    person.linkedin_url = linkedin_url
-                    person.save()
-            
-            if linkedin_url:
-                search_result, created = SearchResult.objects.get_or_create(
-                    person=person,
-                    defaults={'status': 'pending'}
-                )
-                
-                if not created:
-                    search_result.status = 'pending'
-                    search_result.error_message = ''
-                
-                profile_data = parser.scrape_profile(linkedin_url)
-                
-                if profile_data.get('error') or profile_data.get('auth_wall'):
-                    search_result.status = 'failed'
-                    search_result.error_message = profile_data.get('error') or 'LinkedIn requires authentication'
-                    search_result.save()
-                    job.error_count += 1
-                    job.processed_count += 1
-                    job.save()
-                    results.append({
-                        'person': person.name,
-                        'status': 'failed',
-                        'error': search_result.error_message
-                    })
-                    continue
-                
-                search_result.profile_content = profile_data.get('full_content', '')
-                search_result.profile_headline = profile_data.get('headline', '')
-                search_result.profile_about = profile_data.get('about', '')
-                search_result.profile_experience = profile_data.get('experience', '')
-                search_result.source_url = linkedin_url
-                search_result.content_source = 'linkedin'
-                search_result.status = 'completed'
-                search_result.save()
-                
-                matches = matcher.find_matches(search_result)
-                
-                job.success_count += 1
-                job.processed_count += 1
-                job.save()
-                results.append({
-                    'person': person.name,
-                    'status': 'success',
-                    'matches': len(matches)
-                })
-            else:
-                search_result, _ = SearchResult.objects.get_or_create(
-                    person=person,
-                    defaults={'status': 'failed', 'error_message': 'No LinkedIn profile found'}
-                )
-                if search_result.status != 'failed':
-                    search_result.status = 'failed'
-                    search_result.error_message = 'No LinkedIn profile found'
-                    search_result.save()
-                    
-                job.error_count += 1
-                job.processed_count += 1
-                job.save()
-                results.append({
-                    'person': person.name,
-                    'status': 'failed',
-                    'error': 'No LinkedIn profile found'
-                })
-                
-        except Exception as e:
-            job.error_count += 1
-            job.processed_count += 1
-            job.save()
-            results.append({
-                'person': person.name,
-                'status': 'failed',
-                'error': str(e)
-            })
-    
-    job.status = 'completed'
-    job.completed_at = timezone.now()
-    job.save()
+    job = enqueue_scraping_job([person.id for person in people])
     
     return JsonResponse({
         'success': True,
         'job_id': job.id,
-        'total_processed': job.processed_count,
-        'success_count': job.success_count,
-        'error_count': job.error_count,
-        'results': results
-    })
+        'status': job.status,
+        'total_people': job.total_people,
+        'deferred_count': len(deferred),
+    }, status=202)
 
 
 @require_http_methods(["POST"])
 def scrape_batch(request):
-    """Scrape a batch of people with configurable limits"""
+    """Queue a batch of people for scraping with configurable limits"""
     person_ids = request.POST.getlist('person_ids[]')
     
     if person_ids:
-        people = Person.objects.filter(id__in=person_ids)
+        people = Person.objects.select_related('company').filter(id__in=person_ids)
     else:
         # Get people without results or with failed results
-        people = Person.objects.filter(
+        people = Person.objects.select_related('company').filter(
             Q(search_results__isnull=True) | 
             Q(search_results__status='failed')
         ).distinct()[:20]
     
-    job = ScrapingJob.objects.create(
-        job_type='batch',
-        total_people=people.count(),
-        status='running',
-        started_at=timezone.now()
-    )
-    
-    results = []
     cse_service = GoogleCSEService()
-    parser = LinkedInParser()
-    matcher = KeywordMatcher()
-    
-    for person in people:
-        try:
-            linkedin_url = person.linkedin_url
-            if not linkedin_url:
-                search_results = cse_service.search_linkedin_profile(person.name, person.company.name)
-                if search_results:
-                    linkedin_url = search_results[0].get('link', '')
-                    person.linkedin_url = linkedin_url
-                    person.save()
-            
-            if linkedin_url:
-                search_result, created = SearchResult.objects.get_or_create(
-                    person=person,
-                    defaults={'status': 'pending'}
-                )
-                
-                profile_data = parser.scrape_profile(linkedin_url)
-                
-                if profile_data.get('error') or profile_data.get('auth_wall'):
-                    search_result.status = 'failed'
-                    search_result.error_message = profile_data.get('error') or 'LinkedIn requires authentication'
-                    search_result.save()
-                    job.error_count += 1
-                    results.append({
-                        'person': person.name,
-                        'status': 'failed',
-                        'error': search_result.error_message
-                    })
-                else:
-                    search_result.profile_content = profile_data.get('full_content', '')
-                    search_result.profile_headline = profile_data.get('headline', '')
-                    search_result.profile_about = profile_data.get('about', '')
-                    search_result.profile_experience = profile_data.get('experience', '')
-                    search_result.source_url = linkedin_url
-                    search_result.content_source = 'linkedin'
-                    search_result.status = 'completed'
-                    search_result.save()
-                    
-                    matches = matcher.find_matches(search_result)
-                    
-                    job.success_count += 1
-                    results.append({
-                        'person': person.name,
-                        'status': 'success',
-                        'matches': len(matches)
-                    })
-            else:
-                search_result, _ = SearchResult.objects.get_or_create(
-                    person=person,
-                    defaults={
-                        'status': 'failed', 
-                        'error_message': 'No LinkedIn profile found'
-                    }
-                )
-                job.error_count += 1
-                results.append({
-                    'person': person.name,
-                    'status': 'failed',
-                    'error': 'No LinkedIn profile found'
-                })
-                
-        except Exception as e:
-            job.error_count += 1
-            results.append({
-                'person': person.name,
-                'status': 'failed',
-                'error': str(e)
-            })
-        
-        job.processed_count += 1
-        job.save()
+    # Defer people whose profile search today's quota can't cover
+    people, deferred = cse_service.fit_to_quota(list(people))
     
-    job.status = 'completed'
-    job.completed_at = timezone.now()
-    job.save()
+    job = enqueue_scraping_job([person.id for person in people])
     
     return JsonResponse({
         'success': True,
         'job_id': job.id,
-        'total_processed': job.processed_count,
-        'success_count': job.success_count,
-        'error_count': job.error_count,
-        'results': results
-    })
+        'status': job.status,
+        'total_people': job.total_people,
+        'deferred_count': len(deferred),
+    }, status=202)
 
 
 @require_http_methods(["POST"])
@@ -596,6 +224,7 @@ def scrape_company_websites(request):
     # This would integrate with your website scraper
     # For now, just create a placeholder implementation
     results = []
+    progress = JobProgress(job)
     
     for company in companies:
         try:
@@ -611,7 +240,7 @@ def scrape_company_websites(request):
                 status='completed'
             )
             
-            job.success_count += 1
+            progress.record('completed')
             results.append({
                 'company': company.name,
                 'status': 'success',
@@ -619,19 +248,18 @@ def scrape_company_websites(request):
             })
             
         except Exception as e:
-            job.error_count += 1
+            progress.record('failed')
             results.append({
                 'company': company.name,
                 'status': 'failed',
                 'error': str(e)
             })
-        
-        job.processed_count += 1
-        job.save()
     
+    progress.flush()
     job.status = 'completed'
     job.completed_at = timezone.now()
-    job.save()
+    job.save(update_fields=['status', 'completed_at'])
+    invalidate_dashboard_stats()
     
     return JsonResponse({
         'success': True,
@@ -640,6 +268,28 @@ def scrape_company_websites(request):
     })
 
 
+@require_http_methods(["POST"])
+def resume_job(request, job_id):
+    """Requeue a finished job; only its failed and interrupted people are scraped again"""
+    try:
+        job = ScrapingJob.objects.get(id=job_id)
+    except ScrapingJob.DoesNotExist:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    
+    if not resume_scraping_job(job):
+        return JsonResponse({
+            'success': False,
+            'error': f'Job is already {job.status}'
+        }, status=409)
+    
+    return JsonResponse({
+        'success': True,
+        'job_id': job.id,
+        'status': 'queued',
+        'remaining': job.tasks.exclude(status='completed').count(),
+    }, status=202)
+
+
 def get_job_status(request, job_id=None):
     """Get status of scraping jobs"""
     if job_id:
@@ -647,12 +297,17 @@ def get_job_status(request, job_id=None):
             job = ScrapingJob.objects.get(id=job_id)
             return JsonResponse({
                 'id': job.id,
+                'job_type': job.job_type,
                 'status': job.status,
                 'progress_percentage': job.progress_percentage,
                 'processed_count': job.processed_count,
                 'total_people': job.total_people,
                 'success_count': job.success_count,
                 'error_count': job.error_count,
+                'error_message': job.error_message,
+                'attempts': job.attempts,
+                'worker_id': job.worker_id,
+                'result': job.result,
                 'started_at': job.started_at.isoformat() if job.started_at else None,
                 'completed_at': job.completed_at.isoformat() if job.completed_at else None,
                 'duration': str(job.duration) if job.duration else None,
@@ -678,23 +333,36 @@ def get_job_status(request, job_id=None):
         return JsonResponse(job_list, safe=False)
 
 
+def job_events(request):
+    """
+    Server-sent events with live job progress (?job=<id> for a single job)
+    
+    Served from the ASGI application; every client shares one change feed
+    per worker process instead of polling the jobs table itself. A WSGI
+    server would buffer the endless stream and never send it, so there the
+    answer is 204, which tells EventSource to stop and the page to poll.
+    """
+    job_id = request.GET.get('job')
+    if job_id is not None and not job_id.isdigit():
+        return JsonResponse({'error': 'job must be a job id'}, status=400)
+    
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    
+    response = StreamingHttpResponse(
+        job_event_stream(int(job_id) if job_id else None),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+
 def get_stats(request):
     """Enhanced stats endpoint"""
-    today = timezone.now().date()
-    
     stats = {
-        'total_companies': Company.objects.count(),
-        'total_people': Person.objects.count(),
-        'people_with_linkedin': Person.objects.exclude(linkedin_url='').count(),
-        'total_keywords': Keyword.objects.filter(is_active=True).count(),
-        'total_results': SearchResult.objects.filter(status='completed').count(),
-        'total_matches': Match.objects.count(),
-        'pending_scrapes': SearchResult.objects.filter(status='pending').count(),
-        'failed_scrapes': SearchResult.objects.filter(status='failed').count(),
-        'matches_today': Match.objects.filter(created_at__date=today).count(),
-        'top_keywords': list(Keyword.objects.annotate(
-            match_count=Count('matches')
-        ).filter(match_count__gt=0).order_by('-match_count').values('word', 'match_count')[:10]),
+        **get_dashboard_stats(),
+        # Jobs change too often to cache; this is one indexed LIMIT query
         'recent_jobs': list(ScrapingJob.objects.values(
             'id', 'job_type', 'status', 'total_people', 'processed_count', 'created_at'
         ).order_by('-created_at')[:5])
@@ -735,9 +403,100 @@ def get_match_summary(request, search_result_id):
         return JsonResponse({'error': 'Search result not found'}, status=404)
 
 
-def export_results_excel(response):
-    """Placeholder for Excel export functionality"""
-    # This would use pandas or openpyxl to create Excel file
-    # For now, return a simple message
-    response.write("Excel export functionality would be implemented here")
-    return response
\ No newline at end of file
+@login_required
+def export_results_excel(request):
+    """Export results, matches and people as one XLSX workbook, one sheet each"""
+    filters = {
+        'status': request.GET.get('status'),
+        'source': request.GET.get('source'),
+        'keyword': request.GET.get('keyword'),
+        'category': request.GET.get('category'),
+    }
+    
+    export_job = ExportJob.objects.create(
+        file_name='linkedin_export.xlsx',
+        file_format='excel',
+        status='processing',
+        filters_applied=filters,
+        created_by=request.user.username if request.user.is_authenticated else 'anonymous',
+    )
+    
+    sheets = workbook_sheets(filters['status'], filters['source'], filters['keyword'], filters['category'])
+    return xlsx_response(request, 'linkedin_export.xlsx', sheets, export_job)
+
+
+@login_required
+@require_http_methods(["POST"])
+def request_export(request):
+    """Queue an export for a background worker; poll get_export_status, then download it"""
+    try:
+        data = json.loads(request.body) if request.body else {}
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+    
+    export_type = data.get('export_type', 'workbook')
+    file_format = data.get('format', 'excel')
+    
+    if export_type not in dict(ExportJob.EXPORT_TYPE_CHOICES):
+        return JsonResponse({'error': f'Unknown export type: {export_type}'}, status=400)
+    if file_format not in dict(ExportJob.FORMAT_CHOICES):
+        return JsonResponse({'error': f'Unknown format: {file_format}'}, status=400)
+    if export_type == 'workbook' and file_format == 'csv':
+        return JsonResponse({'error': 'A CSV file holds one table; export results, matches or people'}, status=400)
+    if file_format == 'parquet' and export_type != 'matches':
+        return JsonResponse({'error': 'Parquet exports are available for keyword matches only'}, status=400)
+    
+    filters = {key: data.get(key) for key in ('status', 'source', 'keyword', 'category') if data.get(key)}
+    export_job = enqueue_export_job(
+        export_type, file_format, filters,
+        created_by=request.user.username if request.user.is_authenticated else 'anonymous',
+    )
+    
+    return JsonResponse({
+        'success': True,
+        'export_id': export_job.id,
+        'status': export_job.status,
+    }, status=202)
+
+
+@login_required
+def get_export_status(request, export_id):
+    try:
+        export_job = ExportJob.objects.get(id=export_id)
+    except ExportJob.DoesNotExist:
+        return JsonResponse({'error': 'Export not found'}, status=404)
+    
+    return JsonResponse({
+        'id': export_job.id,
+        'export_type': export_job.export_type,
+        'format': export_job.file_format,
+        'file_name': export_job.file_name,
+        'status': export_job.status,
+        'progress_percentage': export_job.progress_percentage,
+        'rows_written': export_job.rows_written,
+        'total_rows': export_job.total_rows,
+        'file_size': export_job.file_size,
+        'error_message': export_job.error_message,
+        'attempts': export_job.attempts,
+        'download_url': reverse('core:download_export', args=[export_job.id]) if export_job.status == 'completed' else None,
+        'created_at': export_job.created_at.isoformat(),
+        'completed_at': export_job.completed_at.isoformat() if export_job.completed_at else None,
+    })
+
+
+@login_required
+def download_export(request, export_id):
+    """Serve a finished export's file; supports Range requests for resumed downloads"""
+    try:
+        export_job = ExportJob.objects.get(id=export_id)
+    except ExportJob.DoesNotExist:
+        return JsonResponse({'error': 'Export not found'}, status=404)
+    
+    if export_job.status != 'completed':
+        return JsonResponse({'error': f'Export is {export_job.status}'}, status=409)
+    if not export_job.file_path or not os.path.exists(export_job.file_path):
+        return JsonResponse({'error': 'Export file no longer exists'}, status=410)
+    
+    return file_download_response(
+        request, export_job.file_path, export_job.file_name, EXPORT_CONTENT_TYPES[export_job.file_format]
+    )
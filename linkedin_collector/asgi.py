@@ -0,0 +1,11 @@
+import os
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'linkedin_collector.settings')
+application = get_asgi_application()
+
+# Serve static files (the admin's) in development, as runserver does
+if settings.DEBUG:
+    application = ASGIStaticFilesHandler(application)
@@ -52,6 +52,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'linkedin_collector.wsgi.application'
 
+# Serve with an ASGI server (uvicorn linkedin_collector.asgi:application) so job event streams
+# don't each hold a worker thread
+ASGI_APPLICATION = 'linkedin_collector.asgi.application'
+
 # DATABASES = {
 #     'default': {
 #         'ENGINE': 'django.db.backends.postgresql',
@@ -64,16 +68,28 @@ WSGI_APPLICATION = 'linkedin_collector.wsgi.application'
 # }
 
 
+# WAL lets run_workers heartbeat and record progress while an export holds a long read open
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': 'PRAGMA journal_mode=WAL;',
+        },
     }
 }
 
 
 
 
+# Shared across worker processes so keyword-set version bumps are seen everywhere
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -94,9 +110,56 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 GOOGLE_CSE_API_KEY = os.environ.get('GOOGLE_CSE_API_KEY', '')
 GOOGLE_CSE_CX = os.environ.get('GOOGLE_CSE_CX', '')
+GOOGLE_CSE_QPS = float(os.environ.get('GOOGLE_CSE_QPS', '1.0'))
+GOOGLE_CSE_MAX_CONCURRENCY = int(os.environ.get('GOOGLE_CSE_MAX_CONCURRENCY', '5'))
+GOOGLE_CSE_DAILY_LIMIT = int(os.environ.get('GOOGLE_CSE_DAILY_LIMIT', '100'))
+GOOGLE_CSE_QUOTA_TIMEZONE = os.environ.get('GOOGLE_CSE_QUOTA_TIMEZONE', 'America/Los_Angeles')
+# Seconds to reuse search results; negative entries cover searches that found no profile
+GOOGLE_CSE_CACHE_TTL = int(os.environ.get('GOOGLE_CSE_CACHE_TTL', str(30 * 24 * 3600)))
+GOOGLE_CSE_NEGATIVE_CACHE_TTL = int(os.environ.get('GOOGLE_CSE_NEGATIVE_CACHE_TTL', str(24 * 3600)))
+# Seconds between each run_workers process's purges of expired search cache entries
+GOOGLE_CSE_CACHE_PURGE_INTERVAL = int(os.environ.get('GOOGLE_CSE_CACHE_PURGE_INTERVAL', '3600'))
 
 SCRAPING_DELAY = float(os.environ.get('SCRAPING_DELAY', '2.0'))
 
+# HTML backend for profile parsing: 'bs4' (BeautifulSoup) or 'lxml' (faster, same output)
+LINKEDIN_PARSER_BACKEND = os.environ.get('LINKEDIN_PARSER_BACKEND', 'bs4')
+
+# Raw fetched pages, compressed and keyed by SHA-256, for offline re-parsing
+LINKEDIN_ARCHIVE_PAGES = os.environ.get('LINKEDIN_ARCHIVE_PAGES', 'True').lower() in ('true', '1', 'yes')
+ARCHIVE_ROOT = os.environ.get('ARCHIVE_ROOT', str(BASE_DIR / 'archive'))
+
+# Seconds between the job progress feed's queries while event stream clients are connected
+JOB_EVENTS_POLL_INTERVAL = float(os.environ.get('JOB_EVENTS_POLL_INTERVAL', '1.0'))
+
+# Seconds the dashboard counts are cached; finishing a scraping job clears them sooner
+DASHBOARD_STATS_TTL = int(os.environ.get('DASHBOARD_STATS_TTL', '30'))
+
+# Files written by background export jobs (run_workers), served by the export download view
+EXPORT_ROOT = os.environ.get('EXPORT_ROOT', str(BASE_DIR / 'exports'))
+
+# Scraping job queue (run_workers): heartbeat period, when a silent worker's job is requeued, and retry cap
+WORKER_HEARTBEAT_INTERVAL = int(os.environ.get('WORKER_HEARTBEAT_INTERVAL', '10'))
+WORKER_STALE_AFTER = int(os.environ.get('WORKER_STALE_AFTER', '60'))
+WORKER_MAX_ATTEMPTS = int(os.environ.get('WORKER_MAX_ATTEMPTS', '3'))
+
+# Job progress counters are written at most every N seconds or M finished people
+JOB_PROGRESS_FLUSH_INTERVAL = float(os.environ.get('JOB_PROGRESS_FLUSH_INTERVAL', '2.0'))
+JOB_PROGRESS_FLUSH_EVERY = int(os.environ.get('JOB_PROGRESS_FLUSH_EVERY', '50'))
+
+# CSV lines written per transaction by the import_people and import_keywords commands
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', '5000'))
+
+# Staged scraping pipeline: threads per network stage (search, fetch), threads feeding the CPU
+# process pool per CPU stage (parse, match), CPU processes (0 parses in-thread), queue and write batch sizes
+PIPELINE_SEARCH_WORKERS = int(os.environ.get('PIPELINE_SEARCH_WORKERS', '5'))
+PIPELINE_FETCH_WORKERS = int(os.environ.get('PIPELINE_FETCH_WORKERS', '2'))
+PIPELINE_PARSE_WORKERS = int(os.environ.get('PIPELINE_PARSE_WORKERS', '2'))
+PIPELINE_MATCH_WORKERS = int(os.environ.get('PIPELINE_MATCH_WORKERS', '1'))
+PIPELINE_CPU_PROCESSES = int(os.environ.get('PIPELINE_CPU_PROCESSES', str(os.cpu_count() or 1)))
+PIPELINE_QUEUE_SIZE = int(os.environ.get('PIPELINE_QUEUE_SIZE', '20'))
+PIPELINE_WRITE_BATCH_SIZE = int(os.environ.get('PIPELINE_WRITE_BATCH_SIZE', '25'))
+
 CSRF_TRUSTED_ORIGINS = [
     'https://*.replit.dev',
     'https://*.replit.app',
@@ -70,13 +70,38 @@ import os
 import time
 import requests
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import quote_plus
 
+from .query_cache import query_cache
+from .quota import QuotaLedger
+from .rate_limit import TokenBucket
+
 logger = logging.getLogger(__name__)
 
 
+class QuotaExceededError(Exception):
+    """The daily Google CSE quota is used up; the search should be retried once it resets"""
+
+
+# One limiter per process, shared by every service instance
+_rate_limiter: Optional[TokenBucket] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Return the process-wide Google CSE limiter, created from settings on first use"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(rate=getattr(settings, 'GOOGLE_CSE_QPS', 1.0))
+        return _rate_limiter
+
+
 class GoogleCSEService:
     BASE_URL = "https://www.googleapis.com/customsearch/v1"
     
@@ -87,13 +112,69 @@ class GoogleCSEService:
         self.max_retries = getattr(settings, 'GOOGLE_CSE_MAX_RETRIES', 3)
         self.timeout = getattr(settings, 'GOOGLE_CSE_TIMEOUT', 30)
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.request_count = 0
-        self.daily_limit = 100  # Free tier limit
+        # Rate limiting: queries per second within this process
+        self.rate_limiter = get_rate_limiter()
+        
+        # Daily quota shared by every worker through the database; Google resets it at midnight Pacific
+        self.daily_limit = getattr(settings, 'GOOGLE_CSE_DAILY_LIMIT', 100)
+        self.quota = QuotaLedger(
+            'google_cse',
+            self.daily_limit,
+            getattr(settings, 'GOOGLE_CSE_QUOTA_TIMEZONE', 'America/Los_Angeles'),
+        )
+        self.max_concurrency = getattr(settings, 'GOOGLE_CSE_MAX_CONCURRENCY', 5)
+        
+        # Persistent result cache, so repeated searches don't spend quota
+        self.cache = query_cache
+        
+        # Pooled keep-alive connections, one per concurrent batch search
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'LinkedIn-Data-Collector/1.0'})
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=self.max_concurrency))
         
         self._validate_credentials()
     
+    @property
+    def request_count(self) -> int:
+        return self.quota.used()
+    
+    def remaining_quota(self) -> Optional[int]:
+        """
+        API searches left today across all processes
+        
+        Returns:
+            None when running in mock mode, where searches cost nothing
+        """
+        if not self.api_key or not self.cx:
+            return None
+        return self.quota.remaining()
+    
+    def fit_to_quota(self, people: List) -> Tuple[List, List]:
+        """
+        Split people into those that can be processed with today's remaining
+        quota and those deferred; only people without a LinkedIn URL need a search
+        
+        Returns:
+            (planned, deferred) lists, both in the original order
+        """
+        remaining = self.remaining_quota()
+        if remaining is None:
+            return list(people), []
+        
+        planned, deferred = [], []
+        for person in people:
+            if getattr(person, 'linkedin_url', None):
+                planned.append(person)
+            elif remaining > 0:
+                planned.append(person)
+                remaining -= 1
+            else:
+                deferred.append(person)
+        
+        if deferred:
+            logger.warning(f"Google CSE quota covers {len(planned)} of {len(planned) + len(deferred)} people; deferring the rest")
+        return planned, deferred
+    
     def _validate_credentials(self):
         """Validate that we have the necessary credentials"""
         if not self.api_key:
@@ -102,24 +183,11 @@ class GoogleCSEService:
             logger.warning("Google CSE CX (Search Engine ID) not found. Using mock mode.")
     
     def _rate_limit(self):
-        """Implement rate limiting to respect API quotas"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        # Ensure minimum delay between requests
-        if time_since_last < self.delay:
-            sleep_time = self.delay - time_since_last
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-            time.sleep(sleep_time)
-        
-        # Check daily limit (basic implementation)
-        if self.request_count >= self.daily_limit:
-            logger.warning("Daily API limit reached. Using mock mode.")
-            return False
-        
-        self.last_request_time = time.time()
-        self.request_count += 1
-        return True
+        """Reserve one request from the daily quota, then wait for a rate-limit token"""
+        if not self.quota.try_consume():
+            logger.warning("Google CSE daily API limit reached")
+            raise QuotaExceededError('Google CSE daily quota exhausted')
+        self.rate_limiter.acquire()
     
     def _build_search_query(self, person_name: str, company: Optional[str] = None) -> str:
         """Build optimized search query for LinkedIn profiles"""
@@ -149,69 +217,77 @@ class GoogleCSEService:
         
         Returns:
             List of search results with title, link, and snippet
+        
+        Raises:
+            QuotaExceededError: The daily quota (ours or Google's) is used up
         """
         if not self.api_key or not self.cx:
             logger.info(f"Using mock search for: {person_name}")
             return self._mock_search_results(person_name, company)
         
-        # Apply rate limiting
-        if not self._rate_limit():
-            return self._mock_search_results(person_name, company)
-        
         query = self._build_search_query(person_name, company)
+        num_results = min(num_results, 10)  # Google CSE max is 10
+        
+        cached = self.cache.get(query, num_results)
+        if cached is not None:
+            logger.info(f"Using cached search results for: {person_name}")
+            return cached
         
         params = {
             'key': self.api_key,
             'cx': self.cx,
             'q': query,
-            'num': min(num_results, 10),  # Google CSE max is 10
+            'num': num_results,
             'fields': 'items(title,link,snippet)',
         }
         
         for attempt in range(self.max_retries):
+            # Every attempt is a real request, so each one is paid for from the quota
+            self._rate_limit()
+            
             try:
                 logger.info(f"Searching Google CSE for: {person_name} (attempt {attempt + 1})")
                 
-                response = requests.get(
+                response = self.session.get(
                     self.BASE_URL, 
                     params=params, 
                     timeout=self.timeout,
-                    headers={'User-Agent': 'LinkedIn-Data-Collector/1.0'}
                 )
                 
-                if response.status_code == 403:
-                    logger.error("Google CSE API quota exceeded")
-                    return self._mock_search_results(person_name, company)
+                if response.status_code in (403, 429):
+                    logger.error(f"Google CSE API quota exceeded ({response.status_code})")
+                    raise QuotaExceededError(f'Google CSE API quota exceeded ({response.status_code})')
                 
                 response.raise_for_status()
                 data = response.json()
                 
                 results = self._process_search_results(data, person_name)
                 
+                # Only real API answers are cached; mock and error fallbacks never are
+                self.cache.set(query, num_results, results)
+                
                 logger.info(f"Found {len(results)} results for {person_name}")
                 return results
                 
             except requests.exceptions.Timeout:
                 logger.warning(f"Google CSE timeout for {person_name} (attempt {attempt + 1})")
                 if attempt == self.max_retries - 1:
-                    return self._mock_search_results(person_name, company)
+                    return []
                 
             except requests.exceptions.ConnectionError:
                 logger.error(f"Google CSE connection error for {person_name}")
                 if attempt == self.max_retries - 1:
-                    return self._mock_search_results(person_name, company)
+                    return []
                 
             except requests.exceptions.HTTPError as e:
                 logger.error(f"Google CSE HTTP error for {person_name}: {e}")
-                if response.status_code in [403, 429]:  # Quota exceeded or rate limited
-                    return self._mock_search_results(person_name, company)
                 if attempt == self.max_retries - 1:
                     return []
                     
             except requests.exceptions.RequestException as e:
                 logger.error(f"Google CSE request error for {person_name}: {e}")
                 if attempt == self.max_retries - 1:
-                    return self._mock_search_results(person_name, company)
+                    return []
             
             # Exponential backoff
             time.sleep(2 ** attempt)
@@ -296,6 +372,9 @@ class GoogleCSEService:
         """
         Search for multiple people in batch
         
+        Searches run concurrently (up to GOOGLE_CSE_MAX_CONCURRENCY in flight)
+        and the shared token bucket paces them to the configured quota.
+        
         Args:
             people_list: List of person names or Person objects
             company: Optional company to narrow all searches
@@ -303,19 +382,31 @@ class GoogleCSEService:
         Returns:
             Dictionary mapping person names to search results
         """
-        results = {}
-        
-        for i, person in enumerate(people_list):
+        searches = []
+        for person in people_list:
             name = person if isinstance(person, str) else person.name
             comp = company if company else (person.company.name if hasattr(person, 'company') else None)
+            searches.append((name, comp))
+        
+        total = len(searches)
+        
+        def search(index, name, comp):
+            logger.info(f"Batch search progress: {index + 1}/{total} - {name}")
+            try:
+                return self.search_linkedin_profile(name, comp)
+            except QuotaExceededError:
+                return []
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency)) as executor:
+            futures = [
+                executor.submit(search, index, name, comp)
+                for index, (name, comp) in enumerate(searches)
+            ]
             
-            logger.info(f"Batch search progress: {i + 1}/{len(people_list)} - {name}")
-            
-            results[name] = self.search_linkedin_profile(name, comp)
-            
-            # Extra delay between batch requests
-            if i < len(people_list) - 1:
-                time.sleep(self.delay * 1.5)
+            # Collect in input order so duplicate names resolve as before
+            results = {}
+            for (name, _), future in zip(searches, futures):
+                results[name] = future.result()
         
         return results
     
@@ -324,7 +415,9 @@ class GoogleCSEService:
         return {
             'request_count': self.request_count,
             'daily_limit': self.daily_limit,
-            'remaining_requests': max(0, self.daily_limit - self.request_count),
+            'remaining_requests': self.quota.remaining(),
+            'queries_per_second': self.rate_limiter.rate,
+            **self.cache.get_stats(),
             'using_mock_mode': not (self.api_key and self.cx)
         }
 
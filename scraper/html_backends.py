@@ -0,0 +1,282 @@
+import re
+import html
+import logging
+import soupsieve
+import lxml.html
+from bs4 import BeautifulSoup, Tag
+from cssselect import HTMLTranslator
+from lxml import etree
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TAG_RE = re.compile(r'<[^>]*>')
+
+
+def bucket_key(selector: str) -> tuple:
+    """Key of the tag name, class, id or attribute a selector's rightmost compound requires"""
+    compound = selector.split()[-1]
+    # Class and id keys are lower-cased: quirks-mode pages match them case-insensitively
+    if '#' in compound:
+        return ('id', re.split(r'[.\[:]', compound.split('#', 1)[1])[0].lower())
+    if '.' in compound:
+        return ('class', re.split(r'[.#\[:]', compound.split('.', 1)[1])[0].lower())
+    if compound.startswith('['):
+        return ('attr', re.split(r'[\]=~*^$|]', compound[1:])[0])
+    return ('tag', re.split(r'[\[:]', compound)[0].lower())
+
+
+@lru_cache(maxsize=None)
+def _start_tag_pattern(name: str) -> re.Pattern:
+    return re.compile(rf'<{re.escape(name)}(?=[\s/>])', re.IGNORECASE)
+
+
+def elements_in_prefix(elements: Iterable[Tuple[str, object]], html_content: str,
+                       limit: int) -> Iterator[Tuple[str, object]]:
+    """
+    Yield the (tag name, element) pairs whose start tag lies in the first
+    ``limit`` characters of the page, the ones a parse of just that prefix
+    would see
+
+    ``elements`` are (tag name, element) pairs in document order. A cursor
+    follows them through the raw HTML from one start tag to the next, so
+    the walk stops at the end of the prefix. Elements the parser added
+    without a tag in the source, like an implied <tbody>, are skipped.
+    """
+    cursor = 0
+    for name, element in elements:
+        match = _start_tag_pattern(name).search(html_content, cursor)
+        if match is None:
+            continue
+        if match.start() >= limit:
+            return
+        cursor = match.end()
+        yield name, element
+
+
+def markup_text(html_fragment: str) -> str:
+    """Text of raw HTML, tags dropped and whitespace collapsed"""
+    return ' '.join(html.unescape(_TAG_RE.sub(' ', html_fragment)).split())
+
+
+class SelectorIndex:
+    """
+    CSS selectors compiled once and evaluated together in a single tree walk.
+
+    Selectors are bucketed by the tag name, class, id or attribute of their
+    rightmost compound, so each element is only matched against the few
+    selectors that could apply to it.
+    """
+
+    def __init__(self, selectors: Iterable[str]):
+        self.selectors = list(dict.fromkeys(selectors))
+        self.compiled = {selector: soupsieve.compile(selector) for selector in self.selectors}
+        self.buckets: Dict[tuple, List[str]] = {}
+        for selector in self.selectors:
+            self.buckets.setdefault(bucket_key(selector), []).append(selector)
+
+    def collect(self, soup: BeautifulSoup) -> Dict[str, List[Tag]]:
+        """
+        Map every selector to its matching elements in document order,
+        exactly as ``soup.select(selector)`` would return them
+        """
+        found = {selector: [] for selector in self.selectors}
+        buckets = self.buckets
+
+        for element in soup.find_all(True):
+            keys = [('tag', element.name)]
+            keys.extend(('class', name.lower()) for name in element.get('class', ()))
+            keys.extend(('attr', name) for name in element.attrs)
+            if element.get('id'):
+                keys.append(('id', element['id'].lower()))
+
+            for key in keys:
+                for selector in buckets.get(key, ()):
+                    if self.compiled[selector].match(element) and (
+                        not found[selector] or found[selector][-1] is not element
+                    ):
+                        found[selector].append(element)
+
+        return found
+
+
+class SoupBackend:
+    """BeautifulSoup tree with soupsieve selectors"""
+
+    name = 'bs4'
+
+    def __init__(self, selectors: Iterable[str], unwanted_tags: List[str]):
+        self.index = SelectorIndex(selectors)
+        self.unwanted_tags = unwanted_tags
+
+    def parse(self, html_content: str) -> BeautifulSoup:
+        """Parse a page and drop elements whose text is never extracted"""
+        soup = BeautifulSoup(html_content, 'lxml')
+        for element in soup(self.unwanted_tags):
+            element.decompose()
+        return soup
+
+    def collect(self, soup: BeautifulSoup) -> Dict[str, List[Tag]]:
+        return self.index.collect(soup)
+
+    def elements(self, soup: BeautifulSoup) -> Iterator[Tuple[str, Tag]]:
+        """(tag name, element) for every element in document order"""
+        for element in soup.descendants:
+            if isinstance(element, Tag):
+                yield element.name, element
+
+    def text(self, element: Tag, separator: str = '') -> str:
+        return element.get_text(separator=separator, strip=True)
+
+    def body_text(self, soup: BeautifulSoup) -> str:
+        body = soup.find('body')
+        return (body or soup).get_text(separator=' ', strip=True)
+
+    def title_text(self, soup: BeautifulSoup, strip: bool = False) -> Optional[str]:
+        title = soup.find('title')
+        if not title:
+            return None
+        return title.get_text(strip=strip)
+
+    def meta_content(self, soup: BeautifulSoup, name: str) -> Optional[str]:
+        meta = soup.find('meta', {'name': name}) or soup.find('meta', {'property': name})
+        return meta.get('content') if meta else None
+
+
+class LxmlBackend:
+    """
+    Plain ``lxml.html`` tree with selectors translated to XPath once.
+
+    Elements are bucketed the same way as ``SelectorIndex`` and only the
+    candidates are tested against the precompiled XPath. Parsing, tree walks
+    and text extraction stay in libxml2, which is several times faster than
+    a BeautifulSoup tree, while returning the same elements and the same
+    text as ``SoupBackend``.
+    """
+
+    name = 'lxml'
+
+    # Elements whose strings get their own NavigableString subclass in BeautifulSoup
+    STRING_CONTAINER_TAGS = ('template', 'rt', 'rp')
+
+    def __init__(self, selectors: Iterable[str], unwanted_tags: List[str]):
+        self.selectors = list(dict.fromkeys(selectors))
+        self.matchers = {selector: self._compile(selector) for selector in self.selectors}
+        self.buckets: Dict[tuple, List[str]] = {}
+        for selector in self.selectors:
+            self.buckets.setdefault(bucket_key(selector), []).append(selector)
+        self.unwanted_tags = unwanted_tags
+
+    @staticmethod
+    def _compile(selector: str) -> etree.XPath:
+        """
+        Translate a selector into an XPath that tests a single element, so
+        candidates found by bucket key can be checked without a tree search
+        """
+        translator = HTMLTranslator()
+        compounds = selector.split()
+        # Only descendant combinators are used: every earlier compound must match an ancestor
+        path = ''
+        for compound in compounds[:-1]:
+            ancestor = translator.css_to_xpath(compound, prefix='ancestor::')
+            path = f'{ancestor}[{path}]' if path else ancestor
+        expression = translator.css_to_xpath(compounds[-1], prefix='self::')
+        if path:
+            expression = f'{expression}[{path}]'
+        return etree.XPath(expression)
+
+    def parse(self, html_content: str) -> etree._Element:
+        """Parse a page and empty elements whose text is never extracted"""
+        if not html_content.strip():
+            return lxml.html.document_fromstring('<html></html>')
+        try:
+            root = lxml.html.document_fromstring(html_content)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration must be parsed as bytes
+            root = lxml.html.document_fromstring(html_content.encode('utf-8'),
+                                                 parser=lxml.html.HTMLParser(encoding='utf-8'))
+        except etree.ParserError:
+            # Nothing but whitespace or comments
+            return lxml.html.document_fromstring('<html></html>')
+
+        # Elements are emptied rather than dropped: dropping merges the tail into
+        # the previous text node, which would glue words that BeautifulSoup keeps
+        # apart after decompose()
+        for element in list(root.iter(*self.unwanted_tags)):
+            element.clear(keep_tail=True)
+        return root
+
+    def collect(self, root: etree._Element) -> Dict[str, List[etree._Element]]:
+        """Map every selector to its matching elements in document order"""
+        found = {selector: [] for selector in self.selectors}
+        buckets = self.buckets
+
+        for element in root.iter(etree.Element):
+            attrib = element.attrib
+            keys = [('tag', element.tag)]
+            if attrib:
+                keys.extend(('class', name.lower()) for name in attrib.get('class', '').split())
+                keys.extend(('attr', name) for name in attrib)
+                if attrib.get('id'):
+                    keys.append(('id', attrib['id'].lower()))
+
+            for key in keys:
+                for selector in buckets.get(key, ()):
+                    if self.matchers[selector](element) and (
+                        not found[selector] or found[selector][-1] is not element
+                    ):
+                        found[selector].append(element)
+
+        return found
+
+    def elements(self, root: etree._Element) -> Iterator[Tuple[str, etree._Element]]:
+        """(tag name, element) for every element in document order"""
+        for element in root.iter(etree.Element):
+            yield element.tag, element
+
+    def text(self, element: etree._Element, separator: str = '') -> str:
+        return separator.join(
+            text for text in (part.strip() for part in self._strings(element)) if text
+        )
+
+    def _strings(self, element: etree._Element) -> Iterator[str]:
+        """
+        Text nodes get_text() would return: BeautifulSoup leaves out strings
+        inside <template>, <rt> and <rp> unless called on that container itself
+        """
+        own = element.tag if element.tag in self.STRING_CONTAINER_TAGS else None
+        if own is None:
+            if next(element.iterancestors(*self.STRING_CONTAINER_TAGS), None) is not None:
+                return iter(())
+            if next(element.iter(*self.STRING_CONTAINER_TAGS), None) is None:
+                # itertext() skips comments and processing instructions, like get_text()
+                return element.itertext()
+        return self._walk_strings(element, own, own)
+
+    def _walk_strings(self, element: etree._Element, container: Optional[str], own: Optional[str]) -> Iterator[str]:
+        if element.text and container == own:
+            yield element.text
+        for child in element:
+            if isinstance(child.tag, str):
+                child_container = child.tag if child.tag in self.STRING_CONTAINER_TAGS else container
+                yield from self._walk_strings(child, child_container, own)
+            if child.tail and container == own:
+                yield child.tail
+
+    def body_text(self, root: etree._Element) -> str:
+        body = root.find('body')
+        return self.text(root if body is None else body, separator=' ')
+
+    def title_text(self, root: etree._Element, strip: bool = False) -> Optional[str]:
+        title = next(root.iter('title'), None)
+        if title is None:
+            return None
+        return self.text(title) if strip else ''.join(title.itertext())
+
+    def meta_content(self, root: etree._Element, name: str) -> Optional[str]:
+        for attribute in ('name', 'property'):
+            for meta in root.iter('meta'):
+                if meta.get(attribute) == name:
+                    return meta.get('content')
+        return None
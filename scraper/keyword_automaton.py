@@ -0,0 +1,125 @@
+import logging
+from collections import deque
+from typing import Dict, Generic, Iterator, List, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same definition of a word character as the ``\\w`` class used by ``re``"""
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordAutomaton(Generic[T]):
+    """
+    Aho-Corasick automaton that finds every keyword occurrence in one scan.
+
+    Occurrences are filtered so they behave exactly like the per-keyword
+    ``\\b<keyword>\\b`` regex the matcher used before: a match must sit on a
+    word boundary at both ends, and occurrences of the same keyword never
+    overlap (leftmost first, like ``re.finditer``).
+    """
+
+    def __init__(self, entries: Sequence[Tuple[str, T]]):
+        """
+        Args:
+            entries: (pattern, payload) pairs. Patterns are matched literally
+                against already lower-cased text, so pass them lower-cased.
+        """
+        self.payloads: List[T] = []
+        self._lengths: List[int] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        for pattern, payload in entries:
+            if not pattern:
+                continue
+            self._add_pattern(pattern, len(self.payloads))
+            self.payloads.append(payload)
+            self._lengths.append(len(pattern))
+
+        self._build_failure_links()
+        logger.debug(f"Built keyword automaton: {len(self.payloads)} patterns, {len(self._goto)} states")
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def _add_pattern(self, pattern: str, index: int):
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + (index,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+                # Merge outputs reachable through the failure link so the scan
+                # never has to walk the dictionary suffix chain.
+                if self._output[self._fail[next_state]]:
+                    self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_occurrences(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield (pattern_index, start, end) for every raw occurrence in ``text``,
+        ordered by end position. No word-boundary filtering is applied.
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lengths = self._lengths
+        state = 0
+
+        for position, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                end = position + 1
+                for index in output[state]:
+                    yield index, end - lengths[index], end
+
+    def find_all(self, text: str) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        Find whole-word occurrences of every pattern in ``text``
+
+        Returns:
+            Mapping of pattern index to a list of (start, end) spans, in the
+            order ``re.finditer`` would report them.
+        """
+        spans: Dict[int, List[Tuple[int, int]]] = {}
+        last_end: Dict[int, int] = {}
+        text_length = len(text)
+
+        for index, start, end in self.iter_occurrences(text):
+            if start < last_end.get(index, 0):
+                continue
+            if not self._is_boundary(text, start, text_length) or not self._is_boundary(text, end, text_length):
+                continue
+            spans.setdefault(index, []).append((start, end))
+            last_end[index] = end
+
+        return spans
+
+    @staticmethod
+    def _is_boundary(text: str, position: int, text_length: int) -> bool:
+        """Equivalent of ``\\b`` at ``position``"""
+        before = position > 0 and _is_word_char(text[position - 1])
+        after = position < text_length and _is_word_char(text[position])
+        return before != after
@@ -137,14 +137,66 @@
 
 
 import re
+import uuid
 import logging
-from django.db import transaction
+import threading
+from django.db import connection, transaction
+from django.db.models import Q
 from django.conf import settings
+from django.core.cache import cache
 from typing import List, Dict, Optional, Tuple
 from core.models import Keyword, Match, SearchResult
+from scraper.keyword_automaton import KeywordAutomaton
 
 logger = logging.getLogger(__name__)
 
+KEYWORD_INDEX_VERSION_KEY = 'keyword_index_version'
+
+# Columns refreshed when a (search_result, keyword) match already exists
+MATCH_UPSERT_FIELDS = ['context_snippet', 'source_url', 'match_count', 'confidence_score']
+
+# Most distinct words the rematch prefilter tests, four LIKEs each; SQLite rejects
+# expressions nested deeper than 1000, and past this many the scan skips little anyway
+PREFILTER_MAX_TOKENS = 100
+
+# Sections of the searchable content, each stored field behind its label
+SEARCHABLE_SECTIONS = [
+    ('HEADLINE', 'profile_headline'),
+    ('ABOUT', 'profile_about'),
+    ('EXPERIENCE', 'profile_experience'),
+]
+
+
+def get_keyword_index_version() -> str:
+    """Return the current keyword-set version shared through the cache"""
+    version = cache.get(KEYWORD_INDEX_VERSION_KEY)
+    if version is None:
+        # add() does not overwrite, so concurrent first callers agree on one version
+        cache.add(KEYWORD_INDEX_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(KEYWORD_INDEX_VERSION_KEY)
+    return version
+
+
+def bump_keyword_index_version():
+    """Invalidate every process's compiled keyword index"""
+    # A fresh token rather than a counter, so racing bumps can never collide
+    cache.set(KEYWORD_INDEX_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+class KeywordIndex:
+    """Compiled automaton for the active keyword set at a given version"""
+    
+    def __init__(self, version: str, automaton: KeywordAutomaton):
+        self.version = version
+        self.automaton = automaton
+    
+    def __len__(self) -> int:
+        return len(self.automaton)
+
+
+_keyword_index: Optional[KeywordIndex] = None
+_keyword_index_lock = threading.Lock()
+
 
 class KeywordMatcher:
     def __init__(self, context_chars: int = 100, max_contexts_per_keyword: int = 3):
@@ -165,8 +217,8 @@ class KeywordMatcher:
         """
         logger.info(f"Finding keyword matches for: {search_result.person.name}")
         
-        keywords = Keyword.objects.filter(is_active=True)
-        if not keywords.exists():
+        automaton = self.get_keyword_index().automaton
+        if not automaton:
             logger.warning("No active keywords found for matching")
             return []
         
@@ -175,52 +227,231 @@ class KeywordMatcher:
             logger.warning(f"No content available for {search_result.person.name}")
             return []
         
-        content_lower = content.lower()
-        matches_created = []
+        matches_created = self._match_content(automaton, content, search_result)
         
         with transaction.atomic():
-            # Clear existing matches for this search result
-            deleted_count, _ = Match.objects.filter(search_result=search_result).delete()
-            if deleted_count > 0:
-                logger.debug(f"Cleared {deleted_count} existing matches")
-            
-            # Pre-compile regex patterns for performance
-            keyword_patterns = self._compile_keyword_patterns(keywords)
-            
-            for keyword, pattern in keyword_patterns:
-                occurrences = list(pattern.finditer(content_lower))
-                
-                if occurrences:
-                    match_data = self._process_keyword_matches(
-                        keyword, occurrences, content, content_lower, search_result
-                    )
-                    if match_data:
-                        match = Match.objects.create(**match_data)
-                        matches_created.append(match)
-                        logger.debug(f"Created match for '{keyword.word}': {len(occurrences)} occurrences")
+            self._write_matches(search_result, matches_created)
         
         logger.info(f"Created {len(matches_created)} matches for {search_result.person.name}")
         return matches_created
     
-    def _compile_keyword_patterns(self, keywords) -> List[Tuple[Keyword, re.Pattern]]:
-        """Pre-compile regex patterns for all keywords for better performance"""
-        patterns = []
+    def match_profile(self, search_result: SearchResult) -> List[Match]:
+        """
+        Build unsaved Match objects for a search result without writing them
+        
+        Args:
+            search_result: SearchResult (saved or not) whose content is scanned
+        
+        Returns:
+            List of unsaved Match objects
+        """
+        automaton = self.get_keyword_index().automaton
+        if not automaton:
+            return []
+        
+        content = self._build_searchable_content(search_result)
+        if not content:
+            return []
+        
+        return self._match_content(automaton, content, search_result)
+    
+    def _write_matches(self, search_result: SearchResult, matches: List[Match]):
+        """
+        Replace the stored matches of a search result with ``matches``
+        
+        Upserts on (search_result, keyword) where the database supports it, so
+        a profile costs one DELETE for stale keywords plus batched INSERTs.
+        """
+        existing = Match.objects.filter(search_result=search_result)
+        
+        if connection.features.supports_update_conflicts_with_target:
+            # Only drop matches for keywords that are no longer found
+            deleted_count, _ = existing.exclude(
+                keyword_id__in=[match.keyword_id for match in matches]
+            ).delete()
+            if matches:
+                Match.objects.bulk_create(
+                    matches,
+                    update_conflicts=True,
+                    unique_fields=['search_result', 'keyword'],
+                    update_fields=MATCH_UPSERT_FIELDS,
+                )
+        else:
+            deleted_count, _ = existing.delete()
+            if matches:
+                Match.objects.bulk_create(matches)
+        
+        if deleted_count > 0:
+            logger.debug(f"Cleared {deleted_count} stale matches")
+    
+    def _match_content(self, automaton: KeywordAutomaton, content: str,
+                       search_result: SearchResult) -> List[Match]:
+        """Build unsaved Match objects for every keyword of ``automaton`` found in ``content``"""
+        content_lower = content.lower()
+        matches = []
+        
+        # Single pass over the content for all keywords at once
+        for keyword, occurrences in self._scan(automaton, content_lower):
+            match_data = self._process_keyword_matches(
+                keyword, occurrences, content, content_lower, search_result
+            )
+            if match_data:
+                matches.append(Match(**match_data))
+                logger.debug(f"Matched '{keyword.word}': {len(occurrences)} occurrences")
+        
+        return matches
+    
+    def rematch_keywords(self, keywords: List[Keyword], batch_size: int = 500,
+                         prefilter: bool = True) -> Dict:
+        """
+        Bring stored matches up to date for a set of new or changed keywords
+        
+        Only ``keywords`` are scanned for, and only their Match rows are
+        added, refreshed or removed; matches for every other keyword are left
+        untouched. Inactive keywords simply lose their matches.
+        
+        Args:
+            keywords: Keyword objects that were added or changed
+            batch_size: Number of search results processed per transaction
+            prefilter: Let the database skip profiles that cannot contain any
+                of the keywords before they are loaded and scanned
+        
+        Returns:
+            Dictionary with scanned/matched/removed counters
+        """
+        stats = {'keywords': len(keywords), 'scanned': 0, 'matches': 0, 'deleted': 0}
+        
+        active = [keyword for keyword in keywords if keyword.is_active]
+        automaton = self._build_automaton(active)
+        
+        # Inactive keywords, and ones too short to ever match, only lose their matches
+        scanned_ids = [keyword.id for keyword in automaton.payloads]
+        dropped_ids = list({keyword.id for keyword in keywords} - set(scanned_ids))
+        if dropped_ids:
+            stats['deleted'] += Match.objects.filter(keyword_id__in=dropped_ids).delete()[0]
+        if not scanned_ids:
+            return stats
+        
+        search_results = SearchResult.objects.filter(status='completed').select_related('person').only(
+            'id', 'source_url', 'profile_headline', 'profile_about',
+            'profile_experience', 'profile_content', 'person__name', 'person__linkedin_url',
+        ).order_by('id')
+        
+        prefilter_query = self._prefilter_query(automaton) if prefilter else None
+        if prefilter_query is not None:
+            search_results = search_results.filter(prefilter_query)
+            # Profiles the prefilter skips cannot contain these keywords any more
+            stats['deleted'] += Match.objects.filter(
+                keyword_id__in=scanned_ids, search_result__status='completed'
+            ).exclude(self._prefilter_query(automaton, prefix='search_result__')).delete()[0]
+        
+        batch = []
+        for search_result in search_results.iterator(chunk_size=batch_size):
+            batch.append(search_result)
+            if len(batch) >= batch_size:
+                self._rematch_batch(automaton, scanned_ids, batch, stats)
+                batch = []
+        if batch:
+            self._rematch_batch(automaton, scanned_ids, batch, stats)
+        
+        logger.info(
+            f"Rematched {len(keywords)} keywords over {stats['scanned']} profiles: "
+            f"{stats['matches']} matches written, {stats['deleted']} rows deleted"
+        )
+        return stats
+    
+    def _rematch_batch(self, automaton: KeywordAutomaton, keyword_ids: List[int],
+                       search_results: List[SearchResult], stats: Dict):
+        """Replace the matches of ``keyword_ids`` for one batch of search results"""
+        matches = []
+        for search_result in search_results:
+            content = self._build_searchable_content(search_result)
+            if content:
+                matches.extend(self._match_content(automaton, content, search_result))
+        
+        with transaction.atomic():
+            deleted_count, _ = Match.objects.filter(
+                search_result_id__in=[search_result.id for search_result in search_results],
+                keyword_id__in=keyword_ids,
+            ).delete()
+            Match.objects.bulk_create(matches)
+        
+        stats['scanned'] += len(search_results)
+        stats['matches'] += len(matches)
+        stats['deleted'] += deleted_count
+    
+    def _prefilter_query(self, automaton: KeywordAutomaton, prefix: str = '') -> Optional[Q]:
+        """
+        Build a Q that keeps only profiles containing a required word of at
+        least one keyword, or None when no safe prefilter exists
+        """
+        fields = [field for _, field in SEARCHABLE_SECTIONS] + ['profile_content']
+        label_words = {label.lower() for label, _ in SEARCHABLE_SECTIONS}
+        required = set()
+        
+        for keyword in automaton.payloads:
+            # Content cleaning only ever inserts spaces, so every word of a
+            # matching keyword is present verbatim in the stored fields, except
+            # the section labels the searchable content adds. Label words are
+            # skipped, as are non-ASCII words because SQLite LIKE only folds ASCII case.
+            tokens = [
+                token for token in re.findall(r'\w+', keyword.word)
+                if token.isascii() and token.lower() not in label_words
+            ]
+            if not tokens:
+                return None
+            required.add(max(tokens, key=len).lower())
+        
+        if len(required) > PREFILTER_MAX_TOKENS:
+            return None
+        query = Q()
+        for token in sorted(required):
+            for field in fields:
+                query |= Q(**{f'{prefix}{field}__icontains': token})
+        return query
+    
+    def get_keyword_index(self) -> KeywordIndex:
+        """
+        Return the process-wide compiled index of active keywords,
+        rebuilding it only when the keyword-set version has changed
+        """
+        global _keyword_index
+        
+        version = get_keyword_index_version()
+        index = _keyword_index
+        if index is not None and index.version == version:
+            return index
+        
+        with _keyword_index_lock:
+            index = _keyword_index
+            if index is None or index.version != version:
+                keywords = list(Keyword.objects.filter(is_active=True))
+                index = KeywordIndex(version, self._build_automaton(keywords))
+                _keyword_index = index
+                logger.info(f"Compiled keyword index with {len(index)} keywords (version {version[:8]})")
+        
+        return index
+    
+    def _build_automaton(self, keywords) -> KeywordAutomaton:
+        """Build a single multi-keyword automaton for all matchable keywords"""
+        entries = []
         for keyword in keywords:
             # Skip very short keywords to avoid false positives
             if len(keyword.word.strip()) < self.min_word_length:
                 continue
-                
-            try:
-                # Create a pattern that matches whole words, case insensitive
-                pattern = re.compile(r'\b' + re.escape(keyword.word.lower()) + r'\b', re.IGNORECASE)
-                patterns.append((keyword, pattern))
-            except re.error as e:
-                logger.error(f"Invalid regex pattern for keyword '{keyword.word}': {e}")
-                continue
+            entries.append((keyword.word.lower(), keyword))
         
-        return patterns
+        return KeywordAutomaton(entries)
+    
+    def _scan(self, automaton: KeywordAutomaton, content_lower: str) -> List[Tuple[Keyword, List[Tuple[int, int]]]]:
+        """Return (keyword, occurrence spans) for every keyword found in the content"""
+        spans_by_index = automaton.find_all(content_lower)
+        return [
+            (automaton.payloads[index], spans_by_index[index])
+            for index in sorted(spans_by_index)
+        ]
     
-    def _process_keyword_matches(self, keyword: Keyword, occurrences: List, 
+    def _process_keyword_matches(self, keyword: Keyword, occurrences: List[Tuple[int, int]], 
                                content: str, content_lower: str, 
                                search_result: SearchResult) -> Optional[Dict]:
         """Process matches for a single keyword and prepare match data"""
@@ -229,8 +460,8 @@ class KeywordMatcher:
         
         # Extract context snippets
         contexts = []
-        for i, occurrence in enumerate(occurrences[:self.max_contexts_per_keyword]):
-            context = self._extract_context(content, occurrence.start(), occurrence.end())
+        for start, end in occurrences[:self.max_contexts_per_keyword]:
+            context = self._extract_context(content, start, end)
             if context:
                 contexts.append(context)
         
@@ -277,11 +508,7 @@ class KeywordMatcher:
         content_parts = []
         
         # Add content with section markers for better context
-        sections = [
-            ('HEADLINE', search_result.profile_headline),
-            ('ABOUT', search_result.profile_about),
-            ('EXPERIENCE', search_result.profile_experience),
-        ]
+        sections = [(label, getattr(search_result, field)) for label, field in SEARCHABLE_SECTIONS]
         
         for section_name, section_content in sections:
             if section_content and section_content.strip():
@@ -378,29 +605,23 @@ class KeywordMatcher:
         if not content:
             return {}
         
-        keywords = Keyword.objects.filter(is_active=True)
         content_lower = content.lower()
         
         results = {}
-        keyword_patterns = self._compile_keyword_patterns(keywords)
+        automaton = self.get_keyword_index().automaton
         
-        for keyword, pattern in keyword_patterns:
-            matches = pattern.findall(content_lower)
+        for keyword, occurrences in self._scan(automaton, content_lower):
+            # Extract sample context
+            start, end = occurrences[0]
+            context = self._extract_context(content, start, end)
             
-            if matches:
-                # Extract sample context
-                first_match = pattern.search(content_lower)
-                context = ""
-                if first_match:
-                    context = self._extract_context(content, first_match.start(), first_match.end())
-                
-                results[keyword.word] = {
-                    'count': len(matches),
-                    'category': keyword.category,
-                    'category_display': keyword.get_category_display(),
-                    'context': context[:200] + '...' if len(context) > 200 else context,
-                    'is_active': keyword.is_active
-                }
+            results[keyword.word] = {
+                'count': len(occurrences),
+                'category': keyword.category,
+                'category_display': keyword.get_category_display(),
+                'context': context[:200] + '...' if len(context) > 200 else context,
+                'is_active': keyword.is_active
+            }
         
         return results
     
@@ -194,14 +194,19 @@
 
 
 import time
+import asyncio
+import httpx
 import requests
 import logging
-from bs4 import BeautifulSoup
+from concurrent.futures import Executor, ThreadPoolExecutor
 from django.conf import settings
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 import random
 
+from .html_backends import LxmlBackend, SoupBackend, elements_in_prefix, markup_text
+from .page_archive import page_archive
+
 logger = logging.getLogger(__name__)
 
 
@@ -279,12 +284,67 @@ class LinkedInParser:
         ]
     }
     
-    def __init__(self):
+    AUTH_WALL_TITLE_INDICATORS = ['login', 'sign in', 'sign up', 'join linkedin']
+    
+    # Login form elements that only appear on auth walls
+    LOGIN_SELECTORS = [
+        'input[type="password"]',
+        'form[action*="login"]',
+        '.login-form',
+        '#username',
+        '#password',
+    ]
+    
+    # Characters at the start of a page that auth-wall markup is looked for in
+    AUTH_WALL_SCAN_CHARS = 10000
+    
+    RESTRICTED_TEXTS = [
+        'see more by signing in',
+        'join now to see',
+        'sign up to view',
+        'this profile is not available',
+    ]
+    
+    # Main content areas, most specific first
+    MAIN_SELECTORS = [
+        'main',
+        '.core-rail',
+        '.scaffold-layout__main',
+        '.pv-profile-section',
+        'body'
+    ]
+    
+    UNWANTED_TAGS = ["script", "style", "noscript", "meta", "link"]
+    
+    # Every selector above, compiled once at class load for each tree backend
+    _all_selectors = (
+        [selector for selectors in SELECTORS.values() for selector in selectors]
+        + LOGIN_SELECTORS + MAIN_SELECTORS
+    )
+    _backends = {
+        backend.name: backend
+        for backend in (SoupBackend(_all_selectors, UNWANTED_TAGS), LxmlBackend(_all_selectors, UNWANTED_TAGS))
+    }
+    
+    def __init__(self, backend: Optional[str] = None):
         self.delay = getattr(settings, 'SCRAPING_DELAY', 2.0)
         self.max_retries = getattr(settings, 'LINKEDIN_MAX_RETRIES', 2)
         self.timeout = getattr(settings, 'LINKEDIN_TIMEOUT', 30)
         self.max_content_length = getattr(settings, 'MAX_CONTENT_LENGTH', 15000)
         
+        # Async batch fetching: in-flight requests per host and pooled connections overall
+        self.max_per_host = getattr(settings, 'LINKEDIN_MAX_CONCURRENCY_PER_HOST', 2)
+        self.max_connections = getattr(settings, 'LINKEDIN_MAX_CONNECTIONS', 20)
+        
+        # 'bs4' (BeautifulSoup + soupsieve) or 'lxml' (lxml.html + precompiled XPath)
+        backend = backend or getattr(settings, 'LINKEDIN_PARSER_BACKEND', 'bs4')
+        if backend not in self._backends:
+            raise ValueError(f"Unknown parser backend '{backend}', expected one of: {', '.join(self._backends)}")
+        self.backend = self._backends[backend]
+        
+        # Keep raw pages so they can be re-parsed offline (see reparse_archive)
+        self.archive_pages = getattr(settings, 'LINKEDIN_ARCHIVE_PAGES', True)
+        
         # Session for connection reuse
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
@@ -307,8 +367,32 @@ class LinkedInParser:
         Returns:
             Dictionary with profile data or error information
         """
+        page = self.fetch_page(linkedin_url)
+        if page['error']:
+            return self._empty_profile(error=page['error'], url=linkedin_url)
+        
+        # Auth-wall detection and extraction share a single parse
+        profile_data = self.parse_html(page['html'], page['final_url'], linkedin_url)
+        if profile_data['auth_wall']:
+            logger.warning(f"Auth wall detected for: {linkedin_url}")
+            return profile_data
+        
+        logger.info(f"Successfully scraped profile: {linkedin_url}")
+        return profile_data
+    
+    def fetch_page(self, linkedin_url: str) -> Dict:
+        """
+        Download and archive a profile page without parsing it
+        
+        Args:
+            linkedin_url: LinkedIn profile URL
+        
+        Returns:
+            Dictionary with html, final_url, status_code, sha256 (None if the
+            page was not archived) and error (None on success)
+        """
         if not linkedin_url or not self._is_valid_linkedin_url(linkedin_url):
-            return self._empty_profile(error='Invalid LinkedIn URL')
+            return self._failed_fetch('Invalid LinkedIn URL')
         
         logger.info(f"Scraping LinkedIn profile: {linkedin_url}")
         
@@ -328,10 +412,7 @@ class LinkedInParser:
                 )
                 
                 if response.status_code == 404:
-                    return self._empty_profile(
-                        error='Profile not found (404)', 
-                        url=linkedin_url
-                    )
+                    return self._failed_fetch('Profile not found (404)')
                 
                 if response.status_code == 429:
                     logger.warning(f"Rate limited on attempt {attempt + 1}")
@@ -339,70 +420,63 @@ class LinkedInParser:
                         time.sleep(10)  # Longer wait for rate limiting
                         continue
                     else:
-                        return self._empty_profile(
-                            error='Rate limited - too many requests', 
-                            url=linkedin_url
-                        )
+                        return self._failed_fetch('Rate limited - too many requests')
                 
                 response.raise_for_status()
+                # An auth wall is not worth keeping: re-parsing it could only fail again
+                sha256 = None
+                if not self._is_auth_wall_response(response.text, response.url):
+                    sha256 = self._archive_page(linkedin_url, response.url, response.text, response.status_code)
                 
-                # Check for authentication wall
-                if self._is_auth_wall(response.text, response.url):
-                    logger.warning(f"Auth wall detected for: {linkedin_url}")
-                    return self._empty_profile(
-                        error='LinkedIn requires authentication',
-                        auth_wall=True,
-                        url=linkedin_url
-                    )
-                
-                # Parse successful response
-                profile_data = self._parse_html(response.text, linkedin_url)
-                logger.info(f"Successfully scraped profile: {linkedin_url}")
-                return profile_data
+                return {
+                    'html': response.text,
+                    'final_url': response.url,
+                    'status_code': response.status_code,
+                    'sha256': sha256,
+                    'error': None,
+                }
                 
             except requests.exceptions.Timeout:
                 logger.warning(f"Timeout on attempt {attempt + 1} for {linkedin_url}")
                 if attempt == self.max_retries - 1:
-                    return self._empty_profile(
-                        error='Request timed out', 
-                        url=linkedin_url
-                    )
+                    return self._failed_fetch('Request timed out')
                     
             except requests.exceptions.ConnectionError as e:
                 logger.error(f"Connection error for {linkedin_url}: {e}")
                 if attempt == self.max_retries - 1:
-                    return self._empty_profile(
-                        error=f'Connection error: {str(e)}', 
-                        url=linkedin_url
-                    )
+                    return self._failed_fetch(f'Connection error: {str(e)}')
                     
             except requests.exceptions.HTTPError as e:
                 status_code = e.response.status_code if e.response else 'unknown'
                 logger.error(f"HTTP error {status_code} for {linkedin_url}: {e}")
                 if attempt == self.max_retries - 1:
                     if status_code == 403:
-                        return self._empty_profile(
-                            error='Access forbidden (403) - profile may be private', 
-                            url=linkedin_url
-                        )
-                    return self._empty_profile(
-                        error=f'HTTP error {status_code}', 
-                        url=linkedin_url
-                    )
+                        return self._failed_fetch('Access forbidden (403) - profile may be private')
+                    return self._failed_fetch(f'HTTP error {status_code}')
                     
             except Exception as e:
                 logger.error(f"Unexpected error scraping {linkedin_url}: {e}")
                 if attempt == self.max_retries - 1:
-                    return self._empty_profile(
-                        error=f'Unexpected error: {str(e)}', 
-                        url=linkedin_url
-                    )
+                    return self._failed_fetch(f'Unexpected error: {str(e)}')
             
             # Exponential backoff for retries
             if attempt < self.max_retries - 1:
                 time.sleep(2 ** attempt)
         
-        return self._empty_profile(error='Max retries exceeded', url=linkedin_url)
+        return self._failed_fetch('Max retries exceeded')
+    
+    def _failed_fetch(self, error: str) -> Dict:
+        return {'html': '', 'final_url': '', 'status_code': None, 'sha256': None, 'error': error}
+    
+    def _archive_page(self, url: str, final_url: str, html_content: str, status_code: int) -> Optional[str]:
+        """Store the raw page and return its hash; archive failures never fail the scrape"""
+        if not self.archive_pages:
+            return None
+        try:
+            return page_archive.store(url, final_url, html_content, status_code).sha256
+        except Exception as e:
+            logger.error(f"Failed to archive page for {url}: {e}")
+            return None
     
     def _is_valid_linkedin_url(self, url: str) -> bool:
         """Validate that URL is a LinkedIn profile URL"""
@@ -413,10 +487,40 @@ class LinkedInParser:
         except Exception:
             return False
     
-    def _is_auth_wall(self, html_content: str, final_url: str) -> bool:
-        """Detect if LinkedIn is showing an authentication wall"""
-        html_lower = html_content.lower()
+    def parse_html(self, html_content: str, final_url: str, url: str) -> Dict:
+        """
+        Parse a fetched profile page once and run auth-wall detection and
+        every section extractor against that same tree
+        
+        Args:
+            html_content: Raw HTML of the response
+            final_url: URL after redirects, checked for login redirects
+            url: Profile URL the data is reported under
+        
+        Returns:
+            Dictionary with profile data, or an auth-wall error profile
+        """
+        # Cheap string checks first so auth walls are never parsed at all
+        if self._is_auth_wall_response(html_content, final_url):
+            return self._auth_wall_profile(url)
+        
+        tree = self.backend.parse(html_content)
+        
+        # Every selector is evaluated once against the tree
+        found = self.backend.collect(tree)
+        
+        # Body text is extracted once and shared by auth-wall detection and full content
+        body_text = self.backend.body_text(tree)
+        
+        if self._is_auth_wall_page(tree, found, body_text, html_content):
+            return self._auth_wall_profile(url)
+        
+        return self._parse_tree(tree, found, body_text, url)
+    
+    def _is_auth_wall_response(self, html_content: str, final_url: str) -> bool:
+        """Detect auth walls from the final URL and the start of the raw HTML"""
         url_lower = final_url.lower()
+        html_head = html_content[:5000].lower()
         
         # Check URL for auth indicators
         for indicator in self.AUTH_WALL_INDICATORS:
@@ -425,54 +529,45 @@ class LinkedInParser:
         
         # Check HTML content for auth indicators
         for indicator in self.AUTH_WALL_INDICATORS:
-            if indicator in html_lower[:5000]:
+            if indicator in html_head:
                 return True
         
-        # Parse HTML for additional checks
-        soup = BeautifulSoup(html_content[:10000], 'lxml')
+        return False
+    
+    def _is_auth_wall_page(self, tree, found: Dict[str, list], body_text: str, html_content: str) -> bool:
+        """
+        Detect auth walls from the already parsed page
         
-        # Check page title
-        title = soup.find('title')
-        if title:
-            title_text = title.get_text().lower()
-            auth_indicators = ['login', 'sign in', 'sign up', 'join linkedin']
-            if any(indicator in title_text for indicator in auth_indicators):
+        Only what starts in the first AUTH_WALL_SCAN_CHARS characters counts:
+        public profiles carry sign-in modals and "join now to see" prompts
+        further down the page.
+        """
+        title_text = self.backend.title_text(tree)
+        auth_title = title_text is not None and any(
+            indicator in title_text.lower() for indicator in self.AUTH_WALL_TITLE_INDICATORS
+        )
+        # The first match of a selector is its earliest in the page
+        login_elements = [found[selector][0] for selector in self.LOGIN_SELECTORS if found[selector]]
+        
+        # Check page title and login form elements
+        if auth_title or login_elements:
+            prefix = list(elements_in_prefix(self.backend.elements(tree), html_content, self.AUTH_WALL_SCAN_CHARS))
+            # The title read above is the page's first, so it is in the prefix if any title is
+            if auth_title and any(name == 'title' for name, _ in prefix):
                 return True
-        
-        # Check for login form elements
-        login_selectors = [
-            'input[type="password"]',
-            'form[action*="login"]',
-            '.login-form',
-            '#username',
-            '#password',
-        ]
-        for selector in login_selectors:
-            if soup.select_one(selector):
+            prefix_ids = {id(element) for _, element in prefix}
+            if any(id(element) in prefix_ids for element in login_elements):
                 return True
         
         # Check for restricted content messages
-        restricted_texts = [
-            'see more by signing in',
-            'join now to see',
-            'sign up to view',
-            'this profile is not available',
-        ]
-        body_text = soup.get_text().lower()
-        for text in restricted_texts:
-            if text in body_text:
-                return True
-        
-        return False
+        text_lower = body_text.lower()
+        if not any(text in text_lower for text in self.RESTRICTED_TEXTS):
+            return False
+        prefix_text = markup_text(html_content[:self.AUTH_WALL_SCAN_CHARS]).lower()
+        return any(text in prefix_text for text in self.RESTRICTED_TEXTS)
     
-    def _parse_html(self, html_content: str, url: str) -> Dict:
-        """Parse LinkedIn profile HTML and extract structured data"""
-        soup = BeautifulSoup(html_content, 'lxml')
-        
-        # Remove unwanted elements
-        for element in soup(["script", "style", "noscript", "meta", "link"]):
-            element.decompose()
-        
+    def _parse_tree(self, tree, found: Dict[str, list], body_text: str, url: str) -> Dict:
+        """Extract structured profile data from a parsed page"""
         profile_data = {
             'headline': '',
             'about': '',
@@ -487,22 +582,18 @@ class LinkedInParser:
         }
         
         # Extract headline
-        profile_data['headline'] = self._extract_headline(soup)
+        profile_data['headline'] = self._extract_headline(tree, found)
         
         # Extract about section
-        profile_data['about'] = self._extract_about(soup)
-        
-        # Extract experience
-        profile_data['experience'] = self._extract_experience(soup)
+        profile_data['about'] = self._extract_about(tree, found)
         
-        # Extract education
-        profile_data['education'] = self._extract_education(soup)
-        
-        # Extract skills
-        profile_data['skills'] = self._extract_skills(soup)
+        # Extract experience, education and skills
+        profile_data['experience'] = self._extract_section(found, 'experience', 30, 1500, 5000)
+        profile_data['education'] = self._extract_section(found, 'education', 20, 1000, 2000)
+        profile_data['skills'] = self._extract_section(found, 'skills', 10, 500, 1000)
         
         # Extract full content (cleaned)
-        profile_data['full_content'] = self._extract_full_content(soup)
+        profile_data['full_content'] = self._extract_full_content(found, body_text)
         
         # Determine content quality
         profile_data['content_quality'] = self._assess_content_quality(profile_data)
@@ -517,104 +608,78 @@ class LinkedInParser:
         
         return profile_data
     
-    def _extract_headline(self, soup: BeautifulSoup) -> str:
+    def _extract_headline(self, tree, found: Dict[str, list]) -> str:
         """Extract profile headline"""
         for selector in self.SELECTORS['headline']:
-            element = soup.select_one(selector)
-            if element:
-                text = element.get_text(strip=True)
+            if found[selector]:
+                text = self.backend.text(found[selector][0])
                 if text and len(text) > 5:
                     return text[:500]
         
         # Fallback: try to extract from title tag
-        title = soup.find('title')
-        if title:
-            title_text = title.get_text(strip=True)
+        title_text = self.backend.title_text(tree, strip=True)
+        if title_text is not None:
             if ' | ' in title_text:
                 return title_text.split(' | ')[0].strip()[:500]
         
         return ""
     
-    def _extract_about(self, soup: BeautifulSoup) -> str:
+    def _extract_about(self, tree, found: Dict[str, list]) -> str:
         """Extract about/summary section"""
         for selector in self.SELECTORS['about']:
-            element = soup.select_one(selector)
-            if element:
-                text = element.get_text(separator=' ', strip=True)
+            if found[selector]:
+                text = self.backend.text(found[selector][0], separator=' ')
                 if text and len(text) > 20:
                     return text[:2000]
         
         # Check meta descriptions
         for meta_name in ['description', 'og:description']:
-            meta = soup.find('meta', {'name': meta_name}) or soup.find('meta', {'property': meta_name})
-            if meta and meta.get('content'):
-                content = meta.get('content', '').strip()
+            content = self.backend.meta_content(tree, meta_name)
+            if content:
+                content = content.strip()
                 if content and len(content) > 20:
                     return content[:2000]
         
         return ""
     
-    def _extract_experience(self, soup: BeautifulSoup) -> str:
-        """Extract experience section"""
-        experience_parts = []
-        
-        for selector in self.SELECTORS['experience']:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(separator=' ', strip=True)
-                if text and len(text) > 30:  # More than just a title
-                    experience_parts.append(text[:1500])
-        
-        return ' | '.join(experience_parts)[:5000]
-    
-    def _extract_education(self, soup: BeautifulSoup) -> str:
-        """Extract education section"""
-        education_parts = []
-        
-        for selector in self.SELECTORS['education']:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(separator=' ', strip=True)
-                if text and len(text) > 20:
-                    education_parts.append(text[:1000])
-        
-        return ' | '.join(education_parts)[:2000]
-    
-    def _extract_skills(self, soup: BeautifulSoup) -> str:
-        """Extract skills section"""
-        skills_parts = []
-        
-        for selector in self.SELECTORS['skills']:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(separator=' ', strip=True)
-                if text and len(text) > 10:
-                    skills_parts.append(text[:500])
-        
-        return ' | '.join(skills_parts)[:1000]
+    def _extract_section(self, found: Dict[str, list], section: str,
+                         min_length: int, part_length: int, max_length: int) -> str:
+        """Extract a repeated section (experience, education, skills)"""
+        parts = []
+        
+        for selector in self.SELECTORS[section]:
+            for element in found[selector]:
+                text = self.backend.text(element, separator=' ')
+                if text and len(text) > min_length:
+                    parts.append(text[:part_length])
+        
+        return ' | '.join(parts)[:max_length]
     
-    def _extract_full_content(self, soup: BeautifulSoup) -> str:
+    def _extract_full_content(self, found: Dict[str, list], body_text: str) -> str:
         """Extract and clean full page content"""
         # Try main content areas first
-        main_selectors = [
-            'main',
-            '.core-rail',
-            '.scaffold-layout__main',
-            '.pv-profile-section',
-            'body'
-        ]
-        
-        for selector in main_selectors:
-            element = soup.select_one(selector)
-            if element:
-                text = element.get_text(separator=' ', strip=True)
-                if text and len(text) > 100:
-                    # Clean and normalize text
-                    text = ' '.join(text.split())
-                    return text[:self.max_content_length]
+        for selector in self.MAIN_SELECTORS:
+            if not found[selector]:
+                continue
+            # The body text was already extracted for auth-wall detection
+            if selector == 'body':
+                text = body_text
+            else:
+                text = self.backend.text(found[selector][0], separator=' ')
+            if text and len(text) > 100:
+                # Clean and normalize text
+                text = ' '.join(text.split())
+                return text[:self.max_content_length]
         
         return ""
     
+    def _auth_wall_profile(self, url: str) -> Dict:
+        return self._empty_profile(
+            error='LinkedIn requires authentication',
+            auth_wall=True,
+            url=url
+        )
+    
     def _assess_content_quality(self, profile_data: Dict) -> str:
         """Assess the quality of extracted content"""
         content_length = len(profile_data['full_content'])
@@ -667,6 +732,187 @@ class LinkedInParser:
         logger.info(f"Batch scrape completed: {success_count}/{total} successful, {auth_wall_count} auth walls")
         
         return results
+    
+    async def scrape_batch_async(self, urls: List[str], executor: Optional[Executor] = None) -> Dict[str, Dict]:
+        """
+        Scrape multiple LinkedIn profiles concurrently
+        
+        Requests share one pooled keep-alive client. Each host gets its own
+        concurrency limit and politeness delay, so waiting on one host never
+        holds back another. Parsing runs in ``executor`` (a thread pool by
+        default; a process pool also works) so the event loop never blocks.
+        
+        Args:
+            urls: LinkedIn profile URLs
+            executor: Pool for HTML parsing; created for this batch if omitted
+        
+        Returns:
+            Dictionary of URL to the same profile dicts as scrape_profile
+        """
+        total = len(urls)
+        logger.info(f"Starting async batch scrape of {total} profiles")
+        
+        hosts: Dict[str, _HostSlots] = {}
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=getattr(settings, 'LINKEDIN_PARSE_WORKERS', None))
+        
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+        try:
+            async with httpx.AsyncClient(
+                headers=self.HEADERS,
+                timeout=self.timeout,
+                limits=limits,
+                follow_redirects=True,
+            ) as client:
+                profiles = await asyncio.gather(*(
+                    self._scrape_profile_async(client, url, hosts, executor) for url in urls
+                ))
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False)
+        
+        results = dict(zip(urls, profiles))
+        
+        success_count = sum(1 for r in results.values() if not r.get('error'))
+        auth_wall_count = sum(1 for r in results.values() if r.get('auth_wall'))
+        logger.info(f"Async batch scrape completed: {success_count}/{total} successful, {auth_wall_count} auth walls")
+        
+        return results
+    
+    async def _scrape_profile_async(self, client: 'httpx.AsyncClient', linkedin_url: str,
+                                    hosts: Dict[str, '_HostSlots'], executor: Executor) -> Dict:
+        """Async counterpart of scrape_profile, with the same retries and error profiles"""
+        if not linkedin_url or not self._is_valid_linkedin_url(linkedin_url):
+            return self._empty_profile(error='Invalid LinkedIn URL')
+        
+        host = urlparse(linkedin_url).netloc.lower()
+        slots = hosts.get(host)
+        if slots is None:
+            slots = hosts[host] = _HostSlots(self.max_per_host)
+        
+        for attempt in range(self.max_retries):
+            try:
+                async with slots.semaphore:
+                    await slots.wait_turn(self.delay + random.uniform(0.5, 2.0))
+                    logger.info(f"Scraping LinkedIn profile: {linkedin_url}")
+                    response = await client.get(
+                        linkedin_url,
+                        headers={'User-Agent': random.choice(self.user_agents)},
+                    )
+                
+                if response.status_code == 404:
+                    return self._empty_profile(
+                        error='Profile not found (404)', 
+                        url=linkedin_url
+                    )
+                
+                if response.status_code == 429:
+                    logger.warning(f"Rate limited on attempt {attempt + 1}")
+                    if attempt < self.max_retries - 1:
+                        await asyncio.sleep(10)  # Longer wait for rate limiting
+                        continue
+                    else:
+                        return self._empty_profile(
+                            error='Rate limited - too many requests', 
+                            url=linkedin_url
+                        )
+                
+                response.raise_for_status()
+                # As in fetch_page, an auth wall is not archived: re-parsing it could only fail again.
+                # The archive writes files and an index row, so keep it off the event loop
+                if not self._is_auth_wall_response(response.text, str(response.url)):
+                    await asyncio.to_thread(
+                        self._archive_page, linkedin_url, str(response.url), response.text, response.status_code
+                    )
+                
+                loop = asyncio.get_running_loop()
+                profile_data = await loop.run_in_executor(
+                    executor, parse_profile_page,
+                    response.text, str(response.url), linkedin_url, self.backend.name,
+                )
+                if profile_data['auth_wall']:
+                    logger.warning(f"Auth wall detected for: {linkedin_url}")
+                    return profile_data
+                
+                logger.info(f"Successfully scraped profile: {linkedin_url}")
+                return profile_data
+                
+            except httpx.TimeoutException:
+                logger.warning(f"Timeout on attempt {attempt + 1} for {linkedin_url}")
+                if attempt == self.max_retries - 1:
+                    return self._empty_profile(
+                        error='Request timed out', 
+                        url=linkedin_url
+                    )
+                    
+            except httpx.TransportError as e:
+                logger.error(f"Connection error for {linkedin_url}: {e}")
+                if attempt == self.max_retries - 1:
+                    return self._empty_profile(
+                        error=f'Connection error: {str(e)}', 
+                        url=linkedin_url
+                    )
+                    
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                logger.error(f"HTTP error {status_code} for {linkedin_url}: {e}")
+                if attempt == self.max_retries - 1:
+                    if status_code == 403:
+                        return self._empty_profile(
+                            error='Access forbidden (403) - profile may be private', 
+                            url=linkedin_url
+                        )
+                    return self._empty_profile(
+                        error=f'HTTP error {status_code}', 
+                        url=linkedin_url
+                    )
+                    
+            except Exception as e:
+                logger.error(f"Unexpected error scraping {linkedin_url}: {e}")
+                if attempt == self.max_retries - 1:
+                    return self._empty_profile(
+                        error=f'Unexpected error: {str(e)}', 
+                        url=linkedin_url
+                    )
+            
+            # Exponential backoff for retries
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(2 ** attempt)
+        
+        return self._empty_profile(error='Max retries exceeded', url=linkedin_url)
+
+
+class _HostSlots:
+    """Concurrency limit and politeness spacing for requests to one host"""
+    
+    def __init__(self, max_concurrency: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+    
+    async def wait_turn(self, delay: float):
+        """Wait until this host's next request slot; slots are ``delay`` seconds apart"""
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start)
+            self._next_start = start + delay
+        await asyncio.sleep(start - now)
+
+
+# Parsers per backend for parse_profile_page, created lazily in each worker
+_page_parsers: Dict[str, LinkedInParser] = {}
+
+
+def parse_profile_page(html_content: str, final_url: str, url: str, backend: str) -> Dict:
+    """Parse a fetched profile page; a module-level function so process pools can run it"""
+    parser = _page_parsers.get(backend)
+    if parser is None:
+        parser = _page_parsers[backend] = LinkedInParser(backend=backend)
+    return parser.parse_html(html_content, final_url, url)
 
 
 # Global instance for reuse
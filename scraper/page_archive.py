@@ -0,0 +1,89 @@
+import os
+import zlib
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PageArchive:
+    """
+    Content-addressed store of raw fetched HTML.
+
+    Each distinct page body is written once, zlib-compressed, to
+    ``<root>/<aa>/<bb>/<sha256>.html.z``; the RawPage table maps every fetch
+    (URL, final URL, fetched_at) to its hash. Identical pages fetched again
+    only add an index row.
+    """
+
+    SUFFIX = '.html.z'
+
+    def __init__(self, root: Optional[str] = None, level: Optional[int] = None):
+        self.root = Path(root or getattr(settings, 'ARCHIVE_ROOT', Path(settings.BASE_DIR) / 'archive'))
+        self.level = level if level is not None else getattr(settings, 'ARCHIVE_COMPRESSION_LEVEL', 6)
+
+    def path_for(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256[2:4] / f'{sha256}{self.SUFFIX}'
+
+    def put(self, html_content: str) -> Tuple[str, int]:
+        """
+        Store a page body unless it is already archived
+
+        Returns:
+            (sha256, uncompressed size in bytes)
+        """
+        data = html_content.encode('utf-8')
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.path_for(sha256)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial blob
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(zlib.compress(data, self.level))
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+        return sha256, len(data)
+
+    def get(self, sha256: str) -> str:
+        """Return the archived page body for a hash"""
+        with open(self.path_for(sha256), 'rb') as f:
+            return zlib.decompress(f.read()).decode('utf-8')
+
+    def store(self, url: str, final_url: str, html_content: str, status_code: int = 200):
+        """Archive a fetched page and record it in the RawPage index"""
+        from core.models import RawPage
+
+        sha256, size = self.put(html_content)
+        return RawPage.objects.create(
+            url=url,
+            final_url=final_url,
+            sha256=sha256,
+            status_code=status_code,
+            size=size,
+        )
+
+    def latest_pages(self) -> Dict[str, Tuple[str, str]]:
+        """Map every archived URL to (sha256, final_url) of its most recent fetch"""
+        from core.models import RawPage
+
+        latest = {}
+        rows = RawPage.objects.order_by('fetched_at', 'id').values_list('url', 'sha256', 'final_url')
+        for url, sha256, final_url in rows.iterator(chunk_size=5000):
+            latest[url] = (sha256, final_url)
+        return latest
+
+
+# Global instance for reuse
+page_archive = PageArchive()
@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from core.models import SearchQueryCache
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """
+    Persistent cache of Google CSE results in the SearchQueryCache table.
+
+    Searches that found profiles are kept for ``ttl`` seconds; searches that
+    found nothing are kept separately for ``negative_ttl`` seconds so people
+    without a profile are retried sooner. A TTL of 0 disables that kind of
+    entry. Database errors are logged and treated as misses.
+    """
+
+    def __init__(self, ttl: Optional[int] = None, negative_ttl: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else getattr(settings, 'GOOGLE_CSE_CACHE_TTL', 30 * 24 * 3600)
+        self.negative_ttl = (
+            negative_ttl if negative_ttl is not None
+            else getattr(settings, 'GOOGLE_CSE_NEGATIVE_CACHE_TTL', 24 * 3600)
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query: str, num_results: int) -> str:
+        """Hash of the query with case and whitespace normalized"""
+        normalized = ' '.join(query.lower().split())
+        return hashlib.sha256(f'{normalized}|{num_results}'.encode('utf-8')).hexdigest()
+
+    def get(self, query: str, num_results: int) -> Optional[List[Dict]]:
+        """Return cached results, or None on a miss or expired entry"""
+        try:
+            entry = SearchQueryCache.objects.filter(
+                query_key=self.make_key(query, num_results),
+                expires_at__gt=timezone.now(),
+            ).only('results').first()
+        except DatabaseError as e:
+            logger.error(f"Search cache lookup failed: {e}")
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry.results
+
+    def set(self, query: str, num_results: int, results: List[Dict]):
+        """Store results from a successful API call; empty results are cached as negative"""
+        is_negative = not results
+        ttl = self.negative_ttl if is_negative else self.ttl
+        if ttl <= 0:
+            return
+
+        try:
+            SearchQueryCache.objects.update_or_create(
+                query_key=self.make_key(query, num_results),
+                defaults={
+                    'query': query,
+                    'num_results': num_results,
+                    'results': results,
+                    'is_negative': is_negative,
+                    'expires_at': timezone.now() + timedelta(seconds=ttl),
+                },
+            )
+        except DatabaseError as e:
+            logger.error(f"Search cache write failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed"""
+        deleted, _ = SearchQueryCache.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'cache_hits': self.hits,
+                'cache_misses': self.misses,
+                'cache_hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# One cache per process so hit/miss counters cover every service instance
+query_cache = QueryCache()
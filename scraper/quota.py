@@ -0,0 +1,72 @@
+import logging
+from datetime import date, datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import ApiQuota
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaLedger:
+    """
+    Durable daily request quota stored in the ApiQuota table.
+
+    Every process consumes from the same row with a conditional UPDATE, so
+    the limit holds across gunicorn workers, management commands and
+    restarts. Days roll over at midnight in the provider's timezone.
+    """
+
+    def __init__(self, provider: str, daily_limit: Optional[int], timezone_name: str = 'UTC'):
+        """
+        Args:
+            provider: Ledger name, e.g. 'google_cse'
+            daily_limit: Requests allowed per day, or None for no limit
+            timezone_name: Timezone in which the provider resets its quota
+        """
+        self.provider = provider
+        self.daily_limit = daily_limit
+        self.timezone = ZoneInfo(timezone_name)
+
+    def today(self) -> date:
+        """Current quota day in the provider's timezone"""
+        return datetime.now(self.timezone).date()
+
+    def try_consume(self, count: int = 1) -> bool:
+        """
+        Atomically reserve ``count`` requests from today's quota
+
+        Returns:
+            False, without consuming anything, if the quota can't cover them
+        """
+        day = self.today()
+        queryset = ApiQuota.objects.filter(provider=self.provider, day=day)
+        if self.daily_limit is not None:
+            if count > self.daily_limit:
+                return False
+            queryset = queryset.filter(used__lte=self.daily_limit - count)
+
+        if queryset.update(used=F('used') + count):
+            return True
+
+        # No row for today yet (or it is full): create it, tolerating a concurrent insert
+        try:
+            with transaction.atomic():
+                ApiQuota.objects.create(provider=self.provider, day=day, used=count)
+            return True
+        except IntegrityError:
+            return bool(queryset.update(used=F('used') + count))
+
+    def used(self) -> int:
+        """Requests consumed today"""
+        quota = ApiQuota.objects.filter(provider=self.provider, day=self.today()).only('used').first()
+        return quota.used if quota else 0
+
+    def remaining(self) -> Optional[int]:
+        """Requests left today, or None if there is no daily limit"""
+        if self.daily_limit is None:
+            return None
+        return max(0, self.daily_limit - self.used())
@@ -0,0 +1,57 @@
+import time
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``, so
+    short bursts are allowed while the long-run rate never exceeds ``rate``.
+    Daily caps are tracked separately by ``scraper.quota.QuotaLedger``.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (default: one second's worth, at least 1)
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, blocking until one is available
+
+        Returns:
+            False if ``timeout`` seconds pass first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+
+                wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None and now + wait > deadline:
+                return False
+            logger.debug(f"Rate limiting: sleeping for {wait:.2f}s")
+            time.sleep(wait)